@@ -0,0 +1,136 @@
+"""
+Liczba zapytań SQL przy serializacji rekordów szkodliwych ze stopniem.
+
+Skrypt tworzy tymczasową bazę SQLite, zapisuje rekordy szkodliwe
+z przypisanymi stopniami szkodliwości i liczy zapytania wykonane przy:
+  - liście rekordów (list_records + to_dict ze słownikiem stopni żądania
+    albo z katalogu stopni w pamięci procesu),
+  - liście z ładowaniem relacji "selectin" / "joined",
+  - eksporcie (iter_records_by_file).
+Katalog stopni (HazardousDegreeCatalog) jest czyszczony przed każdym
+scenariuszem — liczone jest też jego wczytanie. Liczba zapytań nie może
+zależeć od liczby rekordów ani stopni — przekroczenie oczekiwanej liczby
+kończy skrypt kodem 1. Wariant z leniwą relacją (to_dict() bez katalogu)
+jest pokazywany tylko dla porównania.
+
+Użycie:
+    python benchmarks/degree_query_count.py
+    python benchmarks/degree_query_count.py --rows 1000 --degrees 40
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Dodaj backend do path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import ImportedFile, HazardousDegree, SWDRecord, HazardousRecord  # rejestracja modeli
+from services.hazardous_degrees_service import DegreeLookup, HazardousDegreeCatalog
+from services.hazardous_records_service import HazardousRecordsService
+from services.record_listing import RecordCountCache
+from sample_data import sample_rows
+
+
+def _scenarios(db, file_id: int, rows: int):
+    """(nazwa, funkcja, oczekiwana liczba zapytań albo None — bez kontroli)"""
+    def listing(degree_loading=None, lookup=False):
+        RecordCountCache.clear()
+        records, _ = HazardousRecordsService.list_records(
+            db, file_id, limit=rows, degree_loading=degree_loading
+        )
+        degrees = DegreeLookup(db) if lookup else None
+        return [r.to_dict(degrees) for r in records]
+
+    def lazy_listing():
+        # Leniwa relacja — słownik bez stopni wymusza odczyt hazardous_degree
+        RecordCountCache.clear()
+        records, _ = HazardousRecordsService.list_records(db, file_id, limit=rows)
+        return [r.to_dict({}) for r in records]
+
+    return [
+        # strona z total_count, katalog stopni
+        ("lista + DegreeLookup", lambda: listing(lookup=True), 2),
+        # strona z total_count, katalog stopni (to_dict bez słownika)
+        ("lista + katalog procesu", lambda: listing(), 2),
+        # strona z total_count, SELECT stopni WHERE id IN (...), katalog
+        ("lista, degree_loading=selectin", lambda: listing("selectin"), 3),
+        # strona z total_count i LEFT JOIN stopni, katalog
+        ("lista, degree_loading=joined", lambda: listing("joined"), 2),
+        # jedno zapytanie z LEFT JOIN stopni
+        ("eksport iter_records_by_file",
+         lambda: list(HazardousRecordsService.iter_records_by_file(db, file_id)), 1),
+        # strona z total_count + zapytanie na każdy użyty stopień
+        ("lista, leniwa relacja (porównanie)", lazy_listing, None),
+    ]
+
+
+def run_check(rows: int, degrees: int) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'degree_count.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+
+        hazardous = HazardousRecordsService.create_file_record(db, "count.xlsx", "count.xlsx", "", rows)
+        HazardousRecordsService.bulk_create_records(db, hazardous.id, sample_rows(rows))
+        db.execute(HazardousDegree.__table__.insert(), [
+            {"stopien": 1 + i % 2, "punkt": i + 1, "opis": f"opis {i + 1}"} for i in range(degrees)
+        ])
+        db.execute(
+            text("UPDATE hazardous_records SET hazardous_degree_id = 1 + id % :degrees"),
+            {"degrees": degrees},
+        )
+        db.commit()
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+
+        failures = 0
+        print(f"[DEGREE COUNT] Rekordów: {rows}, stopni: {degrees}")
+        for name, call, expected in _scenarios(db, hazardous.id, rows):
+            db.expunge_all()   # bez obiektów z poprzedniego scenariusza w sesji
+            HazardousDegreeCatalog.invalidate()
+            statements.clear()
+            start = time.perf_counter()
+            result = call()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            count = len(statements)
+
+            if expected is None:
+                status = "INFO"
+            elif count > expected:
+                status = "FAIL"
+                failures += 1
+            else:
+                status = "OK"
+            limit = f"≤ {expected}" if expected is not None else "-"
+            print(f"[DEGREE COUNT] {status:4} {count:4} zapytań ({limit:>4}) "
+                  f"{elapsed_ms:8.2f} ms  {name} ({len(result)} rekordów)")
+
+        event.remove(engine, "before_cursor_execute", capture)
+        db.close()
+        engine.dispose()
+
+    if failures:
+        print(f"[DEGREE COUNT] {failures} scenariuszy przekracza oczekiwaną liczbę zapytań")
+        return 1
+    print("[DEGREE COUNT] Liczba zapytań nie zależy od liczby rekordów")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Liczba zapytań SQL przy serializacji stopni szkodliwości")
+    parser.add_argument("--rows", type=int, default=1000, help="liczba rekordów szkodliwych (strona listy)")
+    parser.add_argument("--degrees", type=int, default=20, help="liczba stopni szkodliwości w katalogu")
+    args = parser.parse_args()
+    sys.exit(run_check(args.rows, args.degrees))
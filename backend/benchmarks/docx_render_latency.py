@@ -0,0 +1,112 @@
+"""
+Czas generowania dokumentu DOCX (docxtpl) — z cache szablonów i bez.
+
+Dla karty wyjazdów i zestawienia dodatku szkodliwego wywoływane jest
+generate_docx serwisu:
+  - bez cache: DocxTemplate(ścieżka) przy każdym dokumencie (dotychczas),
+  - z cache: DocxTemplateCache.get() — kopia szablonu w pamięci.
+Obie ścieżki muszą dać te same części XML dokumentu — różnica kończy
+skrypt kodem 1.
+
+Użycie:
+    python benchmarks/docx_render_latency.py
+    python benchmarks/docx_render_latency.py --records 200 --repeat 20
+"""
+import argparse
+import io
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+# Dodaj backend do path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from docxtpl import DocxTemplate
+
+from services.docx_template_cache import DocxTemplateCache
+from services.document_generator_service import DocumentGeneratorService
+from services.hazardous_document_service import HazardousDocumentService
+from services.template_registry import TemplateRegistry
+from sample_data import sample_rows
+
+
+def _uncached(name: str) -> DocxTemplate:
+    return DocxTemplate(TemplateRegistry.templates_dir() / name)
+
+
+def _records(count: int):
+    records = []
+    for item in sample_rows(count).items:
+        record = dict(vars(item))
+        record["hazardous_degree_id"] = 1
+        record["hazardous_degree"] = {"stopien": 2, "punkt": 1, "opis": "Czynności przy pożarze"}
+        records.append(record)
+    return records
+
+
+def _xml_parts(docx: bytes) -> dict:
+    """Części XML dokumentu (bez metadanych ZIP — daty plików się różnią)"""
+    with zipfile.ZipFile(io.BytesIO(docx)) as archive:
+        return {name: archive.read(name) for name in archive.namelist() if name.endswith(".xml")}
+
+
+def _measure(call, repeat: int):
+    """(najlepszy czas w ms, wygenerowany dokument)"""
+    best = None
+    body = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = call().getvalue()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+
+def run_benchmark(count: int, repeat: int) -> int:
+    records = _records(count)
+    documents = DocumentGeneratorService()
+    hazardous = HazardousDocumentService()
+    firefighter = {"stopien": "st. kpt.", "nazwisko_imie": "KOWALSKI Jan", "stanowisko": "Ratownik"}
+
+    cases = [
+        ("karta wyjazdów", lambda: documents.generate_docx(
+            "KOWALSKI Jan", records, "2025-01-01", "2025-12-31", firefighter)),
+        ("dodatek szkodliwy", lambda: hazardous.generate_docx(
+            "KOWALSKI Jan", records, firefighter, "I półrocze 2025", "JRG 1")),
+    ]
+
+    print(f"[DOCX] Rekordów w dokumencie: {count}, powtórzeń: {repeat}")
+    start = time.perf_counter()
+    DocxTemplateCache.warm_up()
+    print(f"[DOCX] Jednorazowe przygotowanie cache: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    failures = 0
+    cached_get = DocxTemplateCache.get
+    for name, call in cases:
+        DocxTemplateCache.get = staticmethod(_uncached)
+        try:
+            plain_ms, plain_doc = _measure(call, repeat)
+        finally:
+            DocxTemplateCache.get = staticmethod(cached_get)
+        cached_ms, cached_doc = _measure(call, repeat)
+
+        same = _xml_parts(plain_doc) == _xml_parts(cached_doc)
+        if not same:
+            failures += 1
+        print(f"[DOCX] {name:18} bez cache: {plain_ms:8.2f} ms  cache: {cached_ms:8.2f} ms  "
+              f"-{plain_ms - cached_ms:7.2f} ms (x{plain_ms / cached_ms:4.2f})  "
+              f"{'OK' if same else 'RÓŻNY DOKUMENT'}")
+
+    if failures:
+        print("[DOCX] Dokument z cache różni się od renderowanego z pliku")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Czas generowania DOCX z cache szablonów")
+    parser.add_argument("--records", type=int, default=100, help="liczba rekordów w dokumencie")
+    parser.add_argument("--repeat", type=int, default=10, help="liczba powtórzeń (najlepszy wynik)")
+    args = parser.parse_args()
+    sys.exit(run_benchmark(args.records, args.repeat))
@@ -0,0 +1,156 @@
+"""
+Czas przygotowania odpowiedzi listy rekordów (limit=1000).
+
+Porównanie dla list wyjazdów i rekordów szkodliwych:
+  - obiekty ORM → to_dict() → jsonable_encoder → JSONResponse (dotychczas),
+  - wiersze kolumn (columns=LISTING_COLUMNS) → rows_to_dicts → FastJSONResponse.
+Obie ścieżki muszą dać ten sam JSON — różnica kończy skrypt kodem 1.
+Dodatkowo rozmiar odpowiedzi: wiersze vs format=columnar, bez kompresji
+i po gzip (oraz brotli, gdy zainstalowany).
+
+Użycie:
+    python benchmarks/listing_serialization.py
+    python benchmarks/listing_serialization.py --limit 500 --repeat 20
+"""
+import argparse
+import gzip
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Dodaj backend do path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import ImportedFile, HazardousDegree, SWDRecord, HazardousRecord  # rejestracja modeli
+from services.data_service import DataService
+from services.hazardous_degrees_service import DegreeLookup
+from services.hazardous_records_service import HazardousRecordsService
+from services.json_response import FastJSONResponse, rows_to_dicts, orjson, brotli
+from services.columnar_format import encode_columnar
+from sample_data import sample_rows
+
+
+def _orm_departures(db, file_id, limit):
+    records, total = DataService.list_records(db, file_id, limit=limit)
+    return JSONResponse(jsonable_encoder({"records": [r.to_dict() for r in records], "total_count": total}))
+
+
+def _fast_departures(db, file_id, limit):
+    columns = DataService.LISTING_COLUMNS
+    records, total = DataService.list_records(db, file_id, limit=limit, columns=columns)
+    return FastJSONResponse({"records": rows_to_dicts(records, columns), "total_count": total})
+
+
+def _orm_hazardous(db, file_id, limit):
+    degrees = DegreeLookup(db)
+    records, total = HazardousRecordsService.list_records(db, file_id, limit=limit)
+    return JSONResponse(jsonable_encoder({"records": [r.to_dict(degrees) for r in records], "total_count": total}))
+
+
+def _fast_hazardous(db, file_id, limit):
+    degrees = DegreeLookup(db)
+    columns = HazardousRecordsService.LISTING_COLUMNS
+    records, total = HazardousRecordsService.list_records(db, file_id, limit=limit, columns=columns)
+    rows = rows_to_dicts(records, columns)
+    for row in rows:
+        row["hazardous_degree"] = degrees.get(row["hazardous_degree_id"])
+    return FastJSONResponse({"records": rows, "total_count": total})
+
+
+def _columnar_departures(db, file_id, limit):
+    columns = DataService.LISTING_COLUMNS
+    records, total = DataService.list_records(db, file_id, limit=limit, columns=columns)
+    content = encode_columnar(records, columns, DataService.DICTIONARY_COLUMNS)
+    content["total_count"] = total
+    return FastJSONResponse(content)
+
+
+def _columnar_hazardous(db, file_id, limit):
+    degrees = DegreeLookup(db)
+    columns = HazardousRecordsService.LISTING_COLUMNS
+    records, total = HazardousRecordsService.list_records(db, file_id, limit=limit, columns=columns)
+    content = encode_columnar(records, columns, HazardousRecordsService.DICTIONARY_COLUMNS)
+    content["degrees"] = {r.hazardous_degree_id: degrees.get(r.hazardous_degree_id)
+                          for r in records if r.hazardous_degree_id is not None}
+    content["total_count"] = total
+    return FastJSONResponse(content)
+
+
+def _sizes(body: bytes) -> str:
+    sizes = f"{len(body) / 1024:7.1f} KB, gzip {len(gzip.compress(body, 6)) / 1024:6.1f} KB"
+    if brotli is not None:
+        sizes += f", br {len(brotli.compress(body, quality=5)) / 1024:6.1f} KB"
+    return sizes
+
+
+def _measure(call, repeat: int):
+    """(najlepszy czas w ms, treść odpowiedzi)"""
+    best = None
+    body = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = call().body
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+
+def run_benchmark(limit: int, repeat: int) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'serialization.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+
+        departures = DataService.create_file_record(db, "bench.xlsx", "bench.xlsx", "", limit)
+        DataService.bulk_create_records(db, departures.id, sample_rows(limit))
+        hazardous = HazardousRecordsService.create_file_record(db, "bench.xlsx", "bench.xlsx", "", limit)
+        HazardousRecordsService.bulk_create_records(db, hazardous.id, sample_rows(limit))
+        db.execute(HazardousDegree.__table__.insert(), [
+            {"stopien": 1, "punkt": i + 1, "opis": f"opis {i + 1}"} for i in range(10)
+        ])
+        db.execute(text("UPDATE hazardous_records SET hazardous_degree_id = 1 + id % 10 WHERE id % 3 > 0"))
+        db.commit()
+
+        encoder = "orjson" if orjson is not None else "json"
+        print(f"[SERIALIZATION] Rekordów na stronie: {limit}, powtórzeń: {repeat}, koder: {encoder}")
+
+        failures = 0
+        for name, orm_call, fast_call, columnar_call, file_id in [
+            ("wyjazdy", _orm_departures, _fast_departures, _columnar_departures, departures.id),
+            ("szkodliwe", _orm_hazardous, _fast_hazardous, _columnar_hazardous, hazardous.id),
+        ]:
+            orm_ms, orm_body = _measure(lambda: orm_call(db, file_id, limit), repeat)
+            fast_ms, fast_body = _measure(lambda: fast_call(db, file_id, limit), repeat)
+            same = json.loads(orm_body) == json.loads(fast_body)
+            if not same:
+                failures += 1
+            print(f"[SERIALIZATION] {name:10} to_dict: {orm_ms:8.2f} ms  kolumny: {fast_ms:8.2f} ms  "
+                  f"x{orm_ms / fast_ms:5.1f}  {'OK' if same else 'RÓŻNY JSON'}")
+            columnar_ms, columnar_body = _measure(lambda: columnar_call(db, file_id, limit), repeat)
+            print(f"[SERIALIZATION] {'':10} wiersze:  {_sizes(fast_body)}")
+            print(f"[SERIALIZATION] {'':10} columnar: {_sizes(columnar_body)}  ({columnar_ms:.2f} ms)")
+
+        db.close()
+        engine.dispose()
+
+    if failures:
+        print("[SERIALIZATION] Szybka ścieżka daje inny JSON niż to_dict()")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Czas serializacji listy rekordów")
+    parser.add_argument("--limit", type=int, default=1000, help="liczba rekordów na stronie")
+    parser.add_argument("--repeat", type=int, default=10, help="liczba powtórzeń (najlepszy wynik)")
+    args = parser.parse_args()
+    sys.exit(run_benchmark(args.limit, args.repeat))
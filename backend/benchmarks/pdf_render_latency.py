@@ -0,0 +1,83 @@
+"""
+Czas generowania karty wyjazdów PDF — xhtml2pdf vs reportlab.
+
+Dla każdego renderera (services/pdf_backends.py) generate_pdf z tymi
+samymi rekordami: najlepszy czas, liczba stron i rozmiar pliku.
+Sprawdzane jest też, że PDF z reportlab zawiera nazwisko i wszystkie
+numery meldunków. Błąd któregokolwiek renderera kończy skrypt kodem 1.
+
+Użycie:
+    python benchmarks/pdf_render_latency.py
+    python benchmarks/pdf_render_latency.py --records 300 --repeat 5
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+# Dodaj backend do path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pypdf import PdfReader
+
+from services.document_generator_service import DocumentGeneratorService
+from services.pdf_backends import PDF_BACKENDS
+from sample_data import sample_rows
+
+FIREFIGHTER = {"stopien": "st. kpt.", "nazwisko_imie": "KOWALSKI Jan", "stanowisko": "Ratownik"}
+
+
+def _measure(call, repeat: int):
+    """(najlepszy czas w ms, wygenerowany PDF)"""
+    best = None
+    body = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = call().getvalue()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+
+def run_benchmark(count: int, repeat: int) -> int:
+    records = [dict(vars(item)) for item in sample_rows(count).items]
+    service = DocumentGeneratorService()
+    print(f"[PDF] Rekordów na karcie: {count}, powtórzeń: {repeat}")
+
+    failures = 0
+    results = {}
+    for name in PDF_BACKENDS:
+        try:
+            elapsed, body = _measure(lambda: service.generate_pdf(
+                "KOWALSKI Jan", records, "2025-01-01", "2025-12-31", FIREFIGHTER, backend=name
+            ), repeat)
+        except Exception as e:
+            failures += 1
+            print(f"[PDF] {name:10} BŁĄD: {str(e).splitlines()[0]}")
+            continue
+        pages = len(PdfReader(io.BytesIO(body)).pages)
+        results[name] = (elapsed, body)
+        print(f"[PDF] {name:10} {elapsed:9.2f} ms  stron: {pages:3}  {len(body) / 1024:7.1f} KB")
+
+    if "reportlab" in results:
+        reader = PdfReader(io.BytesIO(results["reportlab"][1]))
+        text = "".join(page.extract_text() for page in reader.pages)
+        missing = [r["nr_meldunku"] for r in records if r["nr_meldunku"] not in text]
+        if "KOWALSKI Jan" not in text or missing:
+            failures += 1
+            print(f"[PDF] reportlab: brak treści w PDF (meldunki: {missing[:5]})")
+
+    if len(results) == len(PDF_BACKENDS):
+        baseline = results["xhtml2pdf"][0]
+        print(f"[PDF] reportlab x{baseline / results['reportlab'][0]:.1f} szybciej niż xhtml2pdf")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Czas generowania karty wyjazdów PDF")
+    parser.add_argument("--records", type=int, default=100, help="liczba rekordów na karcie")
+    parser.add_argument("--repeat", type=int, default=3, help="liczba powtórzeń (najlepszy wynik)")
+    args = parser.parse_args()
+    sys.exit(run_benchmark(args.records, args.repeat))
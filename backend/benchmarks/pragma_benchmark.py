@@ -0,0 +1,145 @@
+"""
+Benchmark profili PRAGMA SQLite (config.Settings.SQLITE_PROFILES).
+
+Dla każdego profilu (oraz wariantu bez PRAGMA) tworzy osobny silnik z
+apply_sqlite_pragmas i mierzy czas zapytań listy i filtrów wyjazdów oraz
+Dodatku Szkodliwego: pierwsze wywołanie (zimny cache połączenia),
+medianę i p95 z kolejnych powtórzeń.
+
+Domyślnie baza testowa tworzona jest w katalogu tymczasowym. Żeby zmierzyć
+bazę na udziale sieciowym, wskaż katalog na udziale (--dir \\\\serwer\\udzial\\test)
+albo istniejącą bazę (--db) — skrypt tylko czyta z podanej bazy.
+
+Użycie:
+    python benchmarks/pragma_benchmark.py
+    python benchmarks/pragma_benchmark.py --rows 100000 --repeat 30
+    python benchmarks/pragma_benchmark.py --db "\\\\serwer\\udzial\\app.db"
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Dodaj backend do path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from config import settings
+from database import Base
+from database_pragmas import apply_sqlite_pragmas, read_sqlite_pragmas
+from models import ImportedFile, SWDRecord, HazardousRecord
+from services.data_service import DataService
+from services.hazardous_records_service import HazardousRecordsService
+from sample_data import sample_rows
+
+FILES = 10
+
+
+def _create_database(db_path: Path, rows: int):
+    """Baza testowa: FILES plików wyjazdów i Dodatku Szkodliwego"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    per_file = max(rows // FILES, 1)
+    for _ in range(FILES):
+        departures = DataService.create_file_record(db, "bench.xlsx", "bench.xlsx", "", per_file)
+        DataService.bulk_create_records(db, departures.id, sample_rows(per_file))
+        hazardous = HazardousRecordsService.create_file_record(db, "bench.xlsx", "bench.xlsx", "", per_file)
+        HazardousRecordsService.bulk_create_records(db, hazardous.id, sample_rows(per_file))
+    db.close()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+
+def _largest_file(db, model) -> int:
+    """Plik z największą liczbą rekordów danego typu"""
+    row = (
+        db.query(model.file_id, func.count(model.id).label("n"))
+        .group_by(model.file_id)
+        .order_by(func.count(model.id).desc())
+        .first()
+    )
+    return row[0] if row else None
+
+
+def _queries(db, departures_id: int, hazardous_id: int):
+    firefighter = (DataService.get_unique_firefighters_in_file(db, departures_id) or [None])[0]
+    return [
+        ("lista wyjazdów (strona 20, sort. data)",
+         lambda: DataService.get_records_by_file(db, departures_id, skip=1000, limit=50,
+                                                 sort_by="czas_rozp_zdarzenia")),
+        ("filtr wyjazdów (strażak + daty)",
+         lambda: DataService.get_records_by_file_with_date_filter(
+             db, departures_id, "2025-03-01", "2025-08-31", firefighter, limit=50)),
+        ("licznik wyjazdów (daty)",
+         lambda: DataService.count_records_by_file_with_date_filter(
+             db, departures_id, "2025-03-01", "2025-08-31")),
+        ("lista strażaków w pliku",
+         lambda: DataService.get_unique_firefighters_in_file(db, departures_id)),
+        ("lista Dodatku Szkodliwego (kwalifikowane)",
+         lambda: HazardousRecordsService.get_records_by_file(
+             db, hazardous_id, skip=500, limit=50, only_eligible=True)),
+    ]
+
+
+def _measure(call, repeat: int):
+    start = time.perf_counter()
+    call()
+    first = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return first, statistics.median(samples), p95
+
+
+def run_benchmark(db_path: Path, repeat: int):
+    profiles = [("brak PRAGMA", {})] + list(settings.SQLITE_PROFILES.items())
+
+    for profile_name, pragmas in profiles:
+        engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+        apply_sqlite_pragmas(engine, pragmas)
+        db = sessionmaker(bind=engine)()
+
+        departures_id = _largest_file(db, SWDRecord)
+        hazardous_id = _largest_file(db, HazardousRecord)
+
+        print()
+        print(f"[BENCHMARK] Profil: {profile_name}")
+        with engine.connect() as conn:
+            print(f"[BENCHMARK] {read_sqlite_pragmas(conn)}")
+        print(f"[BENCHMARK] {'zapytanie':45} {'pierwsze':>10} {'mediana':>10} {'p95':>10}")
+
+        for name, call in _queries(db, departures_id, hazardous_id):
+            first, median, p95 = _measure(call, repeat)
+            print(f"[BENCHMARK] {name:45} {first:8.2f}ms {median:8.2f}ms {p95:8.2f}ms")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark profili PRAGMA SQLite")
+    parser.add_argument("--rows", type=int, default=50000, help="liczba rekordów w bazie testowej")
+    parser.add_argument("--repeat", type=int, default=20, help="liczba powtórzeń każdego zapytania")
+    parser.add_argument("--dir", type=str, default=None, help="katalog bazy testowej (np. na udziale sieciowym)")
+    parser.add_argument("--db", type=str, default=None, help="istniejąca baza (tylko odczyt)")
+    args = parser.parse_args()
+
+    if args.db:
+        run_benchmark(Path(args.db), args.repeat)
+    else:
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+            db_path = Path(tmp) / "pragma_benchmark.db"
+            print(f"[BENCHMARK] Tworzenie bazy testowej ({args.rows} rekordów): {db_path}")
+            _create_database(db_path, args.rows)
+            run_benchmark(db_path, args.repeat)
@@ -0,0 +1,169 @@
+"""
+Kontrola planów zapytań (EXPLAIN QUERY PLAN) dla zapytań serwisów.
+
+Skrypt tworzy tymczasową bazę SQLite ze strukturą modeli (create_all),
+wypełnia ją przykładowymi rekordami, wywołuje metody DataService
+i HazardousRecordsService filtrujące po pliku, przechwytuje wykonane
+zapytania SQL i dla każdego z nich sprawdza plan. Pełny skan tabeli
+rekordów ("SCAN swd_records" bez indeksu) kończy skrypt kodem 1 —
+można go uruchamiać jako benchmark lub krok kontrolny przed wydaniem.
+
+Użycie:
+    python benchmarks/query_plan_check.py
+    python benchmarks/query_plan_check.py --rows 50000 --verbose
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Dodaj backend do path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import ImportedFile, HazardousDegree, SWDRecord, HazardousRecord  # rejestracja modeli
+from services.data_service import DataService
+from services.hazardous_records_service import HazardousRecordsService
+from services.keyset_pagination import next_cursor
+from services.record_listing import RecordCountCache
+from sample_data import sample_rows
+
+# Tabele, dla których pełny skan jest błędem
+CHECKED_TABLES = {"swd_records", "hazardous_records"}
+
+# Liczba plików, na które rozkładane są przykładowe rekordy
+FILES = 10
+
+
+def _service_queries(db, departures_file_id: int, hazardous_file_id: int):
+    """Wywołania serwisów objęte kontrolą — (nazwa, funkcja)"""
+    d, h = departures_file_id, hazardous_file_id
+    firefighter = "KOWALSKI Jan3"
+    # Kursory drugiej strony (stronicowanie keyset)
+    cursors = {
+        "departures": next_cursor(DataService.get_records_by_file(db, d, limit=50), 50, SWDRecord, None),
+        "hazardous": next_cursor(HazardousRecordsService.get_records_by_file(db, h, limit=50), 50, HazardousRecord, None),
+    }
+    return [
+        ("DataService.get_records_by_file",
+         lambda: DataService.get_records_by_file(db, d, limit=50)),
+        ("DataService.get_records_by_file (kursor)",
+         lambda: DataService.get_records_by_file(db, d, limit=50, cursor=cursors["departures"])),
+        ("DataService.list_records (strona + total)",
+         lambda: (RecordCountCache.clear(), DataService.list_records(db, d, "2025-03-01", "2025-05-31", limit=50))),
+        ("DataService.get_records_by_file_and_firefighter",
+         lambda: DataService.get_records_by_file_and_firefighter(db, d, firefighter, limit=50)),
+        ("DataService.get_unique_firefighters_in_file",
+         lambda: DataService.get_unique_firefighters_in_file(db, d)),
+        ("DataService.check_duplicate_record",
+         lambda: DataService.check_duplicate_record(db, d, firefighter, "M3")),
+        ("DataService.get_records_by_file_with_date_filter (strażak + daty)",
+         lambda: DataService.get_records_by_file_with_date_filter(db, d, "2025-03-01", "2025-05-31", firefighter, limit=50)),
+        ("DataService.get_records_by_file_with_date_filter (daty)",
+         lambda: DataService.get_records_by_file_with_date_filter(db, d, "2025-03-01", "2025-05-31", limit=50)),
+        ("DataService.count_records_by_file",
+         lambda: DataService.count_records_by_file(db, d)),
+        ("DataService.count_records_by_file_with_date_filter",
+         lambda: DataService.count_records_by_file_with_date_filter(db, d, "2025-03-01", "2025-05-31", firefighter)),
+        ("DataService.iter_records_by_file",
+         lambda: list(DataService.iter_records_by_file(db, d, "2025-03-01", "2025-05-31", firefighter))),
+        ("HazardousRecordsService.get_records_by_file",
+         lambda: HazardousRecordsService.get_records_by_file(db, h, limit=50, firefighter=firefighter, only_eligible=True)),
+        ("HazardousRecordsService.get_records_by_file (kursor)",
+         lambda: HazardousRecordsService.get_records_by_file(db, h, limit=50, cursor=cursors["hazardous"])),
+        ("HazardousRecordsService.list_records (strona + total)",
+         lambda: (RecordCountCache.clear(), HazardousRecordsService.list_records(db, h, limit=50, only_eligible=True))),
+        ("HazardousRecordsService.count_records_by_file",
+         lambda: HazardousRecordsService.count_records_by_file(db, h, date_from="2025-03-01", date_to="2025-05-31")),
+        ("HazardousRecordsService.get_unique_firefighters_in_file",
+         lambda: HazardousRecordsService.get_unique_firefighters_in_file(db, h)),
+        ("HazardousRecordsService.iter_records_by_file",
+         lambda: list(HazardousRecordsService.iter_records_by_file(db, h, firefighter=firefighter))),
+    ]
+
+
+def _full_scans(plan_rows) -> list:
+    """Wiersze planu oznaczające pełny skan sprawdzanej tabeli"""
+    scans = []
+    for row in plan_rows:
+        detail = row[-1]
+        parts = detail.split()
+        if len(parts) >= 2 and parts[0] == "SCAN" and parts[1] in CHECKED_TABLES and "USING" not in parts:
+            scans.append(detail)
+    return scans
+
+
+def run_check(rows: int, verbose: bool = False) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'plan_check.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+
+        # Kilka plików — statystyki ANALYZE jak w bazie produkcyjnej
+        # (przy jednym pliku filtr file_id nie jest selektywny)
+        per_file = max(rows // FILES, 1)
+        for _ in range(FILES):
+            departures = DataService.create_file_record(db, "plan.xlsx", "plan.xlsx", "", per_file)
+            DataService.bulk_create_records(db, departures.id, sample_rows(per_file))
+            hazardous = HazardousRecordsService.create_file_record(db, "plan.xlsx", "plan.xlsx", "", per_file)
+            HazardousRecordsService.bulk_create_records(db, hazardous.id, sample_rows(per_file))
+        db.execute(HazardousDegree.__table__.insert().values(stopien=1, punkt=1, opis="opis"))
+        db.commit()
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+
+        failures = 0
+        print(f"[PLAN CHECK] Rekordów w tabelach: {per_file * FILES} ({FILES} plików)")
+        for name, call in _service_queries(db, departures.id, hazardous.id):
+            captured.clear()
+            start = time.perf_counter()
+            call()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            problems = []
+            plans = []
+            with engine.connect() as conn:
+                for statement, parameters in captured:
+                    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                    plans.append([row[-1] for row in plan])
+                    problems.extend(_full_scans(plan))
+
+            status = "FAIL" if problems else "OK"
+            print(f"[PLAN CHECK] {status:4} {elapsed_ms:8.2f} ms  {name}")
+            if verbose or problems:
+                for plan in plans:
+                    for detail in plan:
+                        print(f"             {detail}")
+            if problems:
+                failures += 1
+
+        event.remove(engine, "before_cursor_execute", capture)
+        db.close()
+        engine.dispose()
+
+    if failures:
+        print(f"[PLAN CHECK] {failures} zapytań wykonuje pełny skan tabeli")
+        return 1
+    print("[PLAN CHECK] Wszystkie zapytania korzystają z indeksów")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kontrola planów zapytań serwisów (EXPLAIN QUERY PLAN)")
+    parser.add_argument("--rows", type=int, default=20000, help="liczba przykładowych rekordów w tabeli")
+    parser.add_argument("--verbose", action="store_true", help="pokaż plany wszystkich zapytań")
+    args = parser.parse_args()
+    sys.exit(run_check(args.rows, args.verbose))
@@ -0,0 +1,24 @@
+"""
+Przykładowe dane dla skryptów w benchmarks/ (bez pliku Excel i zestawienie_swd).
+"""
+from types import SimpleNamespace
+
+
+def sample_rows(count: int):
+    """Przykładowe wiersze w kształcie CollectionZestawienieWiersz (.items, .count)"""
+    items = []
+    for i in range(count):
+        month = 1 + i % 12
+        day = 1 + i % 28
+        timestamp = f"2025-{month:02d}-{day:02d} {i % 24:02d}:00:00"
+        items.append(SimpleNamespace(
+            nazwisko_imie=f"KOWALSKI Jan{i % 40}", stopien="st. kpt.",
+            p="1" if i % 2 else None, mz=None, af="1" if i % 7 == 0 else None,
+            zaliczono_do_emerytury="1", nr_meldunku=f"M{i}",
+            czas_rozp_zdarzenia=timestamp, funkcja="Ratownik",
+            jednostka="JRG 1", data_przyjecia="2020-01-01",
+            czas_od=timestamp, czas_do=timestamp, czas_udzialu=f"0{i % 3}:{i % 60:02d}",
+            dodatek_szkodliwy="01:00 (1)", stopien_szkodliwosci="1",
+            aktualizowal_szkod=None, data_aktualizacji_szkod=None, opis_st_szkodliwosci="opis",
+        ))
+    return SimpleNamespace(items=items, count=count)
@@ -19,7 +19,14 @@ class Settings:
         self.DATA_DIR = self.BASE_DIR / "data"
         
         # Załaduj konfigurację bazy danych
+        self._db_config = {}
         self._load_database_config()
+        self._load_sqlite_config(self._db_config)
+        self.CACHE_DIR = self._get_cache_dir()
+        self._load_replica_config(self._db_config)
+        
+        # Skompilowane szablony Jinja (services/template_registry.py)
+        self.TEMPLATE_CACHE_DIR = self.CACHE_DIR / "templates"
         
         # Upload dir - zawsze obok bazy danych
         self.UPLOAD_DIR = self.DATABASE_PATH.parent / "uploads"
@@ -34,6 +41,9 @@ class Settings:
         print(f"[CONFIG] Base dir: {self.BASE_DIR}")
         print(f"[CONFIG] Database: {self.DATABASE_PATH}")
         print(f"[CONFIG] Database type: {self.DATABASE_TYPE}")
+        print(f"[CONFIG] SQLite profile: {self.SQLITE_PROFILE} {self.SQLITE_PRAGMAS}")
+        if self.DATABASE_REPLICA:
+            print(f"[CONFIG] Local replica: {self.REPLICA_PATH}")
         print(f"[CONFIG] Upload dir: {self.UPLOAD_DIR}")
     
     def _get_base_dir(self) -> Path:
@@ -73,6 +83,7 @@ class Settings:
                     db_path = db_config.get('path')
                     
                     if db_path:
+                        self._db_config = db_config
                         self.DATABASE_PATH = Path(db_path)
                         self.DATABASE_TYPE = db_type
                         self.DATABASE_URL = f"sqlite:///{self.DATABASE_PATH}"
@@ -131,6 +142,7 @@ class Settings:
                 db_path = db_config.get('path')
                 
                 if db_path:
+                    self._db_config = db_config
                     self.DATABASE_PATH = Path(db_path)
                     self.DATABASE_TYPE = db_config.get('type', 'local')
                     self.DATABASE_URL = f"sqlite:///{self.DATABASE_PATH}"
@@ -146,6 +158,75 @@ class Settings:
         self.DATABASE_URL = f"sqlite:///{self.DATABASE_PATH}"
         print(f"[CONFIG] ✓ Using default location (data/)")
     
+    # Profile PRAGMA SQLite ustawiane na każdym nowym połączeniu (database_pragmas.py)
+    # local   - duży cache i mmap, synchronous=NORMAL (dysk lokalny)
+    # network - baza na udziale SMB: brak mmap (niebezpieczny na zasobach sieciowych),
+    #           większy cache stron (każdy odczyt strony to zapytanie przez sieć),
+    #           synchronous=FULL i dłuższy busy_timeout (blokady innych stanowisk)
+    SQLITE_PROFILES = {
+        "local": {
+            "cache_size": -65536,       # 64 MB (wartość ujemna = KiB)
+            "mmap_size": 268435456,     # 256 MB
+            "temp_store": "MEMORY",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,       # ms
+        },
+        "network": {
+            "cache_size": -131072,      # 128 MB
+            "mmap_size": 0,
+            "temp_store": "MEMORY",
+            "synchronous": "FULL",
+            "busy_timeout": 30000,      # ms
+        },
+    }
+    
+    def _load_sqlite_config(self, db_config: dict):
+        """
+        Wybierz profil PRAGMA na podstawie settings.json:
+          database.profile - "local" | "network" (domyślnie = database.type)
+          database.pragmas - pojedyncze nadpisania, np. {"cache_size": -32768}
+        """
+        profile = db_config.get('profile') or self.DATABASE_TYPE
+        if profile not in self.SQLITE_PROFILES:
+            print(f"[CONFIG] ⚠️ Unknown SQLite profile '{profile}', using 'local'")
+            profile = 'local'
+        
+        pragmas = dict(self.SQLITE_PROFILES[profile])
+        for name, value in (db_config.get('pragmas') or {}).items():
+            if name in pragmas:
+                pragmas[name] = value
+            else:
+                print(f"[CONFIG] ⚠️ Ignoring unsupported PRAGMA '{name}' from settings.json")
+        
+        self.SQLITE_PROFILE = profile
+        self.SQLITE_PRAGMAS = pragmas
+    
+    # Replika lokalna bazy sieciowej (database_replica.py)
+    # Co ile sekund sprawdzać czy baza na udziale zmieniła się (mtime/rozmiar)
+    REPLICA_CHECK_INTERVAL = 5
+    # Opóźnienie odświeżenia repliki po zapisie - kolejne zapisy łączone w jedno kopiowanie
+    REPLICA_REFRESH_DELAY = 2
+    
+    def _load_replica_config(self, db_config: dict):
+        """
+        Tryb repliki: settings.json database.replica = true (tylko baza sieciowa).
+        Odczyty z lokalnej kopii, zapisy do bazy na udziale.
+        """
+        self.DATABASE_REPLICA = bool(db_config.get('replica')) and self.DATABASE_TYPE == 'network'
+        
+        self.REPLICA_PATH = self.CACHE_DIR / "replica.db"
+        if self.DATABASE_REPLICA:
+            self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    
+    def _get_cache_dir(self) -> Path:
+        """Katalog plików pomocniczych (replika, skompilowane szablony) - zawsze lokalny"""
+        if self.IS_DESKTOP:
+            if sys.platform == "win32":
+                appdata = Path(os.environ.get('APPDATA', Path.home()))
+                return appdata / 'StrazakDesktopApp' / 'cache'
+            return Path.home() / '.strazak' / 'cache'
+        return self.DATA_DIR / "cache"
+    
     # CORS - dla developmentu
     CORS_ORIGINS = [
         "http://localhost:3000",
@@ -155,5 +236,37 @@ class Settings:
     # Limity
     MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50 MB
     ALLOWED_EXTENSIONS = {".xlsx"}
+    
+    # Import masowy - liczba wierszy w jednym executemany
+    IMPORT_CHUNK_SIZE = 5000
+    
+    # Import w tle - liczba wątków kolejki. SQLite ma jednego writera,
+    # więc kolejne importy czekają w kolejce zamiast blokować się nawzajem
+    IMPORT_WORKERS = 1
+    
+    # Eksport - liczba wierszy pobieranych z bazy w jednej paczce (yield_per)
+    EXPORT_BATCH_SIZE = 2000
+    
+    # Listy rekordów - czas ważności zapamiętanego total_count (sekundy).
+    # Zmiany z tej aplikacji unieważniają go od razu; TTL ogranicza nieaktualność
+    # po zmianach z innych stanowisk (wspólna baza sieciowa)
+    RECORD_COUNT_CACHE_TTL = 60
+
+    # Katalog stopni szkodliwości w pamięci - czas ważności (sekundy).
+    # Zmiany z tej aplikacji dają nową wersję od razu; po TTL katalog jest
+    # wczytywany ponownie (zmiany z innych stanowisk)
+    HAZARDOUS_DEGREES_CACHE_TTL = 300
+
+    # Szablony dokumentów - sprawdzanie zmian plików (mtime) przy każdym użyciu.
+    # Tylko w trybie deweloperskim; w exe szablony są niezmienne
+    TEMPLATE_AUTO_RELOAD = not IS_DESKTOP
+
+    # Dokumenty (PDF, dokumenty zbiorcze) - liczba procesów renderujących.
+    # 1 = renderowanie w procesie aplikacji, bez puli (pula dopiero od 2)
+    DOCUMENT_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+    # Renderer PDF karty wyjazdów: "xhtml2pdf" (szablon HTML) albo
+    # "reportlab" (układ składany bezpośrednio, szybszy)
+    PDF_BACKEND = "xhtml2pdf"
 
 settings = Settings()
\ No newline at end of file
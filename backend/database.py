@@ -1,10 +1,60 @@
-from sqlalchemy import create_engine, inspect, text
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, inspect, text, event, Select
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from config import settings
+from database_pragmas import apply_sqlite_pragmas
+from database_replica import DatabaseReplica
 from pathlib import Path
 
 engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# PRAGMA z profilu local/network na każdym nowym połączeniu
+apply_sqlite_pragmas(engine, settings.SQLITE_PRAGMAS)
+
+# Tryb repliki (baza sieciowa): odczyty z lokalnej kopii, zapisy do bazy głównej
+replica = None
+replica_engine = None
+if settings.DATABASE_REPLICA:
+    replica = DatabaseReplica(
+        settings.DATABASE_PATH,
+        settings.REPLICA_PATH,
+        check_interval=settings.REPLICA_CHECK_INTERVAL,
+        refresh_delay=settings.REPLICA_REFRESH_DELAY,
+    )
+    replica_engine = create_engine(
+        f"sqlite:///{settings.REPLICA_PATH}", connect_args={"check_same_thread": False}
+    )
+    apply_sqlite_pragmas(replica_engine, settings.SQLITE_PROFILES["local"])
+
+
+class RoutingSession(Session):
+    """
+    Sesja trybu repliki.
+    SELECT → replika (jeśli aktualna), wszystko inne → baza główna.
+    Po pierwszym zapisie sesja czyta już tylko z bazy głównej
+    (odczyt własnych zmian, np. db.refresh po commit).
+    """
+    _primary_only = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._primary_only or self._flushing or not isinstance(clause, Select):
+            self._primary_only = True
+            return engine
+        if replica.is_fresh():
+            replica.record_read(True)
+            return replica_engine
+        replica.record_read(False)
+        return engine
+
+
+if replica is not None:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=RoutingSession)
+
+    @event.listens_for(RoutingSession, "after_commit")
+    def _replica_after_commit(session):
+        # Zapis trafił do bazy głównej — replika do odświeżenia
+        if session._primary_only:
+            replica.mark_written()
+else:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 def get_db():
@@ -21,7 +71,7 @@ def init_db():
     - Tworzy bazę jeśli nie istnieje
     - Uruchamia migracje jeśli istnieje
     """
-    from models import SWDRecord, ImportedFile, Firefighter, HazardousDegree, HazardousRecord  # Importuj wszystkie modele
+    from models import SWDRecord, ImportedFile, Firefighter, HazardousDegree, HazardousRecord, ImportJob  # Importuj wszystkie modele
     
     db_path = settings.DATABASE_PATH
     
@@ -60,6 +110,7 @@ def init_db():
         init_migration_tracking()
         set_db_version(settings.VERSION)
         
+        _start_replica()
         print("[DB] ═══════════════════════════════════════")
         return
     
@@ -73,9 +124,46 @@ def init_db():
     # Uruchom pending migracje
     run_pending_migrations()
     
+    # Indeksy usunięte przez przerwany import (BulkInsertService.deferred_indexes)
+    _restore_deferred_indexes()
+    
     print(f"[DB]Baza danych jest aktualna (v{settings.VERSION})")
+    _start_replica()
     print("[DB] ═══════════════════════════════════════")
 
+def _restore_deferred_indexes():
+    """
+    Odtwórz indeksy odkładane przy masowym imporcie, jeśli ich brakuje.
+    DROP INDEX w SQLite zatwierdza się od razu — awaria w trakcie importu
+    z odłożonymi indeksami (BulkInsertService.deferred_indexes) zostawiłaby
+    tabelę bez nich. Definicje indeksów z modeli.
+    """
+    from services.hazardous_records_service import HazardousRecordsService
+
+    deferrable = set(HazardousRecordsService.BULK_DEFERRABLE_INDEXES)
+    existing_tables = set(inspect(engine).get_table_names())
+    restored = []
+    with engine.begin() as conn:
+        present = {row[0] for row in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )}
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            for index in table.indexes:
+                if index.name in deferrable and index.name not in present:
+                    index.create(bind=conn)
+                    restored.append(index.name)
+    if restored:
+        print(f"[DB] Odtworzono indeksy po przerwanym imporcie: {restored}")
+
+def _start_replica():
+    """Kopia bazy sieciowej do lokalnej repliki (po migracjach - aktualna struktura)"""
+    if replica is None:
+        return
+    print(f"[DB] Replika lokalna: {settings.REPLICA_PATH}")
+    replica.startup()
+
 def _is_path_accessible(path: Path) -> bool:
     """Sprawdź czy ścieżka jest dostępna do zapisu"""
     try:
@@ -0,0 +1,57 @@
+"""
+Konfiguracja połączeń SQLite przez PRAGMA.
+
+PRAGMA cache_size / mmap_size / temp_store / synchronous / busy_timeout
+obowiązują tylko dla połączenia, na którym zostały wykonane — dlatego
+ustawiane są w zdarzeniu "connect" silnika, dla każdego nowego połączenia
+z puli. Profil (local / network) wybierany jest w config.py z settings.json.
+"""
+from typing import Dict, Any
+import re
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Obsługiwane PRAGMA w kolejności wykonywania
+SUPPORTED_PRAGMAS = ("busy_timeout", "synchronous", "temp_store", "cache_size", "mmap_size")
+
+# Wartości wstawiane są do SQL — tylko liczby i słowa kluczowe
+_VALUE_PATTERN = re.compile(r"^-?\w+$")
+
+
+def build_pragma_statements(pragmas: Dict[str, Any]) -> list:
+    """Lista instrukcji PRAGMA dla profilu (pomija nieobsługiwane i niepoprawne wartości)"""
+    statements = []
+    for name in SUPPORTED_PRAGMAS:
+        if name not in pragmas or pragmas[name] is None:
+            continue
+        value = str(pragmas[name])
+        if not _VALUE_PATTERN.match(value):
+            print(f"[DB] ⚠️ Niepoprawna wartość PRAGMA {name}={value!r} — pomijam")
+            continue
+        statements.append(f"PRAGMA {name}={value}")
+    return statements
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]):
+    """Zarejestruj ustawianie PRAGMA na każdym nowym połączeniu silnika"""
+    statements = build_pragma_statements(pragmas)
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    event.listen(engine, "connect", on_connect)
+    return statements
+
+
+def read_sqlite_pragmas(connection) -> Dict[str, Any]:
+    """Bieżące wartości PRAGMA połączenia (diagnostyka, benchmark)"""
+    return {
+        name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        for name in SUPPORTED_PRAGMAS
+    }
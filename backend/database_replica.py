@@ -0,0 +1,229 @@
+"""
+Lokalna replika bazy sieciowej (tryb database.replica w settings.json).
+
+Przy starcie baza z udziału kopiowana jest do lokalnego pliku cache
+(pomijane, jeśli mtime i rozmiar bazy źródłowej nie zmieniły się od
+ostatniej kopii). Odczyty (SELECT) obsługuje replika, zapisy trafiają do
+bazy na udziale — routing w database.RoutingSession.
+
+Replika jest nieaktualna, gdy:
+  - ta aplikacja zapisała coś do bazy głównej (mark_written po commit),
+  - inne stanowisko zmieniło bazę (mtime/rozmiar, sprawdzane co
+    REPLICA_CHECK_INTERVAL sekund).
+Nieaktualna replika nie obsługuje odczytów (idą do bazy głównej), a w tle
+planowane jest jej odświeżenie (sqlite3 backup API — spójna kopia także
+podczas zapisów innych stanowisk). Nieudane odświeżenie jest ponawiane
+z rosnącym odstępem (refresh_delay, 2×, 4×… do RETRY_MAX_DELAY).
+"""
+from pathlib import Path
+from typing import Optional, Dict, Any
+from datetime import datetime
+import sqlite3
+import threading
+import json
+import time
+
+
+class DatabaseReplica:
+    """Stan i odświeżanie lokalnej kopii bazy głównej"""
+
+    RETRY_MAX_DELAY = 60    # s — górna granica odstępu ponowień po błędach odświeżania
+
+    def __init__(self, primary_path: Path, replica_path: Path,
+                 check_interval: float = 5, refresh_delay: float = 2):
+        self.primary_path = Path(primary_path)
+        self.replica_path = Path(replica_path)
+        self.meta_path = self.replica_path.with_suffix(".json")
+        self.check_interval = check_interval
+        self.refresh_delay = refresh_delay
+
+        self._lock = threading.Lock()
+        self._ready = False             # replika skopiowana i gotowa do odczytu
+        self._stale = True
+        self._stale_since: Optional[float] = time.time()
+        self._write_generation = 0      # licznik zapisów tej aplikacji
+        self._synced_stat = None        # (mtime, size) bazy głównej w chwili kopii
+        self._last_check = 0.0
+        self._last_sync: Optional[float] = None
+        self._last_sync_seconds: Optional[float] = None
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._refreshing = False
+        self._failed_refreshes = 0      # kolejne nieudane odświeżenia (backoff ponowień)
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    # ── Kopiowanie ───────────────────────────────────────────────────────────
+
+    def _primary_stat(self):
+        stat = self.primary_path.stat()
+        return (stat.st_mtime, stat.st_size)
+
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _write_meta(self, primary_stat):
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "primary_path": str(self.primary_path),
+                "primary_mtime": primary_stat[0],
+                "primary_size": primary_stat[1],
+                "synced_at": datetime.now().isoformat(),
+            }, f, indent=2)
+
+    def startup(self):
+        """Przygotuj replikę przy starcie — kopia tylko gdy baza główna się zmieniła"""
+        primary_stat = self._primary_stat()
+        meta = self._read_meta()
+        unchanged = (
+            self.replica_path.exists()
+            and meta.get("primary_path") == str(self.primary_path)
+            and meta.get("primary_mtime") == primary_stat[0]
+            and meta.get("primary_size") == primary_stat[1]
+        )
+        if unchanged:
+            with self._lock:
+                self._ready = True
+                self._stale = False
+                self._stale_since = None
+                self._synced_stat = primary_stat
+                self._last_sync = time.time()
+            print(f"[REPLICA] Replika aktualna (bez kopiowania): {self.replica_path}")
+            return
+
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Pełna kopia bazy głównej do repliki (sqlite3 backup API)"""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            generation = self._write_generation
+
+        start = time.perf_counter()
+        try:
+            primary_stat = self._primary_stat()
+            source = sqlite3.connect(str(self.primary_path), timeout=30)
+            target = sqlite3.connect(str(self.replica_path))
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+            self._write_meta(primary_stat)
+        except Exception as e:
+            with self._lock:
+                self._refreshing = False
+                self.refresh_errors += 1
+                self._failed_refreshes += 1
+                # Udział chwilowo niedostępny — ponów z rosnącym odstępem
+                retry_delay = min(
+                    self.refresh_delay * 2 ** (self._failed_refreshes - 1),
+                    self.RETRY_MAX_DELAY,
+                )
+            print(f"[REPLICA] Błąd odświeżania repliki: {e} — ponowienie za {retry_delay:.0f} s")
+            self.schedule_refresh(retry_delay)
+            return False
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._refreshing = False
+            self._failed_refreshes = 0
+            self._ready = True
+            self._synced_stat = primary_stat
+            self._last_sync = time.time()
+            self._last_sync_seconds = elapsed
+            self._last_check = self._last_sync
+            self.refreshes += 1
+            # Zapis w trakcie kopiowania — kopia może go nie zawierać
+            if generation == self._write_generation:
+                self._stale = False
+                self._stale_since = None
+            again = self._stale
+
+        print(f"[REPLICA] Replika odświeżona w {elapsed:.2f} s")
+        if again:
+            self.schedule_refresh()
+        return True
+
+    def schedule_refresh(self, delay: Optional[float] = None):
+        """Odśwież replikę w tle po delay (domyślnie refresh_delay; kolejne wywołania łączone)"""
+        with self._lock:
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+            timer = threading.Timer(self.refresh_delay if delay is None else delay, self.refresh)
+            timer.daemon = True
+            self._refresh_timer = timer
+        timer.start()
+
+    # ── Stan ─────────────────────────────────────────────────────────────────
+
+    def _set_stale(self):
+        if not self._stale:
+            self._stale = True
+            self._stale_since = time.time()
+
+    def mark_written(self):
+        """Zapis do bazy głównej — replika nieaktualna do czasu odświeżenia"""
+        with self._lock:
+            self._write_generation += 1
+            self._set_stale()
+        self.schedule_refresh()
+
+    def is_fresh(self) -> bool:
+        """
+        Czy odczyt może iść do repliki.
+        Zmiany innych stanowisk wykrywane co check_interval sekund (stat pliku na udziale).
+        """
+        now = time.time()
+        changed = False
+        with self._lock:
+            if not self._ready:
+                return False
+            if not self._stale and now - self._last_check >= self.check_interval:
+                self._last_check = now
+                try:
+                    changed = self._primary_stat() != self._synced_stat
+                except OSError:
+                    changed = False  # udział chwilowo niedostępny — zostań na replice
+                if changed:
+                    self._set_stale()
+            fresh = not self._stale
+
+        if changed:
+            print("[REPLICA] Baza główna zmieniona przez inne stanowisko — odświeżanie repliki")
+            self.schedule_refresh()
+        return fresh
+
+    def record_read(self, from_replica: bool):
+        with self._lock:
+            if from_replica:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Metryki dla /api/system/info"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": True,
+                "replica_path": str(self.replica_path),
+                "ready": self._ready,
+                "stale": self._stale,
+                "staleness_seconds": round(time.time() - self._stale_since, 1) if self._stale_since else 0,
+                "last_sync": datetime.fromtimestamp(self._last_sync).isoformat() if self._last_sync else None,
+                "last_sync_seconds": round(self._last_sync_seconds, 3) if self._last_sync_seconds is not None else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else None,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+            }
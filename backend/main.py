@@ -1,16 +1,41 @@
-from fastapi import FastAPI, HTTPException  # ← DODANE HTTPException
+from fastapi import FastAPI, HTTPException, Request  # ← DODANE HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from config import settings
-from database import init_db
+from database import init_db, SessionLocal
+from static_assets import CachedStaticFiles, SelectiveGZipMiddleware
+from services.template_registry import TemplateRegistry
+from services.docx_template_cache import DocxTemplateCache
+from services.import_job_service import ImportJobService
 import sys
 from pathlib import Path
 
-# Inicjalizacja bazy danych
-init_db()
 
-app = FastAPI(title=settings.APP_NAME, version=settings.VERSION)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start serwera (nie import modułu) — procesy robocze puli dokumentów
+    (spawn na Windows) importują main.py jako __mp_main__ i nie mogą
+    powtarzać migracji, startu repliki ani kompilacji szablonów
+    """
+    # Inicjalizacja bazy danych
+    init_db()
+
+    # Importy przerwane zamknięciem aplikacji — nie zostają "w toku" na zawsze
+    db = SessionLocal()
+    try:
+        ImportJobService.fail_interrupted(db)
+    finally:
+        db.close()
+
+    # Kompilacja szablonów dokumentów (wspólne środowisko Jinja, cache na dysku)
+    TemplateRegistry.warm_up()
+    DocxTemplateCache.warm_up()
+    yield
+
+
+app = FastAPI(title=settings.APP_NAME, version=settings.VERSION, lifespan=lifespan)
 
 # CORS dla development
 app.add_middleware(
@@ -21,9 +46,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Kompresja odpowiedzi API i plików bez wariantu .br/.gz
+# (odpowiedzi z Content-Encoding oraz ZIP/PDF/xlsx/docx nie są kompresowane)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # Import routerów
 from routes import firefighters, data, files, settings as settings_route, system as system_route
-from routes import hazardous_degrees, hazardous_records
+from routes import hazardous_degrees, hazardous_records, jobs
 
 
 # WAŻNE: Wszystkie API routes PRZED catch-all
@@ -34,6 +63,7 @@ app.include_router(settings_route.router, prefix="/api/settings", tags=["setting
 app.include_router(system_route.router, prefix="/api/system", tags=["system"])
 app.include_router(hazardous_degrees.router, prefix="/api/hazardous-degrees", tags=["hazardous degrees"])
 app.include_router(hazardous_records.router,prefix="/api/hazardous-records",tags=["hazardous records"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 @app.get("/api")
 def root():
     return {
@@ -76,11 +106,14 @@ def get_resource_path(relative_path):
 frontend_build_path = get_resource_path("frontend/build")
 
 # Serwuj statyczne pliki React (CSS, JS) - PRZED catch-all
+# Pliki z hashem w nazwie: cache immutable, warianty .br/.gz gdy są (static_assets.py)
+frontend_files = None
 if frontend_build_path.exists():
+    frontend_files = CachedStaticFiles(directory=str(frontend_build_path))
     static_path = frontend_build_path / "static"
     if static_path.exists():
         print(f"Mounting static files from: {static_path}")
-        app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
+        app.mount("/static", CachedStaticFiles(directory=str(static_path)), name="static")
     else:
         print(f"Static folder not found: {static_path}")
 else:
@@ -88,25 +121,28 @@ else:
 
 # CATCH-ALL ROUTE - MUSI BYĆ NA SAMYM KOŃCU!
 @app.get("/{full_path:path}")
-async def serve_react_app(full_path: str):
+async def serve_react_app(full_path: str, request: Request):
     """Serwuj React app dla wszystkich ścieżek (obsługa React Router)"""
     
     # ZMIANA: Nie obsługuj API routes - pozwól FastAPI znaleźć właściwy router
     # Jeśli żaden router nie obsłuży /api/*, zostanie zwrócony 404 automatycznie
     if full_path.startswith("api"):
-        # NIE loguj dla API - to zaśmieca logi
         raise HTTPException(status_code=404, detail="API endpoint not found")
     
-    # Dla innych ścieżek - serwuj React
-    print(f"Request for: /{full_path}")
-    
-    index_path = frontend_build_path / "index.html"
-    print(f" -> Serving: {index_path}")
+    if frontend_files is None:
+        raise HTTPException(status_code=404, detail="Frontend not found")
     
-    if index_path.exists():
-        return FileResponse(index_path)
-    
-    raise HTTPException(status_code=404, detail="Frontend not found")
+    # Pliki z katalogu builda (favicon.ico, manifest.json, ...), pozostałe
+    # ścieżki - index.html (no-cache, rewalidacja ETag)
+    if full_path:
+        try:
+            return await frontend_files.get_response(full_path, request.scope)
+        except StarletteHTTPException:
+            pass
+    try:
+        return await frontend_files.get_response("index.html", request.scope)
+    except StarletteHTTPException:
+        raise HTTPException(status_code=404, detail="Frontend not found")
 
 if __name__ == "__main__":
     import uvicorn
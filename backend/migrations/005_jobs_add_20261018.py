@@ -0,0 +1,43 @@
+"""
+Migracja 005: Dodanie tabeli jobs (import plików w tle)
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from database import engine
+from sqlalchemy import text
+
+
+def upgrade():
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id                INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_type          VARCHAR(50) NOT NULL,
+                status            VARCHAR(50) DEFAULT 'queued',
+                original_filename VARCHAR(255),
+                file_id           INTEGER,
+                rows_parsed       INTEGER DEFAULT 0,
+                rows_inserted     INTEGER DEFAULT 0,
+                rows_per_second   FLOAT,
+                error             TEXT,
+                created_at        DATETIME,
+                started_at        DATETIME,
+                finished_at       DATETIME
+            )
+        """))
+        conn.commit()
+
+    from migrations import mark_migration_executed
+    mark_migration_executed(
+        "005_jobs_add_20261018",
+        "Dodanie tabeli jobs (import plików w tle)"
+    )
+    print("[MIGRATION] 005_jobs_add: OK")
+
+
+def downgrade():
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS jobs"))
+        conn.commit()
@@ -0,0 +1,47 @@
+"""
+Migracja 006: Dodanie kolumny content_hash do imported_files
+SHA-256 treści pliku — rozpoznawanie ponownie wgranych zestawień SWD
+(import natychmiastowy przez kopiowanie rekordów).
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from database import engine
+from sqlalchemy import text
+
+
+def upgrade():
+    with engine.connect() as conn:
+        # Sprawdź czy kolumna już istnieje (SQLite nie ma IF NOT EXISTS dla ALTER)
+        result = conn.execute(text("PRAGMA table_info(imported_files)"))
+        columns = [row[1] for row in result.fetchall()]
+
+        if "content_hash" not in columns:
+            conn.execute(text("""
+                ALTER TABLE imported_files
+                ADD COLUMN content_hash VARCHAR(64)
+            """))
+            print("[MIGRATION] 006: Dodano kolumnę content_hash do imported_files")
+        else:
+            print("[MIGRATION] 006: Kolumna content_hash już istnieje — pomijam")
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_imported_files_content_hash
+            ON imported_files (content_hash)
+        """))
+        conn.commit()
+
+    from migrations import mark_migration_executed
+    mark_migration_executed(
+        "006_imported_files_add_hash_20261018",
+        "Dodanie kolumny content_hash do imported_files"
+    )
+    print("[MIGRATION] 006_imported_files_add_hash: OK")
+
+
+def downgrade():
+    # SQLite nie wspiera DROP COLUMN w starszych wersjach
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_imported_files_content_hash"))
+        conn.commit()
+    print("[MIGRATION] 006 downgrade: usunięto indeks, kolumna pozostaje")
@@ -0,0 +1,43 @@
+"""
+Migracja 007: Indeksy złożone na swd_records
+- (file_id, nazwisko_imie, czas_rozp_zdarzenia): lista wyjazdów z filtrem
+  strażaka i zakresu dat, lista strażaków w pliku (indeks pokrywający)
+- (file_id, nr_meldunku): wykrywanie duplikatów przy dodawaniu rekordu
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from database import engine
+from sqlalchemy import text
+
+
+def upgrade():
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_swd_records_file_nazwisko_czas
+            ON swd_records (file_id, nazwisko_imie, czas_rozp_zdarzenia)
+        """))
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_swd_records_file_meldunek
+            ON swd_records (file_id, nr_meldunku)
+        """))
+
+        # Statystyki dla planera zapytań
+        conn.execute(text("ANALYZE swd_records"))
+        conn.commit()
+
+    from migrations import mark_migration_executed
+    mark_migration_executed(
+        "007_swd_records_add_indexes_20261018",
+        "Indeksy złożone na swd_records (plik + strażak + data, plik + nr meldunku)"
+    )
+    print("[MIGRATION] 007_swd_records_add_indexes: OK")
+
+
+def downgrade():
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_swd_records_file_nazwisko_czas"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_swd_records_file_meldunek"))
+        conn.commit()
@@ -0,0 +1,37 @@
+"""
+Migracja 008: Indeks file_id na swd_records
+- lista wyjazdów bez sortowania i stronicowanie kursorem sortuje po id
+  w obrębie pliku — indeks (file_id) przechowuje wpisy w kolejności rowid,
+  więc strona czytana jest prosto z indeksu (bez skanu tabeli i sortowania)
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from database import engine
+from sqlalchemy import text
+
+
+def upgrade():
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_swd_records_file_id
+            ON swd_records (file_id)
+        """))
+
+        # Statystyki dla planera zapytań
+        conn.execute(text("ANALYZE swd_records"))
+        conn.commit()
+
+    from migrations import mark_migration_executed
+    mark_migration_executed(
+        "008_swd_records_add_file_index_20261018",
+        "Indeks file_id na swd_records (stronicowanie kursorem)"
+    )
+    print("[MIGRATION] 008_swd_records_add_file_index: OK")
+
+
+def downgrade():
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_swd_records_file_id"))
+        conn.commit()
@@ -0,0 +1,114 @@
+"""
+Migracja 009: Kolumny liczbowe dat na swd_records i hazardous_records
+- swd_records.czas_rozp_zdarzenia_ts, hazardous_records.czas_od_ts / czas_do_ts:
+  sekundy od 1970 dla dat zapisanych tekstem (models/timestamps.py)
+- indeksy (file_id, czas_rozp_zdarzenia_ts) i (file_id, czas_od_ts) — filtry
+  zakresu dat jako zakres liczb na indeksie zamiast porównania napisów
+- uzupełnienie istniejących rekordów paczkami (BACKFILL_BATCH wierszy na commit),
+  z odczytem różnych formatów dat (ISO, DD.MM.RRRR, ...)
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from database import engine
+from sqlalchemy import text
+from models.timestamps import parse_timestamp
+
+BACKFILL_BATCH = 5000
+
+# tabela → [(kolumna tekstowa, kolumna liczbowa)]
+TIMESTAMP_COLUMNS = {
+    "swd_records": [("czas_rozp_zdarzenia", "czas_rozp_zdarzenia_ts")],
+    "hazardous_records": [("czas_od", "czas_od_ts"), ("czas_do", "czas_do_ts")],
+}
+
+
+def _add_columns(conn, table: str):
+    result = conn.execute(text(f"PRAGMA table_info({table})"))
+    existing = [row[1] for row in result.fetchall()]
+    for _, ts_column in TIMESTAMP_COLUMNS[table]:
+        if ts_column not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {ts_column} INTEGER"))
+            print(f"[MIGRATION] 009: Dodano kolumnę {ts_column} do {table}")
+        else:
+            print(f"[MIGRATION] 009: Kolumna {table}.{ts_column} już istnieje — pomijam")
+
+
+def _backfill(conn, table: str) -> int:
+    """Uzupełnij kolumny *_ts paczkami po id (ponowne uruchomienie kontynuuje)"""
+    pairs = TIMESTAMP_COLUMNS[table]
+    source_columns = ", ".join(source for source, _ in pairs)
+    missing = " OR ".join(f"({ts} IS NULL AND {source} IS NOT NULL)" for source, ts in pairs)
+    assignments = ", ".join(f"{ts} = :{ts}" for _, ts in pairs)
+
+    updated = 0
+    unparsed = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(f"SELECT id, {source_columns} FROM {table} "
+                 f"WHERE id > :last_id AND ({missing}) ORDER BY id LIMIT :batch"),
+            {"last_id": last_id, "batch": BACKFILL_BATCH},
+        ).fetchall()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            values = {ts: parse_timestamp(row[i + 1]) for i, (_, ts) in enumerate(pairs)}
+            unparsed += sum(
+                1 for i, (_, ts) in enumerate(pairs)
+                if values[ts] is None and row[i + 1] is not None
+            )
+            params.append({"id": row[0], **values})
+
+        conn.execute(text(f"UPDATE {table} SET {assignments} WHERE id = :id"), params)
+        conn.commit()
+        updated += len(rows)
+        last_id = rows[-1][0]
+        print(f"[MIGRATION] 009: {table} — uzupełniono {updated} rekordów")
+
+    if unparsed:
+        print(f"[MIGRATION] 009: {table} — {unparsed} wartości dat w nieznanym formacie (pozostają NULL)")
+    return updated
+
+
+def upgrade():
+    with engine.connect() as conn:
+        for table in TIMESTAMP_COLUMNS:
+            _add_columns(conn, table)
+
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_swd_records_file_czas_ts
+            ON swd_records (file_id, czas_rozp_zdarzenia_ts)
+        """))
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_hazardous_records_file_czas_od_ts
+            ON hazardous_records (file_id, czas_od_ts)
+        """))
+        conn.commit()
+
+        for table in TIMESTAMP_COLUMNS:
+            _backfill(conn, table)
+
+        # Statystyki dla planera zapytań
+        conn.execute(text("ANALYZE swd_records"))
+        conn.execute(text("ANALYZE hazardous_records"))
+        conn.commit()
+
+    from migrations import mark_migration_executed
+    mark_migration_executed(
+        "009_records_add_timestamps_20261018",
+        "Kolumny liczbowe dat (czas_rozp_zdarzenia_ts, czas_od_ts, czas_do_ts) z indeksami"
+    )
+    print("[MIGRATION] 009_records_add_timestamps: OK")
+
+
+def downgrade():
+    # SQLite nie wspiera DROP COLUMN w starszych wersjach
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_swd_records_file_czas_ts"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_hazardous_records_file_czas_od_ts"))
+        conn.commit()
+    print("[MIGRATION] 009 downgrade: usunięto indeksy, kolumny pozostają")
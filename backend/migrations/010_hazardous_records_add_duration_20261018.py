@@ -0,0 +1,88 @@
+"""
+Migracja 010: Czas udziału w minutach na hazardous_records
+- kolumna czas_udzialu_min: czas_udzialu ("HH:MM") jako liczba minut
+  (zaokrąglona w górę — models/timestamps.parse_duration_minutes)
+- indeks częściowy ix_hazardous_records_eligible tylko dla rekordów
+  zaliczonych do dodatku (af != '1' lub brak, udział > 30 minut):
+  lista "tylko zaliczone" i dokumenty jednym zapytaniem po indeksie
+- uzupełnienie istniejących rekordów paczkami (BACKFILL_BATCH wierszy na commit)
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from database import engine
+from sqlalchemy import text
+from models.timestamps import parse_duration_minutes
+
+BACKFILL_BATCH = 5000
+
+
+def _backfill(conn) -> int:
+    """Uzupełnij czas_udzialu_min paczkami po id"""
+    updated = 0
+    unparsed = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, czas_udzialu FROM hazardous_records "
+                 "WHERE id > :last_id AND czas_udzialu_min IS NULL AND czas_udzialu IS NOT NULL "
+                 "ORDER BY id LIMIT :batch"),
+            {"last_id": last_id, "batch": BACKFILL_BATCH},
+        ).fetchall()
+        if not rows:
+            break
+
+        params = [{"id": row[0], "minutes": parse_duration_minutes(row[1])} for row in rows]
+        unparsed += sum(1 for p in params if p["minutes"] is None)
+        conn.execute(text("UPDATE hazardous_records SET czas_udzialu_min = :minutes WHERE id = :id"), params)
+        conn.commit()
+        updated += len(rows)
+        last_id = rows[-1][0]
+        print(f"[MIGRATION] 010: uzupełniono {updated} rekordów")
+
+    if unparsed:
+        print(f"[MIGRATION] 010: {unparsed} wartości czas_udzialu w nieznanym formacie (pozostają NULL)")
+    return updated
+
+
+def upgrade():
+    with engine.connect() as conn:
+        # Sprawdź czy kolumna już istnieje (SQLite nie ma IF NOT EXISTS dla ALTER)
+        result = conn.execute(text("PRAGMA table_info(hazardous_records)"))
+        columns = [row[1] for row in result.fetchall()]
+
+        if "czas_udzialu_min" not in columns:
+            conn.execute(text("ALTER TABLE hazardous_records ADD COLUMN czas_udzialu_min INTEGER"))
+            print("[MIGRATION] 010: Dodano kolumnę czas_udzialu_min do hazardous_records")
+        else:
+            print("[MIGRATION] 010: Kolumna czas_udzialu_min już istnieje — pomijam")
+        conn.commit()
+
+        _backfill(conn)
+
+        # Warunek identyczny z models.swd_data.HAZARDOUS_ELIGIBLE
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_hazardous_records_eligible
+            ON hazardous_records (file_id, nazwisko_imie, czas_od_ts)
+            WHERE (af IS NULL OR af != '1') AND czas_udzialu_min > 30
+        """))
+
+        # Statystyki dla planera zapytań
+        conn.execute(text("ANALYZE hazardous_records"))
+        conn.commit()
+
+    from migrations import mark_migration_executed
+    mark_migration_executed(
+        "010_hazardous_records_add_duration_20261018",
+        "Kolumna czas_udzialu_min i indeks częściowy rekordów zaliczonych do dodatku"
+    )
+    print("[MIGRATION] 010_hazardous_records_add_duration: OK")
+
+
+def downgrade():
+    # SQLite nie wspiera DROP COLUMN w starszych wersjach
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_hazardous_records_eligible"))
+        conn.commit()
+    print("[MIGRATION] 010 downgrade: usunięto indeks, kolumna pozostaje")
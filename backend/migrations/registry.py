@@ -26,6 +26,36 @@ MIGRATIONS = [
         "0.4.1",
         "Dodanie kolumny file_type do imported_files"
     ),
+    (
+        "005_jobs_add_20261018",
+        "0.5.3",
+        "Dodanie tabeli jobs (import plików w tle)"
+    ),
+    (
+        "006_imported_files_add_hash_20261018",
+        "0.5.3",
+        "Dodanie kolumny content_hash do imported_files"
+    ),
+    (
+        "007_swd_records_add_indexes_20261018",
+        "0.5.3",
+        "Indeksy złożone na swd_records (plik + strażak + data, plik + nr meldunku)"
+    ),
+    (
+        "008_swd_records_add_file_index_20261018",
+        "0.5.3",
+        "Indeks file_id na swd_records (stronicowanie kursorem)"
+    ),
+    (
+        "009_records_add_timestamps_20261018",
+        "0.5.3",
+        "Kolumny liczbowe dat (czas_rozp_zdarzenia_ts, czas_od_ts, czas_do_ts) z indeksami"
+    ),
+    (
+        "010_hazardous_records_add_duration_20261018",
+        "0.5.3",
+        "Kolumna czas_udzialu_min i indeks częściowy rekordów zaliczonych do dodatku"
+    ),
     # Przyszłe migracje:
     # ("003_reports_table", "0.4.0", "Dodanie tabeli raportów"),
 ]
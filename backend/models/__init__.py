@@ -1,8 +1,9 @@
-from .swd_data import ImportedFile, SWDRecord, Firefighter, HazardousDegree, HazardousRecord
+from .swd_data import ImportedFile, SWDRecord, Firefighter, HazardousDegree, HazardousRecord, ImportJob
 
 __all__ = [
     "ImportedFile", 
     "SWDRecord", 
     "Firefighter", 
     "HazardousDegree",
-    "HazardousRecord"]
\ No newline at end of file
+    "HazardousRecord",
+    "ImportJob"]
\ No newline at end of file
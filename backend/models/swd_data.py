@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, Index, event
+from sqlalchemy import and_, or_, literal_column
+from sqlalchemy.orm import relationship, object_session
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -7,6 +8,7 @@ from pathlib import Path
 # Dodaj parent directory do path żeby zaimportować database
 sys.path.append(str(Path(__file__).parent.parent))
 from database import Base
+from models.timestamps import parse_timestamp, parse_duration_minutes
 
 class ImportedFile(Base):
     __tablename__ = "imported_files"
@@ -24,6 +26,9 @@ class ImportedFile(Base):
     # "departures" | "hazardous"
     file_type = Column(String(50), default="departures")
 
+    # SHA-256 treści pliku — wykrywanie ponownie wgranych plików (migracja 006)
+    content_hash = Column(String(64), index=True)
+
     swd_records = relationship(
         "SWDRecord", back_populates="file", cascade="all, delete-orphan"
     )
@@ -53,6 +58,9 @@ class SWDRecord(Base):
     czas_rozp_zdarzenia = Column(String(100))  
     funkcja = Column(String(100))
     
+    # czas_rozp_zdarzenia jako sekundy od 1970 (migracja 009) — filtry zakresu dat
+    czas_rozp_zdarzenia_ts = Column(Integer)
+    
     # Metadane - te są automatyczne
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -60,6 +68,15 @@ class SWDRecord(Base):
     # Relacja do pliku
     file = relationship("ImportedFile", back_populates="swd_records")
     
+    # Indeksy (migracje 007-009) — filtry listy wyjazdów (strażak, zakres dat),
+    # lista strażaków, wykrywanie duplikatów, stronicowanie po id
+    __table_args__ = (
+        Index("ix_swd_records_file_nazwisko_czas", "file_id", "nazwisko_imie", "czas_rozp_zdarzenia"),
+        Index("ix_swd_records_file_meldunek", "file_id", "nr_meldunku"),
+        Index("ix_swd_records_file_id", "file_id"),
+        Index("ix_swd_records_file_czas_ts", "file_id", "czas_rozp_zdarzenia_ts"),
+    )
+    
     def to_dict(self):
         """Konwersja do słownika dla API"""
         return {
@@ -140,6 +157,16 @@ class HazardousDegree(Base):
             "created_at":    self.created_at.isoformat() if self.created_at else None,
             "updated_at":    self.updated_at.isoformat() if self.updated_at else None,
         }    
+def _degree_catalog(record):
+    """Słownik id → stopień z katalogu w pamięci (None dla rekordu bez sesji)"""
+    db = object_session(record)
+    if db is None:
+        return None
+    # Import w funkcji — serwis importuje modele
+    from services.hazardous_degrees_service import HazardousDegreeCatalog
+    return HazardousDegreeCatalog.get_by_id_map(db)
+
+
 class HazardousRecord(Base):
     __tablename__ = "hazardous_records"
 
@@ -165,6 +192,12 @@ class HazardousRecord(Base):
     data_aktualizacji_szkod = Column(String(50))   # String — jak SWDRecord
     opis_st_szkodliwosci    = Column(Text)
 
+    # czas_od / czas_do jako sekundy od 1970 (migracja 009) — filtry zakresu dat
+    czas_od_ts              = Column(Integer)
+    czas_do_ts              = Column(Integer)
+    # czas_udzialu w minutach (migracja 010) — warunek zaliczenia do dodatku
+    czas_udzialu_min        = Column(Integer)
+
     # Przypisywane ręcznie przez użytkownika — nullable przy imporcie
     hazardous_degree_id = Column(
         Integer,
@@ -179,7 +212,30 @@ class HazardousRecord(Base):
     file             = relationship("ImportedFile", back_populates="hazardous_records")
     hazardous_degree = relationship("HazardousDegree", foreign_keys=[hazardous_degree_id])
 
-    def to_dict(self):
+    # Indeksy z migracji 003 — zadeklarowane w modelu, żeby create_all
+    # (nowa baza) tworzył je od razu, a nie dopiero przy kolejnym starcie
+    __table_args__ = (
+        Index("ix_hazardous_records_file_id", "file_id"),
+        Index("ix_hazardous_records_nazwisko", "nazwisko_imie"),
+        Index("ix_hazardous_records_degree", "hazardous_degree_id"),
+        Index("ix_hazardous_records_file_czas_od_ts", "file_id", "czas_od_ts"),
+    )
+
+    def to_dict(self, degrees=None):
+        """
+        degrees — słownik stopni (np. DegreeLookup żądania) z metodą get(id);
+        bez niego stopień z katalogu w pamięci (HazardousDegreeCatalog).
+        Relacja hazardous_degree tylko dla stopnia spoza katalogu
+        (np. dodanego w tej samej, niezatwierdzonej sesji).
+        """
+        degree = None
+        if self.hazardous_degree_id is not None:
+            if degrees is None:
+                degrees = _degree_catalog(self)
+            if degrees is not None:
+                degree = degrees.get(self.hazardous_degree_id)
+            if degree is None and self.hazardous_degree is not None:
+                degree = self.hazardous_degree.to_dict()
         return {
             "id":                       self.id,
             "file_id":                  self.file_id,
@@ -201,7 +257,79 @@ class HazardousRecord(Base):
             "data_aktualizacji_szkod":  self.data_aktualizacji_szkod,  # już string
             "opis_st_szkodliwosci":     self.opis_st_szkodliwosci,
             "hazardous_degree_id":      self.hazardous_degree_id,
-            "hazardous_degree":         self.hazardous_degree.to_dict() if self.hazardous_degree else None,
+            "hazardous_degree":         degree,
             "created_at":               self.created_at,
             "updated_at":               self.updated_at,
         }
+
+
+class ImportJob(Base):
+    """
+    Zadanie importu pliku Excel wykonywane w tle (ImportJobService).
+    status: "queued" | "processing" | "completed" | "failed"
+    """
+    __tablename__ = "jobs"
+
+    id                = Column(Integer, primary_key=True, index=True)
+    job_type          = Column(String(50), nullable=False)   # "departures" | "hazardous"
+    status            = Column(String(50), default="queued")
+    original_filename = Column(String(255))
+    file_id           = Column(Integer, nullable=True)       # ImportedFile utworzony przez zadanie
+    rows_parsed       = Column(Integer, default=0)
+    rows_inserted     = Column(Integer, default=0)
+    rows_per_second   = Column(Float, nullable=True)
+    error             = Column(Text)
+
+    created_at  = Column(DateTime, default=datetime.utcnow)
+    started_at  = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "id":                self.id,
+            "job_type":          self.job_type,
+            "status":            self.status,
+            "original_filename": self.original_filename,
+            "file_id":           self.file_id,
+            "rows_parsed":       self.rows_parsed or 0,
+            "rows_inserted":     self.rows_inserted or 0,
+            "rows_per_second":   self.rows_per_second,
+            "error":             self.error,
+            "created_at":        self.created_at.isoformat() if self.created_at else None,
+            "started_at":        self.started_at.isoformat() if self.started_at else None,
+            "finished_at":       self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+# Kolumny *_ts i czas_udzialu_min uzupełniane przy każdym zapisie ORM (dodanie, edycja rekordu).
+# Masowy import i klonowanie (INSERT bez ORM) liczą je same — BULK_COLUMNS
+# w DataService, BULK_CONVERTERS w HazardousRecordsService.
+
+# Rekord zaliczony do dodatku szkodliwego: af != "1" (lub brak) i udział > 30 minut.
+# Wartości jako literały (nie parametry) — SQLite użyje indeksu częściowego
+# ix_hazardous_records_eligible tylko dla warunku identycznego z jego WHERE.
+HAZARDOUS_ELIGIBLE = and_(
+    or_(HazardousRecord.af.is_(None), HazardousRecord.af != literal_column("'1'")),
+    HazardousRecord.czas_udzialu_min > literal_column("30"),
+)
+
+# Indeks częściowy (migracja 010) — tylko rekordy zaliczone do dodatku
+Index(
+    "ix_hazardous_records_eligible",
+    HazardousRecord.file_id, HazardousRecord.nazwisko_imie, HazardousRecord.czas_od_ts,
+    sqlite_where=HAZARDOUS_ELIGIBLE,
+)
+
+
+@event.listens_for(SWDRecord, "before_insert")
+@event.listens_for(SWDRecord, "before_update")
+def _sync_swd_record_timestamps(mapper, connection, target):
+    target.czas_rozp_zdarzenia_ts = parse_timestamp(target.czas_rozp_zdarzenia)
+
+
+@event.listens_for(HazardousRecord, "before_insert")
+@event.listens_for(HazardousRecord, "before_update")
+def _sync_hazardous_record_timestamps(mapper, connection, target):
+    target.czas_od_ts = parse_timestamp(target.czas_od)
+    target.czas_do_ts = parse_timestamp(target.czas_do)
+    target.czas_udzialu_min = parse_duration_minutes(target.czas_udzialu)
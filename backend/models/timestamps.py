@@ -0,0 +1,112 @@
+"""
+Znaczniki czasu i czasy trwania dla wartości przechowywanych jako tekst.
+
+Kolumny czas_rozp_zdarzenia / czas_od / czas_do mają typ String (wartość
+z importu Excela). Obok nich przechowywane są kolumny *_ts — liczba sekund
+od 1970-01-01 dla czasu zapisanego w kolumnie tekstowej (bez strefy — czas
+lokalny traktowany jako UTC, liczy się tylko porządek i odstępy). Filtry
+zakresu dat porównują liczby na indeksie zamiast napisów.
+
+Czas udziału (czas_udzialu, "HH:MM") ma obok kolumnę czas_udzialu_min —
+liczbę minut, na której opiera się warunek zaliczenia do dodatku szkodliwego.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
+import calendar
+
+# Formaty spotykane w plikach SWD i w danych wpisanych ręcznie
+TIMESTAMP_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y/%m/%d",
+)
+
+SECONDS_PER_DAY = 86400
+
+
+def parse_timestamp(value) -> Optional[int]:
+    """Sekundy od 1970-01-01 dla daty/czasu (tekst, datetime, date) — None gdy nie da się odczytać"""
+    if value is None:
+        return None
+    if isinstance(value, date):   # także datetime
+        return calendar.timegm(value.timetuple())
+
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        # Szybka ścieżka — format ISO z importu ('YYYY-MM-DD HH:MM:SS')
+        return calendar.timegm(datetime.fromisoformat(text).timetuple())
+    except ValueError:
+        pass
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return calendar.timegm(datetime.strptime(text, fmt).timetuple())
+        except ValueError:
+            continue
+    return None
+
+
+def day_range(date_from: Optional[str], date_to: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Granice filtra dat jako [od, do) w sekundach.
+    Data bez godziny w date_to obejmuje cały dzień (jak dotychczasowe "23:59:59").
+    Wartość, której nie da się odczytać → None (filtr tekstowy po staremu).
+    """
+    start = parse_timestamp(date_from) if date_from else None
+    end = None
+    if date_to:
+        end = parse_timestamp(date_to)
+        if end is not None:
+            end += SECONDS_PER_DAY if len(date_to.strip()) <= 10 else 1
+    return start, end
+
+
+
+def parse_duration_minutes(value) -> Optional[int]:
+    """
+    Czas trwania w pełnych minutach, zaokrąglony w górę ("00:30:01" → 31),
+    żeby "> 30 minut" znaczyło to samo co dotychczasowe porównanie "> '00:30'".
+    Akceptuje "H:MM", "HH:MM:SS", "1 day, 2:00:00", time i timedelta.
+    None gdy nie da się odczytać.
+    """
+    if value is None:
+        return None
+    if isinstance(value, timedelta):
+        seconds = int(value.total_seconds())
+    elif isinstance(value, time):
+        seconds = value.hour * 3600 + value.minute * 60 + value.second
+    else:
+        text = str(value).strip()
+        if not text:
+            return None
+        days = 0
+        if "day" in text:
+            day_part, _, text = text.partition(",")
+            try:
+                days = int(day_part.split()[0])
+            except (ValueError, IndexError):
+                return None
+            text = text.strip()
+        parts = text.split(":")
+        if len(parts) not in (2, 3):
+            return None
+        try:
+            hours, minutes = int(parts[0]), int(parts[1])
+            secs = int(float(parts[2])) if len(parts) == 3 else 0
+        except ValueError:
+            return None
+        seconds = days * SECONDS_PER_DAY + hours * 3600 + minutes * 60 + secs
+    if seconds < 0:
+        return None
+    return -(-seconds // 60)
@@ -1,19 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import sys
 from pathlib import Path
 import unicodedata
 import re
+from itertools import chain
 from urllib.parse import quote
+from io import BytesIO
 
 sys.path.append(str(Path(__file__).parent.parent))
 from database import get_db
 from services.data_service import DataService
 from services.departures_excel_service import DeparturesExcelService
 from services.document_generator_service import DocumentGeneratorService
+from services.batch_document_service import BatchDocumentService
+from services.firefighter_service import FirefighterService
+from services.keyset_pagination import InvalidCursorError, next_cursor
+from services.json_response import FastJSONResponse, rows_to_dicts
+from services.columnar_format import FORMAT_COLUMNAR, FORMAT_ROWS, encode_columnar
+from models.swd_data import SWDRecord
 
 router = APIRouter()
 
@@ -59,6 +67,16 @@ def encode_filename_header(filename: str) -> str:
     # RFC 5987: filename*=UTF-8''encoded_filename
     return f"attachment; filename*=UTF-8''{encoded_filename}"
 
+def peek_records(records):
+    """
+    Sprawdza czy generator rekordów nie jest pusty bez jego wyczerpania.
+    Zwraca None dla braku rekordów, w przeciwnym razie iterator z pierwszym rekordem.
+    """
+    first = next(records, None)
+    if first is None:
+        return None
+    return chain([first], records)
+
 @router.get("/records")
 def get_records(
     file_id: Optional[int] = None,
@@ -142,6 +160,7 @@ def get_firefighters_in_file(file_id: int, db: Session = Depends(get_db)):
 
 @router.get("/files/{file_id}/records")
 def get_file_records(
+    request: Request,
     file_id: int,
     firefighter: Optional[str] = None,
     date_from: Optional[str] = None,
@@ -150,35 +169,40 @@ def get_file_records(
     sort_order: Optional[str] = 'asc',
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    format: str = Query(FORMAT_ROWS, regex="^(rows|columnar)$"),
     db: Session = Depends(get_db)
 ):
     """
     Pobierz rekordy z danego pliku
+    Stronicowanie: skip/limit albo cursor = next_cursor z poprzedniej odpowiedzi
+    (keyset — stały czas niezależnie od głębokości strony)
+    format=columnar — nagłówek kolumn + tablice kolumn (services/columnar_format.py)
     """
-    # Pobierz rekordy
-    if date_from or date_to or firefighter:
-        records = DataService.get_records_by_file_with_date_filter(
-            db, file_id, date_from, date_to, firefighter, skip, limit, sort_by, sort_order
-        )
-        # Policz całkowitą liczbę bez paginacji
-        total_count = DataService.count_records_by_file_with_date_filter(
-            db, file_id, date_from, date_to, firefighter
-        )
-    else:
-        records = DataService.get_records_by_file(
-            db, file_id, skip, limit, sort_by, sort_order
+    # Strona i total_count jednym zapytaniem (total zapamiętywany per filtr),
+    # same kolumny listy jako wiersze → JSON bez to_dict() i jsonable_encoder
+    columns = DataService.LISTING_COLUMNS
+    try:
+        records, total_count = DataService.list_records(
+            db, file_id, date_from, date_to, firefighter, skip, limit, sort_by, sort_order, cursor,
+            columns=columns,
         )
-        # Policz całkowitą liczbę bez paginacji
-        total_count = DataService.count_records_by_file(db, file_id)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return {
-        "records": [record.to_dict() for record in records],
+    if format == FORMAT_COLUMNAR:
+        content = encode_columnar(records, columns, DataService.DICTIONARY_COLUMNS)
+    else:
+        content = {"records": rows_to_dicts(records, columns)}
+    content.update({
         "file_id": file_id,
         "skip": skip,
         "limit": limit,
         "count": len(records),
-        "total_count": total_count 
-    }
+        "total_count": total_count,
+        "next_cursor": next_cursor(records, limit, SWDRecord, sort_by, sort_order),
+    })
+    return FastJSONResponse(content, accept_encoding=request.headers.get("accept-encoding"))
 
 @router.post("/files/{file_id}/records")
 def create_record(
@@ -250,22 +274,14 @@ def export_departures_to_excel(
     Obsługuje te same filtry co endpoint listowania
     """
     try:
-        # Pobierz wszystkie rekordy z filtrami (bez limitów paginacji)
-        if date_from or date_to or firefighter:
-            records = DataService.get_records_by_file_with_date_filter(
-                db, file_id, date_from, date_to, firefighter, skip=0, limit=100000
-            )
-        else:
-            records = DataService.get_records_by_file(
-                db, file_id, skip=0, limit=100000
-            )
+        # Wszystkie rekordy z filtrami - generator prosto z bazy (bez limitu)
+        records_data = peek_records(DataService.iter_records_by_file(
+            db, file_id, date_from, date_to, firefighter
+        ))
         
-        if not records:
+        if records_data is None:
             raise HTTPException(status_code=404, detail="Brak danych do eksportu")
         
-        # Konwertuj do słowników
-        records_data = [record.to_dict() for record in records]
-        
         # Generuj plik Excel
         file_content = departures_excel_service.export_to_excel(records_data)
         
@@ -318,22 +334,14 @@ def export_departures_to_csv(
     Obsługuje te same filtry co endpoint listowania
     """
     try:
-        # Pobierz wszystkie rekordy z filtrami (bez limitów paginacji)
-        if date_from or date_to or firefighter:
-            records = DataService.get_records_by_file_with_date_filter(
-                db, file_id, date_from, date_to, firefighter, skip=0, limit=100000
-            )
-        else:
-            records = DataService.get_records_by_file(
-                db, file_id, skip=0, limit=100000
-            )
+        # Wszystkie rekordy z filtrami - generator prosto z bazy (bez limitu)
+        records_data = peek_records(DataService.iter_records_by_file(
+            db, file_id, date_from, date_to, firefighter
+        ))
         
-        if not records:
+        if records_data is None:
             raise HTTPException(status_code=404, detail="Brak danych do eksportu")
         
-        # Konwertuj do słowników
-        records_data = [record.to_dict() for record in records]
-        
         # Generuj plik CSV
         file_content = departures_excel_service.export_to_csv(records_data)
         
@@ -407,22 +415,14 @@ def generate_document(
                 detail="Musisz wybrać zakres dat (od - do) aby wygenerować dokument"
             )
         
-        # Pobierz wszystkie rekordy z filtrami
-        if date_from or date_to or firefighter:
-            records = DataService.get_records_by_file_with_date_filter(
-                db, file_id, date_from, date_to, firefighter, skip=0, limit=100000
-            )
-        else:
-            records = DataService.get_records_by_file(
-                db, file_id, skip=0, limit=100000
-            )
+        # Pobierz wszystkie rekordy z filtrami (słowniki prosto z bazy, bez obiektów ORM)
+        records_data = list(DataService.iter_records_by_file(
+            db, file_id, date_from, date_to, firefighter
+        ))
         
-        if not records:
+        if not records_data:
             raise HTTPException(status_code=404, detail="Brak danych do wygenerowania dokumentu")
         
-        # Konwertuj do słowników
-        records_data = [record.to_dict() for record in records]
-        
         # Pobierz dane strażaka z PIERWSZEGO REKORDU wyjazdów (jako fallback)
         # oraz spróbuj z bazy Firefighters
         firefighter_data = None
@@ -443,11 +443,11 @@ def generate_document(
             print(f"[WARN] Nie znaleziono strażaka w bazie Firefighters: {e}")
         
         # SPOSÓB 2: Jeśli nie znaleziono w Firefighters, użyj danych z pierwszego rekordu SWD
-        if not firefighter_data and records:
-            first_record = records[0]
+        if not firefighter_data and records_data:
+            first_record = records_data[0]
             firefighter_data = {
-                'stopien': first_record.stopien if first_record.stopien else '.....................',
-                'nazwisko_imie': first_record.nazwisko_imie if first_record.nazwisko_imie else firefighter,
+                'stopien': first_record['stopien'] if first_record['stopien'] else '.....................',
+                'nazwisko_imie': first_record['nazwisko_imie'] if first_record['nazwisko_imie'] else firefighter,
                 'stanowisko': '.....................'  # Brak stanowiska w SWDRecord - wypełnij kropkami
             }
             print(f"[WARN] Używam danych z pierwszego rekordu SWD: {firefighter_data}")
@@ -487,9 +487,14 @@ def generate_document(
             )
         
         elif format == 'pdf':
-            file_content = document_service.generate_pdf(
-                firefighter, records_data, date_from, date_to, firefighter_data
-            )
+            # Render w puli procesów przy DOCUMENT_WORKERS > 1, inaczej w procesie aplikacji
+            file_content = BytesIO(BatchDocumentService.render_one("karta_wyjazdow", "pdf", {
+                'firefighter_name': firefighter,
+                'records': records_data,
+                'date_from': date_from,
+                'date_to': date_to,
+                'firefighter_data': firefighter_data,
+            }))
             filename = f"{filename_base}.pdf"
             
             return StreamingResponse(
@@ -522,4 +527,115 @@ def generate_document(
         print(f"[ERROR] BŁĄD GENEROWANIA DOKUMENTU: {str(e)}")
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Dokumenty zbiorcze — formaty i typy MIME
+BATCH_MEDIA_TYPES = {
+    'pdf': "application/pdf",
+    'docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+def batch_firefighter_data(firefighter, name: str, records) -> dict:
+    """
+    Dane strażaka do dokumentu zbiorczego (jak w generate_document):
+    baza Firefighters, potem pierwszy rekord SWD, potem kropki
+    """
+    if firefighter is not None:
+        return {
+            'stopien': firefighter.stopien,
+            'nazwisko_imie': firefighter.nazwisko_imie,
+            'stanowisko': firefighter.stanowisko
+        }
+    first_record = records[0]
+    return {
+        'stopien': first_record['stopien'] if first_record['stopien'] else '.....................',
+        'nazwisko_imie': first_record['nazwisko_imie'] if first_record['nazwisko_imie'] else name,
+        'stanowisko': '.....................'
+    }
+
+@router.get("/files/{file_id}/generate-documents/{format}")
+def generate_documents_batch(
+    file_id: int,
+    format: str,  # pdf, docx
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    firefighters: Optional[List[str]] = Query(None),
+    merge: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Karty wyjazdów wszystkich strażaków z pliku (albo wybranych: ?firefighters=...&firefighters=...)
+    Wynik: ZIP z dokumentem na strażaka lub — dla PDF z merge=true — jeden scalony PDF
+    """
+    try:
+        if format not in BATCH_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail="Nieprawidłowy format. Dostępne: pdf, docx")
+        
+        if merge and format != 'pdf':
+            raise HTTPException(status_code=400, detail="Scalanie w jeden plik dostępne tylko dla PDF")
+        
+        if not date_from or not date_to:
+            raise HTTPException(
+                status_code=400,
+                detail="Musisz wybrać zakres dat (od - do) aby wygenerować dokument"
+            )
+        
+        # Rekordy wszystkich strażaków jednym zapytaniem
+        groups = list(DataService.iter_records_by_firefighter(
+            db, file_id, date_from, date_to, firefighters
+        ))
+        if not groups:
+            raise HTTPException(status_code=404, detail="Brak danych do wygenerowania dokumentu")
+        
+        known = FirefighterService.get_by_names(db, [name for name, _ in groups])
+        jobs = []
+        used_filenames = set()
+        for name, records in groups:
+            jobs.append((
+                BatchDocumentService.document_filename("karta_wyjazdow", name, format, used_filenames),
+                {
+                    'firefighter_name': name,
+                    'records': records,
+                    'date_from': date_from,
+                    'date_to': date_to,
+                    'firefighter_data': batch_firefighter_data(known.get(name), name, records),
+                },
+            ))
+        
+        from datetime import datetime
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        print(f"[INFO] Generuję {len(jobs)} kart wyjazdów ({format}{', scalone' if merge else ''})")
+        
+        documents = BatchDocumentService.render_all("karta_wyjazdow", format, jobs)
+        
+        if merge:
+            output, errors = BatchDocumentService.merge_pdf(documents)
+            if len(errors) == len(jobs):
+                output.close()
+                raise HTTPException(status_code=500, detail=f"Nie wygenerowano żadnego dokumentu: {errors[0]}")
+            headers = {
+                "Content-Disposition": encode_filename_header(f"karty_wyjazdow_{timestamp}.pdf"),
+                "Access-Control-Expose-Headers": "Content-Disposition, X-Documents-Failed",
+                "X-Documents-Failed": str(len(errors)),
+            }
+            return StreamingResponse(
+                BatchDocumentService.iter_file(output), media_type=BATCH_MEDIA_TYPES['pdf'], headers=headers
+            )
+        
+        return StreamingResponse(
+            BatchDocumentService.stream_zip(documents),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": encode_filename_header(f"karty_wyjazdow_{timestamp}.zip"),
+                "Access-Control-Expose-Headers": "Content-Disposition",
+            }
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[ERROR] BŁĄD GENEROWANIA DOKUMENTÓW ZBIORCZYCH: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,27 +1,31 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pathlib import Path
-import shutil
 import uuid
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from database import get_db
 from config import settings
-from services.excel_processor import ExcelProcessor
 from services.data_service import DataService
+from services.import_job_service import ImportJobService
+from services.file_storage_service import FileStorageService
 
 router = APIRouter()
-processor = ExcelProcessor()
 
 @router.post("/upload")
 async def upload_file(
     file: UploadFile = File(...),
+    instant_import: bool = False,
     db: Session = Depends(get_db)
 ):
     """
-    Upload i przetwarzanie pliku Excel
+    Upload pliku Excel - przetwarzanie w tle.
+    Zwraca od razu job_id; postęp: GET /api/jobs/{job_id}
+    - instant_import: jeśli identyczny plik (SHA-256) był już zaimportowany,
+      skopiuj jego rekordy zamiast ponownie parsować plik
     """
+    file_path = None
     try:
         # Walidacja rozszerzenia
         file_ext = Path(file.filename).suffix.lower()
@@ -35,40 +39,57 @@ async def upload_file(
         unique_filename = f"{uuid.uuid4()}{file_ext}"
         file_path = settings.UPLOAD_DIR / unique_filename
         
-        # Zapisz plik
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Zapisz plik (skrót SHA-256 liczony w trakcie zapisu)
+        content_hash = FileStorageService.save_upload(file, file_path)
+        existing = DataService.find_file_by_hash(db, content_hash)
         
-        # Przetwórz plik
-        records_data = processor.process_excel_file(file_path)
+        if existing and instant_import:
+            # Rekordy kopiowane z wcześniejszego importu, nowy rekord pliku
+            # dostaje własną kopię w uploads (jak przy zwykłym imporcie)
+            import_stats = ImportJobService.instant_import(
+                db,
+                job_type="departures",
+                source_file=existing,
+                file_path=file_path,
+                filename=unique_filename,
+                original_filename=file.filename,
+                content_hash=content_hash,
+            )
+            return {
+                "success": True,
+                "message": "Plik zaimportowany natychmiastowo (kopia wcześniejszego importu)",
+                "instant": True,
+                "file_id": import_stats["file_id"],
+                "duplicate_of_file_id": existing.id,
+                "filename": file.filename,
+                "records_imported": import_stats["created_count"],
+                "rows_per_second": import_stats["rows_per_second"]
+            }
         
-        # Utwórz rekord pliku w bazie
-        file_record = DataService.create_file_record(
-            db=db,
+        # Przekaż do kolejki importu (parsowanie + zapis rekordów w tle)
+        job = ImportJobService.submit(
+            db,
+            job_type="departures",
+            file_path=file_path,
             filename=unique_filename,
             original_filename=file.filename,
-            file_path=str(file_path),
-            rows_count=records_data.count
-        )
-        
-        # Zapisz rekordy do bazy
-        created_count = DataService.create_records(
-            db=db,
-            file_id=file_record.id,
-            records_data=records_data
+            content_hash=content_hash,
         )
         
         return {
             "success": True,
-            "message": f"Plik przetworzony pomyślnie",
-            "file_id": file_record.id,
+            "message": "Plik przyjęty do importu",
+            "job_id": job.id,
+            "status": job.status,
             "filename": file.filename,
-            "records_imported": created_count
+            "duplicate_of_file_id": existing.id if existing else None
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         # W przypadku błędu, usuń plik
-        if file_path.exists():
+        if file_path and file_path.exists():
             file_path.unlink()
         
         raise HTTPException(status_code=500, detail=str(e))
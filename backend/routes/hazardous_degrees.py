@@ -12,7 +12,7 @@ Endpointy:
   GET    /hazardous-degrees/export/excel  - eksport do xlsx
   GET    /hazardous-degrees/export/csv    - eksport do csv
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
@@ -25,7 +25,7 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent))
 from database import get_db
 from config import settings
-from services.hazardous_degrees_service import HazardousDegreesService
+from services.hazardous_degrees_service import HazardousDegreesService, HazardousDegreeCatalog
 from services.hazardous_degrees_excel_service import HazardousDegreesExcelService
 
 router = APIRouter()
@@ -52,6 +52,8 @@ class HazardousDegreeUpdate(BaseModel):
 
 @router.get("/")
 def get_hazardous_degrees(
+    request: Request,
+    response: Response,
     search:  Optional[str] = None,
     stopien: Optional[int] = None,
     skip:    int = Query(0,   ge=0),
@@ -63,19 +65,20 @@ def get_hazardous_degrees(
     - search:  szukaj w opisie i uwagach
     - stopien: filtruj po stopniu (liczba arabska)
     - skip, limit: paginacja
+    Odpowiedź z katalogu w pamięci; ETag = wersja katalogu, If-None-Match
+    z aktualną wersją → 304 bez treści.
     """
-    if search:
-        records = HazardousDegreesService.search(db, search, skip, limit)
-        total   = HazardousDegreesService.get_total_count(db, search=search)
-    elif stopien is not None:
-        records = HazardousDegreesService.get_by_stopien(db, stopien, skip, limit)
-        total   = HazardousDegreesService.get_total_count(db, stopien=stopien)
-    else:
-        records = HazardousDegreesService.get_all(db, skip, limit)
-        total   = HazardousDegreesService.get_total_count(db)
+    version, records, total = HazardousDegreeCatalog.query(db, search, stopien, skip, limit)
 
+    etag = HazardousDegreeCatalog.etag(version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
     return {
-        "records": [r.to_dict() for r in records],
+        "records": records,
         "total_count": total,
         "skip":  skip,
         "limit": limit,
@@ -153,6 +156,9 @@ async def import_from_excel(
                 skipped_count += 1
                 errors.append(f"{record_data.get('stopien')}.{record_data.get('punkt')}: {str(e)}")
 
+        # Nowa wersja katalogu po imporcie (ETag listy)
+        HazardousDegreeCatalog.invalidate()
+
         return {
             "success": True,
             "message": f"Zaimportowano {created_count} rekordów",
@@ -1,7 +1,7 @@
 """
 backend/routes/hazardous_records.py
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
@@ -9,7 +9,8 @@ from typing import Optional, List
 from pathlib import Path
 from urllib.parse import quote
 from datetime import datetime
-import shutil
+from itertools import chain
+import re
 import uuid
 import sys
 
@@ -17,10 +18,24 @@ sys.path.append(str(Path(__file__).parent.parent))
 from database import get_db
 from config import settings
 from services.hazardous_records_service import HazardousRecordsService
-from services.excel_processor import ExcelProcessor
+from services.hazardous_degrees_service import DegreeLookup
+from services.hazardous_document_service import HazardousDocumentService
+from services.import_job_service import ImportJobService
+from services.batch_document_service import BatchDocumentService
+from services.firefighter_service import FirefighterService
+from services.file_storage_service import FileStorageService
+from services.keyset_pagination import InvalidCursorError, next_cursor
+from services.json_response import FastJSONResponse, rows_to_dicts
+from services.columnar_format import FORMAT_COLUMNAR, FORMAT_ROWS, encode_columnar
+from models.swd_data import HazardousRecord
 
 router = APIRouter()
-excel_processor = ExcelProcessor()
+document_service = HazardousDocumentService()
+
+
+def get_degree_lookup(db: Session = Depends(get_db)) -> DegreeLookup:
+    """Słownik stopni szkodliwości na czas żądania (katalog jednym zapytaniem)"""
+    return DegreeLookup(db)
 
 
 # ── Pydantic schemas ─────────────────────────────────────────────────────────
@@ -73,6 +88,13 @@ class RecordUpdate(BaseModel):
 def _encode_filename(filename: str) -> str:
     return f"attachment; filename*=UTF-8''{quote(filename)}"
 
+def _peek_records(records):
+    """None gdy generator rekordów jest pusty, inaczej iterator od pierwszego rekordu"""
+    first = next(records, None)
+    if first is None:
+        return None
+    return chain([first], records)
+
 def _build_filename(prefix: str, firefighter: str, date_from: str, date_to: str,
                     only_unassigned: bool, only_eligible: bool, ext: str) -> str:
     """Buduje nazwę pliku uwzględniając aktywne filtry"""
@@ -140,57 +162,90 @@ def delete_file(file_id: int, db: Session = Depends(get_db)):
 @router.post("/files/upload")
 async def upload_file(
     file: UploadFile = File(...),
+    defer_indexes: bool = False,
+    instant_import: bool = False,
     db: Session = Depends(get_db)
 ):
+    """
+    Upload pliku — import w tle, zwraca job_id (postęp: GET /api/jobs/{job_id}).
+    instant_import: identyczny plik (SHA-256) już zaimportowany → kopia jego rekordów
+    """
     file_path = None
     try:
         file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in [".xlsx", ".xls"]:
-            raise HTTPException(status_code=400, detail="Dozwolone: .xlsx, .xls")
+        # .xls (Excel 97-2003) odrzucany od razu — import w tle i tak by się nie udał
+        if file_ext not in settings.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Nieprawidłowe rozszerzenie pliku. Dozwolone: {settings.ALLOWED_EXTENSIONS}"
+            )
 
         unique_filename = f"hazardous_{uuid.uuid4()}{file_ext}"
         file_path = Path(settings.UPLOAD_DIR) / unique_filename
 
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        records_data = excel_processor.process_excel_file(file_path)
-
-        if not records_data or not hasattr(records_data, "items") or len(records_data.items) == 0:
-            raise HTTPException(status_code=400, detail="Nie znaleziono danych w pliku")
+        content_hash = FileStorageService.save_upload(file, file_path)
+        existing = HazardousRecordsService.find_file_by_hash(db, content_hash)
+
+        if existing and instant_import:
+            import_stats = ImportJobService.instant_import(
+                db,
+                job_type="hazardous",
+                source_file=existing,
+                file_path=file_path,
+                filename=file.filename,
+                original_filename=file.filename,
+                content_hash=content_hash,
+            )
+            # Plik tymczasowy — jak po zwykłym imporcie (keep_file=False)
+            Path(file_path).unlink()
+            return {
+                "success":              True,
+                "message":              f"Zaimportowano {import_stats['created_count']} rekordów (kopia wcześniejszego importu)",
+                "instant":              True,
+                "file_id":              import_stats["file_id"],
+                "duplicate_of_file_id": existing.id,
+                "filename":             file.filename,
+                "records_imported":     import_stats["created_count"],
+                "rows_per_second":      import_stats["rows_per_second"],
+            }
 
-        file_record = HazardousRecordsService.create_file_record(
+        # Plik tymczasowy — zadanie usuwa go po imporcie (keep_file=False)
+        job = ImportJobService.submit(
             db,
+            job_type="hazardous",
+            file_path=file_path,
             filename=file.filename,
             original_filename=file.filename,
-            file_path=str(file_path),
-            rows_count=len(records_data.items),
+            keep_file=False,
+            options={"defer_indexes": defer_indexes},
+            content_hash=content_hash,
         )
 
-        created = HazardousRecordsService.create_records(db, file_record.id, records_data)
-
         return {
-            "success":          True,
-            "message":          f"Zaimportowano {created} rekordów",
-            "file_id":          file_record.id,
-            "filename":         file.filename,
-            "records_imported": created,
+            "success":  True,
+            "message":  "Plik przyjęty do importu",
+            "job_id":   job.id,
+            "status":   job.status,
+            "filename": file.filename,
+            "duplicate_of_file_id": existing.id if existing else None,
         }
 
     except HTTPException:
+        if file_path and Path(file_path).exists():
+            Path(file_path).unlink()
         raise
     except Exception as e:
         import traceback; traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
         if file_path and Path(file_path).exists():
             Path(file_path).unlink()
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 # ── REKORDY ──────────────────────────────────────────────────────────────────
 
 @router.get("/files/{file_id}/records")
 def get_records(
+    request: Request,
     file_id: int,
     firefighter: Optional[str] = None,
     only_unassigned: bool = False,
@@ -201,33 +256,50 @@ def get_records(
     limit: int = Query(100, ge=1, le=1000),
     sort_by: Optional[str] = None,
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    format: str = Query(FORMAT_ROWS, regex="^(rows|columnar)$"),
     db: Session = Depends(get_db),
+    degrees: DegreeLookup = Depends(get_degree_lookup),
 ):
-    records = HazardousRecordsService.get_records_by_file(
-        db, file_id,
-        skip=skip, limit=limit,
-        firefighter=firefighter,
-        only_unassigned=only_unassigned,
-        only_eligible=only_eligible,
-        date_from=date_from,
-        date_to=date_to,
-        sort_by=sort_by, sort_order=sort_order,
-    )
-    total = HazardousRecordsService.count_records_by_file(
-        db, file_id,
-        firefighter=firefighter,
-        only_unassigned=only_unassigned,
-        only_eligible=only_eligible,
-        date_from=date_from,
-        date_to=date_to,
-    )
-    return {
-        "records":     [r.to_dict() for r in records],
+    # cursor = next_cursor poprzedniej odpowiedzi (keyset), bez niego skip/limit.
+    # Strona i total jednym zapytaniem (total zapamiętywany per filtr),
+    # same kolumny listy jako wiersze → JSON bez to_dict() i jsonable_encoder,
+    # stopnie szkodliwości ze słownika żądania — bez zapytania na rekord.
+    # format=columnar — nagłówek kolumn + tablice kolumn, stopnie raz w "degrees"
+    columns = HazardousRecordsService.LISTING_COLUMNS
+    try:
+        records, total = HazardousRecordsService.list_records(
+            db, file_id,
+            skip=skip, limit=limit,
+            firefighter=firefighter,
+            only_unassigned=only_unassigned,
+            only_eligible=only_eligible,
+            date_from=date_from,
+            date_to=date_to,
+            sort_by=sort_by, sort_order=sort_order,
+            cursor=cursor,
+            columns=columns,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == FORMAT_COLUMNAR:
+        content = encode_columnar(records, columns, HazardousRecordsService.DICTIONARY_COLUMNS)
+        degree_ids = {record.hazardous_degree_id for record in records} - {None}
+        content["degrees"] = {degree_id: degrees.get(degree_id) for degree_id in degree_ids}
+    else:
+        rows = rows_to_dicts(records, columns)
+        for row in rows:
+            row["hazardous_degree"] = degrees.get(row["hazardous_degree_id"])
+        content = {"records": rows}
+    content.update({
         "total_count": total,
         "skip":        skip,
         "limit":       limit,
         "count":       len(records),
-    }
+        "next_cursor": next_cursor(records, limit, HazardousRecord, sort_by, sort_order),
+    })
+    return FastJSONResponse(content, accept_encoding=request.headers.get("accept-encoding"))
 
 
 @router.get("/files/{file_id}/statistics")
@@ -308,22 +380,22 @@ def export_to_excel(
 ):
     try:
         from services.hazardous_excel_service import HazardousExcelService
-        records = HazardousRecordsService.get_records_by_file(
-            db, file_id, skip=0, limit=100000,
+        records = _peek_records(HazardousRecordsService.iter_records_by_file(
+            db, file_id,
             firefighter=firefighter,
             only_unassigned=only_unassigned,
             only_eligible=only_eligible,
             date_from=date_from,
             date_to=date_to,
-        )
-        if not records:
+        ))
+        if records is None:
             raise HTTPException(status_code=404, detail="Brak danych do eksportu")
 
         filename = _build_filename(
             "dodatek_szkodliwy", firefighter, date_from, date_to,
             only_unassigned, only_eligible, ".xlsx"
         )
-        file_content = HazardousExcelService().export_to_excel([r.to_dict() for r in records])
+        file_content = HazardousExcelService().export_to_excel(records)
 
         return StreamingResponse(
             file_content,
@@ -352,22 +424,22 @@ def export_to_csv(
 ):
     try:
         from services.hazardous_excel_service import HazardousExcelService
-        records = HazardousRecordsService.get_records_by_file(
-            db, file_id, skip=0, limit=100000,
+        records = _peek_records(HazardousRecordsService.iter_records_by_file(
+            db, file_id,
             firefighter=firefighter,
             only_unassigned=only_unassigned,
             only_eligible=only_eligible,
             date_from=date_from,
             date_to=date_to,
-        )
-        if not records:
+        ))
+        if records is None:
             raise HTTPException(status_code=404, detail="Brak danych do eksportu")
 
         filename = _build_filename(
             "dodatek_szkodliwy", firefighter, date_from, date_to,
             only_unassigned, only_eligible, ".csv"
         )
-        file_content = HazardousExcelService().export_to_csv([r.to_dict() for r in records])
+        file_content = HazardousExcelService().export_to_csv(records)
 
         return StreamingResponse(
             file_content,
@@ -384,6 +456,39 @@ def export_to_csv(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _firefighter_document_data(ff, firefighter: str, records: List[dict], jednostka: Optional[str]):
+    """
+    Dane strażaka do zestawienia — (firefighter_data, jednostka).
+    Z tabeli firefighters (ff), a gdy brak — z pierwszego rekordu SWD.
+    jednostka: opcjonalny override z query param
+    """
+    firefighter_data = None
+    if ff is not None:
+        firefighter_data = {
+            'stopien':       ff.stopien       or '.....................',
+            'nazwisko_imie': ff.nazwisko_imie or firefighter,
+            'stanowisko':    ff.stanowisko    or '.....................',
+        }
+        # jednostka z tabeli firefighters jeśli nie podana w query
+        if not jednostka:
+            jednostka = getattr(ff, 'jednostka', None) or ''
+
+    # Fallback — dane z pierwszego rekordu SWD
+    if not firefighter_data and records:
+        r = records[0]
+        firefighter_data = {
+            'stopien':       r['stopien']       or '.....................',
+            'nazwisko_imie': r['nazwisko_imie'] or firefighter,
+            'stanowisko':    '.....................',
+        }
+
+    # jednostka — fallback z rekordu SWD
+    if not jednostka and records:
+        jednostka = records[0]['jednostka'] or '.....................'
+
+    return firefighter_data, jednostka
+
+
 @router.get("/files/{file_id}/generate-document")
 def generate_document(
     file_id: int,
@@ -398,8 +503,6 @@ def generate_document(
     db: Session = Depends(get_db),
 ):
     try:
-        from services.hazardous_document_service import HazardousDocumentService
-
         if not firefighter:
             raise HTTPException(status_code=400, detail="Musisz wybrać strażaka")
 
@@ -418,52 +521,27 @@ def generate_document(
             except Exception:
                 polrocze = '.....................'
 
-        records = HazardousRecordsService.get_records_by_file(
-            db, file_id, skip=0, limit=100000,
+        records_data = list(HazardousRecordsService.iter_records_by_file(
+            db, file_id,
             firefighter=firefighter,
             only_unassigned=only_unassigned,
             only_eligible=only_eligible,
             date_from=date_from,
             date_to=date_to,
-        )
-        if not records:
+        ))
+        if not records_data:
             raise HTTPException(status_code=404, detail="Brak danych do wygenerowania dokumentu")
 
-        records_data = [r.to_dict() for r in records]
-
         # Dane strażaka — pobierz z tabeli firefighters (stopien, stanowisko, jednostka)
-        firefighter_data = None
-        jednostka_val = jednostka  # opcjonalny override z query param
+        ff = None
         try:
             from services.firefighter_service import FirefighterService
             ffs = FirefighterService.search_firefighters(db, firefighter, skip=0, limit=1)
-            if ffs:
-                ff = ffs[0]
-                firefighter_data = {
-                    'stopien':       ff.stopien       or '.....................',
-                    'nazwisko_imie': ff.nazwisko_imie or firefighter,
-                    'stanowisko':    ff.stanowisko    or '.....................',
-                }
-                # jednostka z tabeli firefighters jeśli nie podana w query
-                if not jednostka_val:
-                    jednostka_val = getattr(ff, 'jednostka', None) or ''
+            ff = ffs[0] if ffs else None
         except Exception as e:
             print(f"[WARN] Nie znaleziono strażaka w firefighters: {e}")
 
-        # Fallback — dane z pierwszego rekordu SWD
-        if not firefighter_data and records:
-            r = records[0]
-            firefighter_data = {
-                'stopien':       r.stopien       or '.....................',
-                'nazwisko_imie': r.nazwisko_imie or firefighter,
-                'stanowisko':    '.....................',
-            }
-
-        # jednostka — fallback z rekordu SWD
-        if not jednostka_val and records:
-            jednostka_val = records[0].jednostka or '.....................'
-
-        doc_service = HazardousDocumentService()
+        firefighter_data, jednostka_val = _firefighter_document_data(ff, firefighter, records_data, jednostka)
 
         common_kwargs = dict(
             firefighter_name=firefighter,
@@ -480,7 +558,7 @@ def generate_document(
         firefighter_clean = firefighter.replace(" ", "_")
 
         if format == "html":
-            html_content = doc_service.generate_html(**common_kwargs)
+            html_content = document_service.generate_html(**common_kwargs)
             return StreamingResponse(
                 iter([html_content.encode('utf-8')]),
                 media_type="text/html",
@@ -488,7 +566,7 @@ def generate_document(
             )
 
         elif format == "docx":
-            file_content = doc_service.generate_docx(**common_kwargs)
+            file_content = document_service.generate_docx(**common_kwargs)
             from datetime import datetime
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"zestawienie_{firefighter_clean}_{timestamp}.docx"
@@ -505,4 +583,119 @@ def generate_document(
         raise
     except Exception as e:
         import traceback; traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ── Zestawienia zbiorcze (półrocze, wszyscy strażacy) ────────────────────────
+
+# "I półrocze 2025", "II 2025", "2025-1", "2025-H2"
+_POLROCZE_ROMAN = re.compile(r"^(I{1,2})\s*(?:półrocze)?\s*(\d{4})$", re.IGNORECASE)
+_POLROCZE_NUMBER = re.compile(r"^(\d{4})\s*[-/ ]\s*H?([12])$", re.IGNORECASE)
+
+
+def _polrocze_range(polrocze: str):
+    """Półrocze → (date_from, date_to, etykieta do dokumentu) albo None"""
+    text = (polrocze or "").strip()
+    match = _POLROCZE_ROMAN.match(text)
+    if match:
+        half, year = len(match.group(1)), int(match.group(2))
+    else:
+        match = _POLROCZE_NUMBER.match(text)
+        if not match:
+            return None
+        year, half = int(match.group(1)), int(match.group(2))
+
+    if half == 1:
+        return f"{year}-01-01", f"{year}-06-30", f"I półrocze {year}"
+    return f"{year}-07-01", f"{year}-12-31", f"II półrocze {year}"
+
+
+@router.get("/files/{file_id}/generate-documents")
+def generate_documents_batch(
+    file_id: int,
+    polrocze:      str,
+    format:        str = Query("docx", regex="^(html|docx)$"),
+    firefighters:  Optional[List[str]] = Query(None),
+    only_eligible: bool = True,
+    jednostka:     Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Zestawienia dodatku szkodliwego za półrocze dla wszystkich strażaków z pliku
+    (albo wybranych: ?firefighters=...&firefighters=...) — ZIP z manifest.csv
+    """
+    try:
+        period = _polrocze_range(polrocze)
+        if period is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Nieprawidłowe półrocze. Przykłady: 'I półrocze 2025', 'II 2025', '2025-1'"
+            )
+        date_from, date_to, polrocze_label = period
+
+        # Rekordy wszystkich strażaków jednym zapytaniem (ze stopniem szkodliwości)
+        groups = list(HazardousRecordsService.iter_records_by_firefighter(
+            db, file_id,
+            firefighters=firefighters,
+            only_eligible=only_eligible,
+            date_from=date_from,
+            date_to=date_to,
+        ))
+        if not groups:
+            raise HTTPException(status_code=404, detail="Brak danych do wygenerowania dokumentu")
+
+        # Tabela firefighters — jedno zapytanie dla wszystkich
+        known = FirefighterService.get_by_names(db, [name for name, _ in groups])
+
+        jobs = []
+        manifest = []
+        used_filenames = set()
+        for name, records in groups:
+            firefighter_data, jednostka_val = _firefighter_document_data(
+                known.get(name), name, records, jednostka
+            )
+            filename = BatchDocumentService.document_filename("zestawienie", name, format, used_filenames)
+            with_degree = sum(1 for r in records if r['hazardous_degree_id'])
+            manifest.append({
+                'plik':          filename if with_degree else '',
+                'nazwisko_imie': name,
+                'stopien':       firefighter_data['stopien'],
+                'stanowisko':    firefighter_data['stanowisko'],
+                'jednostka':     jednostka_val,
+                'rekordow':      with_degree,
+                'status':        'pominięto — brak rekordów ze stopniem szkodliwości',
+            })
+            if not with_degree:
+                continue
+            jobs.append((filename, dict(
+                firefighter_name=name,
+                records=records,
+                firefighter_data=firefighter_data,
+                polrocze=polrocze_label,
+                jednostka=jednostka_val,
+                filters={'only_eligible': only_eligible, 'only_unassigned': False},
+            )))
+
+        if not jobs:
+            raise HTTPException(
+                status_code=404,
+                detail="Brak rekordów z przypisanym stopniem szkodliwości w wybranym półroczu"
+            )
+
+        print(f"[INFO] Generuję {len(jobs)} zestawień ({format}, {polrocze_label})")
+        documents = BatchDocumentService.render_all("dodatek_szkodliwy", format, jobs)
+
+        filename = f"zestawienia_{polrocze_label.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        return StreamingResponse(
+            BatchDocumentService.stream_zip(documents, manifest),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": _encode_filename(filename),
+                "Access-Control-Expose-Headers": "Content-Disposition",
+            },
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback; traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,24 @@
+"""
+Router zadań importu w tle.
+Endpointy:
+  GET /jobs/{id} - stan zadania: rows_parsed, rows_inserted, rows_per_second, eta_seconds
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from database import get_db
+from services.import_job_service import ImportJobService
+
+router = APIRouter()
+
+
+@router.get("/{job_id}")
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Pobierz stan zadania importu"""
+    job = ImportJobService.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Zadanie nie znalezione")
+    return job
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from typing import Optional, Dict, Union
 from pathlib import Path
 import json
 import sys
@@ -10,6 +11,9 @@ router = APIRouter()
 class DatabaseSettings(BaseModel):
     type: str  # "local" or "network"
     path: str
+    profile: Optional[str] = None  # profil PRAGMA SQLite (domyślnie = type)
+    pragmas: Optional[Dict[str, Union[int, str]]] = None  # nadpisania PRAGMA
+    replica: Optional[bool] = None  # lokalna replika bazy sieciowej
 
 class AppSettings(BaseModel):
     database: DatabaseSettings
@@ -83,7 +87,19 @@ async def update_settings(settings: AppSettings):
                 )
         
         # Zapisz ustawienia
-        settings_dict = settings.dict()
+        settings_dict = settings.dict(exclude_none=True)
+
+        # Zachowaj ustawienia PRAGMA i repliki - formularz ich nie wysyła
+        if settings_path.exists():
+            try:
+                with open(settings_path, 'r', encoding='utf-8') as f:
+                    previous_db = json.load(f).get('database', {})
+                for key in ('profile', 'pragmas', 'replica'):
+                    if key in previous_db and key not in settings_dict['database']:
+                        settings_dict['database'][key] = previous_db[key]
+            except Exception as e:
+                print(f"[SETTINGS] Nie udało się odczytać poprzednich ustawień: {e}")
+
         with open(settings_path, 'w', encoding='utf-8') as f:
             json.dump(settings_dict, f, indent=2, ensure_ascii=False)
         
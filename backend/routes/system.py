@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from config import settings
+from database import replica
 import sys
 
 router = APIRouter()
@@ -28,5 +29,6 @@ async def get_app_info():
         "version": settings.VERSION,
         "company": settings.COMPANY,
         "is_desktop": getattr(sys, "frozen", False),
-        "python_version": sys.version.split()[0]
+        "python_version": sys.version.split()[0],
+        "database_replica": replica.get_metrics() if replica else {"enabled": False},
     }
\ No newline at end of file
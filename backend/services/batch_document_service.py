@@ -0,0 +1,255 @@
+"""
+backend/services/batch_document_service.py
+
+Renderowanie dokumentów w puli procesów: dokumenty zbiorcze (jeden
+dokument na strażaka dla całego pliku) i pojedyncze PDF (render_one).
+
+Renderowanie (xhtml2pdf / docxtpl) to czysty Python zajmujący CPU, więc
+wątki nie przyspieszają go przez GIL. Dokumenty renderuje pula procesów
+(settings.DOCUMENT_WORKERS); każdy proces ma własne serwisy dokumentów
+(wspólne środowisko Jinja i cache szablonów DOCX w procesie).
+Pula powstaje dopiero przy DOCUMENT_WORKERS > 1; przy 1 (maszyny 1–2
+rdzeniowe) dokumenty renderowane są w procesie aplikacji — jeden proces
+roboczy nie da równoległości, a kosztuje start procesu i przesyłanie danych.
+
+Wynik:
+  - stream_zip() — ZIP oddawany kawałkami, dokument po dokumencie
+    (klient dostaje pierwsze bajty po wyrenderowaniu pierwszego pliku),
+    opcjonalnie z manifestem (manifest.csv — dokument, strażak, status),
+  - merge_pdf() — jeden PDF ze wszystkich dokumentów (pypdf).
+Błąd jednego dokumentu nie przerywa całości — lista błędów trafia do
+ZIP jako BLEDY.txt.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO, RawIOBase, StringIO
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import csv
+import importlib
+import re
+import sys
+import threading
+import zipfile
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import settings
+
+# Rodzaj dokumentu → serwis (import w procesie roboczym, przy pierwszym użyciu)
+DOCUMENT_SERVICES = {
+    "karta_wyjazdow": ("services.document_generator_service", "DocumentGeneratorService"),
+    "dodatek_szkodliwy": ("services.hazardous_document_service", "HazardousDocumentService"),
+}
+
+ERRORS_FILENAME = "BLEDY.txt"
+MANIFEST_FILENAME = "manifest.csv"
+
+# Znaki spoza liter (także polskich), cyfr i "-" w nazwie dokumentu → "_"
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w-]+")
+
+# Serwisy utworzone w tym procesie (roboczym albo aplikacji)
+_services: Dict[str, Any] = {}
+
+
+def render_document(kind: str, format: str, kwargs: Dict[str, Any]) -> bytes:
+    """Wyrenderuj jeden dokument (wywoływane w procesie roboczym puli)"""
+    service = _services.get(kind)
+    if service is None:
+        module_name, class_name = DOCUMENT_SERVICES[kind]
+        service_class = getattr(importlib.import_module(module_name), class_name)
+        service = _services[kind] = service_class()
+    document = getattr(service, f"generate_{format}")(**kwargs)
+    # generate_html zwraca tekst, pozostałe formaty BytesIO
+    return document.encode("utf-8") if isinstance(document, str) else document.getvalue()
+
+
+def _manifest_csv(rows: List[Dict[str, Any]]) -> bytes:
+    """Manifest ZIP — CSV jak eksporty (średnik, BOM dla Excela)"""
+    buffer = StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(rows[0].keys())
+    writer.writerows(row.values() for row in rows)
+    return ("\ufeff" + buffer.getvalue()).encode("utf-8")
+
+
+class _ChunkSink(RawIOBase):
+    """Strumień bez seek dla zipfile — zapisane bajty odbierane przez take()"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class BatchDocumentService:
+    """Renderowanie wielu dokumentów w puli procesów"""
+
+    CHUNK_SIZE      = 64 * 1024         # 64 KB na kawałek odpowiedzi
+    SPOOL_MAX_SIZE  = 32 * 1024 * 1024  # scalony PDF powyżej 32 MB trafia na dysk
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _get_executor() -> Optional[ProcessPoolExecutor]:
+        if settings.DOCUMENT_WORKERS <= 1:
+            return None
+        with BatchDocumentService._lock:
+            if BatchDocumentService._executor is None:
+                BatchDocumentService._executor = ProcessPoolExecutor(
+                    max_workers=settings.DOCUMENT_WORKERS,
+                )
+            return BatchDocumentService._executor
+
+    @staticmethod
+    def _reset_executor():
+        """Po awarii procesu roboczego — następne żądanie dostanie nową pulę"""
+        with BatchDocumentService._lock:
+            if BatchDocumentService._executor is not None:
+                BatchDocumentService._executor.shutdown(wait=False, cancel_futures=True)
+                BatchDocumentService._executor = None
+
+    @staticmethod
+    def document_filename(prefix: str, name: str, format: str, used: Set[str]) -> str:
+        """
+        Nazwa dokumentu w ZIP — spacje i znaki niedozwolone w ścieżce → "_";
+        nazwa już użyta (used, bez rozróżniania wielkości liter jak w Windows)
+        dostaje sufiks _2, _3… — manifest mapuje statusy po nazwie pliku
+        """
+        safe_name = UNSAFE_FILENAME_CHARS.sub("_", name).strip("_") or "bez_nazwy"
+        stem = f"{prefix}_{safe_name}"
+        filename = f"{stem}.{format}"
+        counter = 2
+        while filename.lower() in used:
+            filename = f"{stem}_{counter}.{format}"
+            counter += 1
+        used.add(filename.lower())
+        return filename
+
+    @staticmethod
+    def render_one(kind: str, format: str, kwargs: Dict[str, Any]) -> bytes:
+        """
+        Jeden dokument — w procesie aplikacji, a przy DOCUMENT_WORKERS > 1
+        w puli procesów (żądanie czeka na wynik, ale render nie trzyma GIL
+        procesu aplikacji — pozostałe żądania obsługiwane dalej)
+        """
+        executor = BatchDocumentService._get_executor()
+        if executor is None:
+            return render_document(kind, format, kwargs)
+        try:
+            return executor.submit(render_document, kind, format, kwargs).result()
+        except BrokenProcessPool:
+            BatchDocumentService._reset_executor()
+            raise
+
+    @staticmethod
+    def render_all(
+        kind: str,
+        format: str,
+        jobs: List[Tuple[str, Dict[str, Any]]],
+    ) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+        """
+        Wyrenderuj dokumenty równolegle; zwraca (nazwa pliku, dokument, błąd)
+        w kolejności jobs, gdy tylko kolejny dokument jest gotowy.
+        jobs: (nazwa pliku, argumenty generate_<format> serwisu)
+        """
+        executor = BatchDocumentService._get_executor()
+        if executor is None:
+            for filename, kwargs in jobs:
+                try:
+                    yield filename, render_document(kind, format, kwargs), None
+                except Exception as e:
+                    print(f"[BATCH] Błąd dokumentu {filename}: {e}")
+                    yield filename, None, str(e)
+            return
+
+        futures: List[Tuple[str, Future]] = [
+            (filename, executor.submit(render_document, kind, format, kwargs))
+            for filename, kwargs in jobs
+        ]
+        try:
+            for filename, future in futures:
+                try:
+                    yield filename, future.result(), None
+                except BrokenProcessPool:
+                    BatchDocumentService._reset_executor()
+                    raise
+                except Exception as e:
+                    print(f"[BATCH] Błąd dokumentu {filename}: {e}")
+                    yield filename, None, str(e)
+        finally:
+            # Przerwane pobieranie — nie renderuj pozostałych
+            for _, future in futures:
+                future.cancel()
+
+    @staticmethod
+    def stream_zip(
+        documents: Iterable[Tuple[str, Optional[bytes], Optional[str]]],
+        manifest: List[Dict[str, Any]] = None,
+    ) -> Iterator[bytes]:
+        """
+        ZIP z dokumentów, oddawany kawałkami w miarę renderowania.
+        manifest: wiersze manifest.csv z kluczami "plik" i "status" — status
+                  dokumentów z documents uzupełniany po renderowaniu
+        """
+        sink = _ChunkSink()
+        errors = []
+        statuses = {}
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for filename, data, error in documents:
+                if data is None:
+                    errors.append(f"{filename}: {error}")
+                    statuses[filename] = f"błąd: {error}"
+                    continue
+                archive.writestr(filename, data)
+                statuses[filename] = "OK"
+                yield sink.take()
+            if errors:
+                archive.writestr(ERRORS_FILENAME, "\n".join(errors) + "\n")
+            if manifest:
+                for row in manifest:
+                    row["status"] = statuses.get(row["plik"], row["status"])
+                archive.writestr(MANIFEST_FILENAME, _manifest_csv(manifest))
+        yield sink.take()
+
+    @staticmethod
+    def merge_pdf(documents: Iterable[Tuple[str, Optional[bytes], Optional[str]]]) -> Tuple[SpooledTemporaryFile, List[str]]:
+        """Jeden PDF ze wszystkich dokumentów — (plik ustawiony na początek, błędy)"""
+        from pypdf import PdfWriter
+
+        writer = PdfWriter()
+        errors = []
+        for filename, data, error in documents:
+            if data is None:
+                errors.append(f"{filename}: {error}")
+                continue
+            writer.append(BytesIO(data))
+
+        output = SpooledTemporaryFile(max_size=BatchDocumentService.SPOOL_MAX_SIZE)
+        if writer.pages:
+            writer.write(output)
+        output.seek(0)
+        return output, errors
+
+    @staticmethod
+    def iter_file(output, chunk_size: int = None) -> Iterator[bytes]:
+        """Plik kawałkami do StreamingResponse (zamykany po przeczytaniu)"""
+        try:
+            while True:
+                chunk = output.read(chunk_size or BatchDocumentService.CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            output.close()
@@ -0,0 +1,104 @@
+"""
+backend/services/bulk_insert_service.py
+
+Masowy zapis rekordów z importu Excel.
+Zamiast tworzyć obiekt ORM dla każdego wiersza (db.add w pętli),
+wiersze mapowane są na zwykłe krotki i zapisywane paczkami przez
+executemany — z pominięciem identity map sesji SQLAlchemy.
+"""
+from sqlalchemy.orm import Session
+from typing import Iterable, Sequence, Dict, Any, List, Callable
+from contextlib import contextmanager
+import time
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import settings
+
+
+class BulkInsertService:
+    """
+    Silnik masowego importu dla jednej tabeli.
+
+    Użycie:
+        inserter = BulkInsertService(SWDRecord.__table__, ["file_id", "nazwisko_imie", ...])
+        stats = inserter.insert(db, rows)   # rows — iterowalne krotki w kolejności columns
+        db.commit()
+    """
+
+    def __init__(self, table, columns: Sequence[str], chunk_size: int = None):
+        self.table = table
+        self.columns = list(columns)
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+
+        # Jedno zapytanie INSERT przygotowane raz — sqlite3 używa paramstyle "qmark"
+        placeholders = ", ".join("?" for _ in self.columns)
+        self.sql = (
+            f"INSERT INTO {self.table.name} ({', '.join(self.columns)}) "
+            f"VALUES ({placeholders})"
+        )
+
+    def insert(self, db: Session, rows: Iterable[tuple],
+               on_progress: Callable[[int], None] = None) -> Dict[str, Any]:
+        """
+        Zapisz wiersze paczkami po chunk_size w bieżącej transakcji sesji.
+        Nie wykonuje commit — decyduje o tym wywołujący serwis.
+        on_progress(created_count) wywoływane po każdej zapisanej paczce.
+
+        Returns: {"created_count", "elapsed_seconds", "rows_per_second"}
+        """
+        conn = db.connection()
+        start = time.perf_counter()
+        created_count = 0
+        chunk = []
+
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                conn.exec_driver_sql(self.sql, chunk)
+                created_count += len(chunk)
+                chunk = []
+                if on_progress:
+                    on_progress(created_count)
+
+        if chunk:
+            conn.exec_driver_sql(self.sql, chunk)
+            created_count += len(chunk)
+            if on_progress:
+                on_progress(created_count)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "created_count":   created_count,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(created_count / elapsed) if elapsed > 0 else created_count,
+        }
+
+    @contextmanager
+    def deferred_indexes(self, db: Session, index_names: List[str]):
+        """
+        Odłóż utrzymanie indeksów do końca importu:
+        usuwa wskazane indeksy tabeli, a po zakończeniu bloku odtwarza je
+        z oryginalnej definicji (sqlite_master). Nieistniejące indeksy są pomijane.
+        DROP INDEX zatwierdza się od razu — indeksy utracone przez awarię
+        procesu odtwarza init_db przy starcie (_restore_deferred_indexes).
+        """
+        conn = db.connection()
+        placeholders = ", ".join("?" for _ in index_names)
+        indexes = conn.exec_driver_sql(
+            f"SELECT name, sql FROM sqlite_master "
+            f"WHERE type = 'index' AND tbl_name = ? AND name IN ({placeholders})",
+            (self.table.name, *index_names),
+        ).fetchall()
+
+        for name, _ in indexes:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        print(f"[BULK INSERT] Odłożono indeksy: {[name for name, _ in indexes]}")
+
+        try:
+            yield
+        finally:
+            for name, sql in indexes:
+                conn.exec_driver_sql(sql)
+            print(f"[BULK INSERT] Odtworzono indeksy: {[name for name, _ in indexes]}")
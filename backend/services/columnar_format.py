@@ -0,0 +1,55 @@
+"""
+backend/services/columnar_format.py
+
+Kolumnowy format listy rekordów (format=columnar w endpointach list).
+
+Zamiast tablicy słowników, w której każdy wiersz powtarza wszystkie nazwy
+kolumn, odpowiedź zawiera nagłówek z nazwami kolumn i po jednej tablicy
+wartości na kolumnę:
+
+    {
+      "format": "columnar",
+      "columns": ["id", "nazwisko_imie", "stopien", ...],
+      "data": [[1, 2, ...], ["KOWALSKI Jan", ...], [0, 0, 1, ...], ...],
+      "dictionaries": {"stopien": ["st. kpt.", "mł. bryg."], ...}
+    }
+
+Kolumny o małej liczbie różnych wartości (stopień, funkcja, p/mz/af, ...)
+są kodowane słownikiem: w "data" indeks w "dictionaries"[kolumna],
+null bez zmian. Frontend odtwarza wiersze w services/api.js (decodeColumnar).
+"""
+from typing import Any, Dict, Iterable, List, Sequence
+
+FORMAT_ROWS = "rows"
+FORMAT_COLUMNAR = "columnar"
+
+
+def encode_columnar(
+    rows: Iterable[Sequence[Any]],
+    columns: List[str],
+    dictionary_columns: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    Wiersze kolumn (fetch_page(columns=...)) → nagłówek + tablice kolumn.
+    Nadmiarowe kolumny wiersza (kolumna sortowania, total_count) są pomijane.
+    """
+    rows = list(rows)
+    if rows:
+        data = [list(values) for values in zip(*rows)][:len(columns)]
+    else:
+        data = [[] for _ in columns]
+
+    dictionaries = {}
+    for i, name in enumerate(columns):
+        if name not in dictionary_columns:
+            continue
+        index: Dict[Any, int] = {}
+        data[i] = [None if value is None else index.setdefault(value, len(index)) for value in data[i]]
+        dictionaries[name] = list(index)
+
+    return {
+        "format": FORMAT_COLUMNAR,
+        "columns": columns,
+        "data": data,
+        "dictionaries": dictionaries,
+    }
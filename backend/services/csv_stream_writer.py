@@ -0,0 +1,55 @@
+"""
+backend/services/csv_stream_writer.py
+
+Strumieniowy zapis eksportów CSV.
+Wiersze z generatora (np. DataService.iter_records_by_file) przechodzą przez
+csv.writer do małego bufora, który co ROWS_PER_CHUNK wierszy jest kodowany
+i oddawany do StreamingResponse — pamięć nie rośnie z liczbą rekordów,
+a pierwszy kawałek (BOM + nagłówek) wychodzi od razu.
+"""
+from io import StringIO
+from typing import Iterable, Iterator, List, Any
+import csv
+
+
+class CsvStreamWriter:
+    """
+    Użycie:
+        writer = CsvStreamWriter(HEADERS, delimiter=";")
+        return StreamingResponse(writer.stream(rows), media_type="text/csv")
+    """
+
+    ROWS_PER_CHUNK = 500
+    ENCODING       = "utf-8"
+    BOM            = "\ufeff"   # utf-8-sig — polskie znaki poprawnie w Excel
+
+    def __init__(self, headers: List[str], delimiter: str = ","):
+        self.headers = headers
+        self.delimiter = delimiter
+
+    def stream(self, rows: Iterable[Iterable[Any]]) -> Iterator[bytes]:
+        """Generator zakodowanych kawałków pliku CSV (BOM na początku)"""
+        buffer = StringIO()
+        writer = csv.writer(buffer, delimiter=self.delimiter)
+
+        buffer.write(self.BOM)
+        writer.writerow(self.headers)
+        yield self._drain(buffer)
+
+        pending = 0
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending >= self.ROWS_PER_CHUNK:
+                yield self._drain(buffer)
+                pending = 0
+
+        if pending:
+            yield self._drain(buffer)
+
+    def _drain(self, buffer: StringIO) -> bytes:
+        """Zakoduj zawartość bufora i wyczyść go"""
+        chunk = buffer.getvalue().encode(self.ENCODING)
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
@@ -1,10 +1,18 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional, Union
+from sqlalchemy import and_, insert, literal, or_, select
+from typing import List, Optional, Union, Iterator, Dict, Any, Tuple
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
+from config import settings
 from models.swd_data import SWDRecord, ImportedFile
+from models.timestamps import parse_timestamp, day_range
+from services.keyset_pagination import apply_cursor, apply_order
+from services.record_listing import RecordCountCache, fetch_page, count_query
 
 # Import dla type hinting
 try:
@@ -35,13 +43,17 @@ class DataService:
     
     @staticmethod
     def create_file_record(db: Session, filename: str, original_filename: str, 
-                          file_path: str, rows_count: int) -> ImportedFile:
+                          file_path: str, rows_count: int,
+                          status: str = "completed",
+                          content_hash: str = None) -> ImportedFile:
         """Utwórz rekord zaimportowanego pliku — oznaczony jako 'departures'"""
         file_record = ImportedFile(
             filename=filename,
             original_filename=original_filename,
             file_path=file_path,
             rows_count=rows_count,
+            status=status,
+            content_hash=content_hash,
             file_type="departures",
         )
         db.add(file_record)
@@ -49,6 +61,20 @@ class DataService:
         db.refresh(file_record)
         return file_record
     
+    @staticmethod
+    def find_file_by_hash(db: Session, content_hash: str) -> Optional[ImportedFile]:
+        """Znajdź poprawnie zaimportowany plik Wyjazdów o tej samej treści (SHA-256)"""
+        return (
+            db.query(ImportedFile)
+            .filter(
+                ImportedFile.content_hash == content_hash,
+                ImportedFile.file_type == "departures",
+                ImportedFile.status == "completed",
+            )
+            .order_by(ImportedFile.imported_at.desc())
+            .first()
+        )
+    
     @staticmethod
     def delete_file(db: Session, file_id: int) -> bool:
         """Usuń plik i wszystkie powiązane rekordy"""
@@ -64,18 +90,23 @@ class DataService:
     @staticmethod
     def get_records_by_file(db: Session, file_id: int, 
                            skip: int = 0, limit: int = 100,
-                           sort_by: str = None, sort_order: str = 'asc') -> List[SWDRecord]:
-        """Pobierz rekordy dla danego pliku z paginacją i sortowaniem"""
+                           sort_by: str = None, sort_order: str = 'asc',
+                           cursor: str = None) -> List[SWDRecord]:
+        """
+        Pobierz rekordy dla danego pliku z paginacją i sortowaniem.
+        Z kursorem (next_cursor poprzedniej strony) — stronicowanie keyset, skip pomijany.
+        """
         query = db.query(SWDRecord).filter(SWDRecord.file_id == file_id)
-        
-        if sort_by:
-            column = getattr(SWDRecord, sort_by, None)
-            if column is not None:
-                if sort_order == 'desc':
-                    query = query.order_by(column.desc())
-                else:
-                    query = query.order_by(column.asc())
-        
+        return DataService._page(query, skip, limit, sort_by, sort_order, cursor)
+
+    @staticmethod
+    def _page(query, skip: int, limit: int, sort_by: str, sort_order: str,
+              cursor: str = None) -> List[SWDRecord]:
+        """Sortowanie (kolumna + id) i strona: kursor (keyset) albo OFFSET"""
+        if cursor:
+            query = apply_cursor(query, SWDRecord, cursor, sort_by, sort_order)
+            skip = 0
+        query = apply_order(query, SWDRecord, sort_by, sort_order)
         return query.offset(skip).limit(limit).all()
     
     @staticmethod
@@ -169,7 +200,90 @@ class DataService:
             print(f"[DATA SERVICE] Błąd tworzenia rekordów: {e}")
             db.rollback()
             raise
-    
+
+    # Kolejność kolumn dla masowego importu (bulk_create_records)
+    BULK_COLUMNS = [
+        "file_id", "nazwisko_imie", "stopien", "p", "mz", "af",
+        "zaliczono_do_emerytury", "nr_meldunku", "czas_rozp_zdarzenia", "funkcja",
+        "czas_rozp_zdarzenia_ts",
+        "created_at", "updated_at",
+    ]
+
+    @staticmethod
+    def bulk_create_records(db: Session, file_id: int, records_data,
+                            chunk_size: int = None, on_progress=None) -> dict:
+        """
+        Masowy import rekordów z CollectionZestawienieWiersz.
+        Wiersze mapowane na krotki i zapisywane paczkami przez executemany
+        (bez obiektów ORM). Zwraca statystyki importu z rows_per_second.
+        """
+        from services.bulk_insert_service import BulkInsertService
+
+        # created_at/updated_at mają domyślne wartości po stronie Pythona — przy INSERT
+        # z pominięciem ORM trzeba je podać jawnie (format jak SQLAlchemy DateTime w SQLite)
+        now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")
+
+        def to_row(r):
+            return (
+                file_id,
+                str(r.nazwisko_imie) if r.nazwisko_imie else None,
+                str(r.stopien) if r.stopien else None,
+                str(r.p) if r.p else None,
+                str(r.mz) if r.mz else None,
+                str(r.af) if r.af else None,
+                str(r.zaliczono_do_emerytury) if r.zaliczono_do_emerytury else None,
+                str(r.nr_meldunku) if r.nr_meldunku else None,
+                str(r.czas_rozp_zdarzenia) if r.czas_rozp_zdarzenia else None,
+                str(r.funkcja) if r.funkcja else None,
+                parse_timestamp(r.czas_rozp_zdarzenia),
+                now,
+                now,
+            )
+
+        inserter = BulkInsertService(SWDRecord.__table__, DataService.BULK_COLUMNS, chunk_size)
+
+        try:
+            print(f"[DATA SERVICE] Masowy import {len(records_data.items)} rekordów (paczki po {inserter.chunk_size})")
+            stats = inserter.insert(db, (to_row(r) for r in records_data.items), on_progress)
+            db.commit()
+            RecordCountCache.invalidate(file_id)
+            print(f"[DATA SERVICE] Utworzono {stats['created_count']} rekordów "
+                  f"({stats['rows_per_second']} wierszy/s)")
+            return stats
+        except Exception as e:
+            print(f"[DATA SERVICE] Błąd masowego importu: {e}")
+            db.rollback()
+            raise
+
+    @staticmethod
+    def clone_file_records(db: Session, source_file_id: int, target_file_id: int) -> int:
+        """
+        Skopiuj rekordy jednego pliku do drugiego jednym INSERT ... SELECT
+        (import natychmiastowy ponownie wgranego pliku — bez parsowania Excela).
+        Kopiowany jest aktualny stan rekordów, łącznie z ręcznymi poprawkami.
+        """
+        now = datetime.utcnow()
+        columns = DataService.BULK_COLUMNS[1:-2]   # bez file_id i znaczników czasu
+        source = select(
+            literal(target_file_id),
+            *[getattr(SWDRecord, c) for c in columns],
+            literal(now, SWDRecord.created_at.type),
+            literal(now, SWDRecord.updated_at.type),
+        ).where(SWDRecord.file_id == source_file_id)
+
+        try:
+            result = db.execute(
+                insert(SWDRecord.__table__).from_select(DataService.BULK_COLUMNS, source)
+            )
+            db.commit()
+            RecordCountCache.invalidate(target_file_id)
+            print(f"[DATA SERVICE] Skopiowano {result.rowcount} rekordów z pliku {source_file_id} do {target_file_id}")
+            return result.rowcount
+        except Exception as e:
+            print(f"[DATA SERVICE] Błąd kopiowania rekordów: {e}")
+            db.rollback()
+            raise
+
     @staticmethod
     def update_record(db: Session, record_id: int, update_data: dict) -> Optional[SWDRecord]:
         """Aktualizuj rekord"""
@@ -254,30 +368,146 @@ class DataService:
         skip: int = 0, 
         limit: int = 100,
         sort_by: str = None, 
-        sort_order: str = 'asc'
+        sort_order: str = 'asc',
+        cursor: str = None
     ) -> List[SWDRecord]:
         """Pobierz rekordy dla danego pliku z filtrowaniem po dacie i strażaku"""
-        query = db.query(SWDRecord).filter(SWDRecord.file_id == file_id)
+        query = DataService._filtered_query(db, file_id, date_from, date_to, firefighter)
+        return DataService._page(query, skip, limit, sort_by, sort_order, cursor)
+
+    @staticmethod
+    def _filtered_query(db: Session, file_id: int, date_from: str = None,
+                        date_to: str = None, firefighter: str = None, entities=None):
+        """Zapytanie z filtrami listy (plik, strażak, zakres dat) — wspólne dla strony, licznika i eksportu"""
+        query = db.query(*(entities or [SWDRecord])).filter(SWDRecord.file_id == file_id)
         
         if firefighter:
             query = query.filter(SWDRecord.nazwisko_imie == firefighter)
         
+        # Zakres dat po kolumnie liczbowej (indeks file_id + czas_rozp_zdarzenia_ts)
+        ts_from, ts_to = day_range(date_from, date_to)
+        
+        # Rekordy z datą, której nie dało się odczytać (czas_rozp_zdarzenia_ts NULL),
+        # filtrowane po staremu — porównaniem tekstu
         if date_from:
-            query = query.filter(SWDRecord.czas_rozp_zdarzenia >= date_from)
+            text_from = SWDRecord.czas_rozp_zdarzenia >= date_from
+            if ts_from is not None:
+                query = query.filter(or_(
+                    SWDRecord.czas_rozp_zdarzenia_ts >= ts_from,
+                    and_(SWDRecord.czas_rozp_zdarzenia_ts.is_(None), text_from),
+                ))
+            else:
+                query = query.filter(text_from)
         
         if date_to:
-            date_to_end = f"{date_to} 23:59:59"
-            query = query.filter(SWDRecord.czas_rozp_zdarzenia <= date_to_end)
+            text_to = SWDRecord.czas_rozp_zdarzenia <= f"{date_to} 23:59:59"
+            if ts_to is not None:
+                query = query.filter(or_(
+                    SWDRecord.czas_rozp_zdarzenia_ts < ts_to,
+                    and_(SWDRecord.czas_rozp_zdarzenia_ts.is_(None), text_to),
+                ))
+            else:
+                query = query.filter(text_to)
+        
+        return query
+
+    @staticmethod
+    def list_records(
+        db: Session,
+        file_id: int,
+        date_from: str = None,
+        date_to: str = None,
+        firefighter: str = None,
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: str = None,
+        sort_order: str = 'asc',
+        cursor: str = None,
+        columns: List[str] = None
+    ) -> Tuple[List[SWDRecord], int]:
+        """
+        Strona listy rekordów i total_count jednym zapytaniem.
+        Total zapamiętywany per (plik, filtry) do zmiany rekordów pliku.
+        columns (np. LISTING_COLUMNS) — strona jako wiersze tych kolumn zamiast obiektów.
+        """
+        query = DataService._filtered_query(db, file_id, date_from, date_to, firefighter)
+        filters = (date_from, date_to, firefighter)
+        return fetch_page(
+            query, SWDRecord, file_id, filters, skip, limit, sort_by, sort_order, cursor,
+            columns=columns,
+        )
+
+    # Kolumny listy rekordów w API — klucze SWDRecord.to_dict()
+    LISTING_COLUMNS = [
+        "id", "file_id", "nazwisko_imie", "stopien", "p", "mz", "af",
+        "zaliczono_do_emerytury", "nr_meldunku", "czas_rozp_zdarzenia", "funkcja",
+        "created_at", "updated_at",
+    ]
+
+    # Kolumny listy o małej liczbie różnych wartości — kodowane słownikiem
+    # w formacie kolumnowym (services/columnar_format.py)
+    DICTIONARY_COLUMNS = [
+        "nazwisko_imie", "stopien", "p", "mz", "af", "zaliczono_do_emerytury", "funkcja",
+    ]
+
+    # Kolumny pobierane przy eksporcie (bez created_at/updated_at)
+    EXPORT_COLUMNS = [
+        "id", "file_id", "nazwisko_imie", "stopien", "p", "mz", "af",
+        "zaliczono_do_emerytury", "nr_meldunku", "czas_rozp_zdarzenia", "funkcja",
+    ]
+
+    @staticmethod
+    def iter_records_by_file(
+        db: Session,
+        file_id: int,
+        date_from: str = None,
+        date_to: str = None,
+        firefighter: str = None,
+        sort_by: str = None,
+        sort_order: str = 'asc',
+        batch_size: int = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generator rekordów pliku jako słowniki — eksport i dokumenty.
+        Pobiera tylko kolumny (bez obiektów ORM i to_dict) paczkami po
+        EXPORT_BATCH_SIZE wierszy, bez limitu liczby rekordów.
+        """
+        columns = [getattr(SWDRecord, name) for name in DataService.EXPORT_COLUMNS]
+        query = DataService._filtered_query(db, file_id, date_from, date_to, firefighter, columns)
         
         if sort_by:
             column = getattr(SWDRecord, sort_by, None)
             if column is not None:
-                if sort_order == 'desc':
-                    query = query.order_by(column.desc())
-                else:
-                    query = query.order_by(column.asc())
+                query = query.order_by(column.desc() if sort_order == 'desc' else column.asc())
         
-        return query.offset(skip).limit(limit).all()
+        for row in query.yield_per(batch_size or settings.EXPORT_BATCH_SIZE):
+            yield row._asdict()
+
+    @staticmethod
+    def iter_records_by_firefighter(
+        db: Session,
+        file_id: int,
+        date_from: str = None,
+        date_to: str = None,
+        firefighters: List[str] = None
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Rekordy pliku pogrupowane po strażaku — (nazwisko_imie, rekordy).
+        Jedno zapytanie dla wszystkich strażaków (dokumenty zbiorcze) zamiast
+        iter_records_by_file dla każdego; kolejność wg indeksu
+        (file_id, nazwisko_imie, czas_rozp_zdarzenia).
+        firefighters: tylko wybrani strażacy (None — wszyscy z pliku)
+        """
+        columns = [getattr(SWDRecord, name) for name in DataService.EXPORT_COLUMNS]
+        query = DataService._filtered_query(db, file_id, date_from, date_to, None, columns)
+        if firefighters:
+            query = query.filter(SWDRecord.nazwisko_imie.in_(firefighters))
+        query = query.order_by(SWDRecord.nazwisko_imie, SWDRecord.czas_rozp_zdarzenia, SWDRecord.id)
+        
+        rows = (row._asdict() for row in query.yield_per(settings.EXPORT_BATCH_SIZE))
+        for name, group in groupby(rows, key=itemgetter("nazwisko_imie")):
+            if name:
+                yield name, list(group)
 
     @staticmethod
     def count_records_by_file(db: Session, file_id: int) -> int:
@@ -293,16 +523,5 @@ class DataService:
         firefighter: str = None
     ) -> int:
         """Policz rekordy z filtrami"""
-        query = db.query(SWDRecord).filter(SWDRecord.file_id == file_id)
-        
-        if firefighter:
-            query = query.filter(SWDRecord.nazwisko_imie == firefighter)
-        
-        if date_from:
-            query = query.filter(SWDRecord.czas_rozp_zdarzenia >= date_from)
-        
-        if date_to:
-            date_to_end = f"{date_to} 23:59:59"
-            query = query.filter(SWDRecord.czas_rozp_zdarzenia <= date_to_end)
-        
-        return query.count()
\ No newline at end of file
+        query = DataService._filtered_query(db, file_id, date_from, date_to, firefighter)
+        return count_query(query, SWDRecord)
\ No newline at end of file
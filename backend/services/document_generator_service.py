@@ -1,11 +1,12 @@
 from pathlib import Path
 from typing import List, Dict, Any
 from io import BytesIO
-from jinja2 import Environment, FileSystemLoader
-from docxtpl import DocxTemplate
-from xhtml2pdf import pisa  # ← ZMIENIONE
 import sys
 
+from services.template_registry import TemplateRegistry
+from services.docx_template_cache import DocxTemplateCache
+from services.pdf_backends import get_pdf_backend
+
 class DocumentGeneratorService:
     """
     Serwis do generowania dokumentów kart wyjazdów w różnych formatach
@@ -13,23 +14,10 @@ class DocumentGeneratorService:
     
     def __init__(self):
         """Inicjalizacja - ścieżka do templates"""
-        self.templates_dir = self._get_templates_path()
+        self.templates_dir = TemplateRegistry.templates_dir()
         
-        # Jinja2 dla HTML
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(self.templates_dir))
-        )
-    
-    def _get_templates_path(self) -> Path:
-        """Pobierz ścieżkę do templates (działa z PyInstaller)"""
-        try:
-            # PyInstaller
-            base_path = sys._MEIPASS
-            return Path(base_path) / "backend" / "templates"
-        except AttributeError:
-            # Development
-            base_path = Path(__file__).parent.parent
-            return Path(base_path) / "templates"
+        # Jinja2 dla HTML - wspólne środowisko (szablony skompilowane przy starcie)
+        self.jinja_env = TemplateRegistry.get_environment()
     
     def _prepare_records_data(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -116,6 +104,17 @@ class DocumentGeneratorService:
         """
         template = self.jinja_env.get_template('karta_wyjazdow.html')
         
+        # Renderuj
+        return template.render(**self._template_context(
+            firefighter_name, records, date_from, date_to, firefighter_data
+        ))
+    
+    def _template_context(self, firefighter_name: str, records: List[Dict[str, Any]],
+                          date_from: str = None, date_to: str = None,
+                          firefighter_data: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Kontekst szablonu karty (HTML i renderery PDF)
+        """
         # Dane strażaka
         stopien = firefighter_data.get('stopien', '.....................') if firefighter_data else '.....................'
         nazwisko_imie = firefighter_data.get('nazwisko_imie', firefighter_name) if firefighter_data else firefighter_name
@@ -127,8 +126,7 @@ class DocumentGeneratorService:
         # Paginacja
         pages = self._paginate_records(all_records)
         
-        # Renderuj
-        html_content = template.render(
+        return dict(
             firefighter_name=firefighter_name,
             stopien=stopien,
             nazwisko_imie=nazwisko_imie,
@@ -137,41 +135,23 @@ class DocumentGeneratorService:
             date_to=date_to if date_to else '.....................',
             pages=pages
         )
-        
-        return html_content
     
     # ========================================
-    # PDF z HTML (xhtml2pdf) - ZMIENIONE
+    # PDF - wymienny renderer (pdf_backends)
     # ========================================
     def generate_pdf(self, firefighter_name: str, records: List[Dict[str, Any]], 
                      date_from: str = None, date_to: str = None, 
-                     firefighter_data: Dict[str, str] = None) -> BytesIO:
+                     firefighter_data: Dict[str, str] = None,
+                     backend: str = None) -> BytesIO:
         """
-        Generuje PDF z HTML używając xhtml2pdf
+        Generuje PDF karty — renderer z settings.PDF_BACKEND (xhtml2pdf, reportlab)
+        albo podany w backend
         ORIENTACJA POZIOMA (LANDSCAPE)
         """
-        # Wygeneruj HTML
-        html_content = self.generate_html(
+        context = self._template_context(
             firefighter_name, records, date_from, date_to, firefighter_data
         )
-        
-        # Przygotuj output
-        output = BytesIO()
-        
-        # Konwertuj HTML -> PDF
-        pisa_status = pisa.CreatePDF(
-            html_content,
-            dest=output,
-            encoding='utf-8'
-        )
-        
-        # Sprawdź błędy
-        if pisa_status.err:
-            raise Exception(f"Błąd generowania PDF: {pisa_status.err}")
-        
-        # Zwróć PDF
-        output.seek(0)
-        return output
+        return get_pdf_backend('karta_wyjazdow.html', backend).render('karta_wyjazdow.html', context)
     
     # ========================================
     # DOCX z szablonu Word
@@ -182,13 +162,8 @@ class DocumentGeneratorService:
         """
         Generuje DOCX z szablonu Word używając docxtpl
         """
-        # Załaduj szablon
-        template_path = self.templates_dir / "karta_wyjazdow.docx"
-        
-        if not template_path.exists():
-            raise FileNotFoundError(f"Szablon DOCX nie znaleziony: {template_path}")
-        
-        doc = DocxTemplate(template_path)
+        # Szablon z cache w pamięci (nowa kopia na każdy dokument)
+        doc = DocxTemplateCache.get("karta_wyjazdow.docx")
         
         # Dane strażaka
         stopien = firefighter_data.get('stopien', '.....................') if firefighter_data else '.....................'
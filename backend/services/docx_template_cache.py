@@ -0,0 +1,157 @@
+"""
+backend/services/docx_template_cache.py
+
+Cache szablonów DOCX (docxtpl) w pamięci procesu.
+
+DocxTemplate(ścieżka) przy każdym dokumencie:
+  - czyta i rozpakowuje plik .docx, parsuje XML części,
+  - serializuje treść do tekstu i łata ją regexami (patch_xml),
+  - kompiluje wynik jako szablon Jinja (body, nagłówki, stopki).
+Przy karcie wyjazdów to ok. 1/3 czasu generowania dokumentu.
+
+DocxTemplateCache trzyma nienaruszoną kopię szablonu (_Snapshot):
+bajty pliku oraz skompilowane szablony Jinja części XML. Każde żądanie
+dostaje nowy CachedDocxTemplate — własny Document z tych bajtów (bez
+odczytu z dysku), więc renderowanie nie modyfikuje kopii w cache i może
+działać równolegle. Pomijane są patch_xml i kompilacja.
+
+Plik sprawdzany ponownie (mtime) tylko gdy settings.TEMPLATE_AUTO_RELOAD.
+Metody nadpisane w CachedDocxTemplate odpowiadają docxtpl==0.16.7
+(requirements.txt) — przy zmianie wersji sprawdzić build_xml / render_xml_part.
+"""
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+import re
+import sys
+import threading
+import time
+
+from docxtpl import DocxTemplate
+from jinja2 import Template
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import settings
+from services.template_registry import TemplateRegistry
+
+
+class _Snapshot:
+    """Nienaruszona kopia szablonu: bajty pliku i skompilowane części XML"""
+
+    def __init__(self, data: bytes, mtime: float):
+        self.data = data
+        self.mtime = mtime
+        self._lock = threading.Lock()
+        # nazwa części → (szablon Jinja, kodowanie XML nagłówka / stopki)
+        self._parts: Dict[str, Tuple[Template, Optional[str]]] = {}
+
+    def part(self, key: str, load: Callable[[], Tuple[str, Optional[str]]]) -> Tuple[Template, Optional[str]]:
+        """Skompilowana część; load() (XML po patch_xml, kodowanie) tylko za pierwszym razem"""
+        with self._lock:
+            if key not in self._parts:
+                xml, encoding = load()
+                # jak DocxTemplate.render_xml_part — akapity w osobnych liniach
+                xml = re.sub(r'<w:p([ >])', r'\n<w:p\1', xml)
+                self._parts[key] = (Template(xml), encoding)
+            return self._parts[key]
+
+
+class CachedDocxTemplate(DocxTemplate):
+    """DocxTemplate z kopii w pamięci — renderuje skompilowane wcześniej części"""
+
+    def __init__(self, snapshot: _Snapshot):
+        super().__init__(BytesIO(snapshot.data))
+        self._snapshot = snapshot
+
+    def prepare(self):
+        """Skompiluj wszystkie części szablonu bez renderowania (warm_up)"""
+        self.init_docx()
+        self._body_template()
+        for uri in (self.HEADER_URI, self.FOOTER_URI):
+            for _, part in self.get_headers_footers(uri):
+                self._part_template(part)
+
+    def _body_template(self) -> Template:
+        template, _ = self._snapshot.part("body", lambda: (self.patch_xml(self.get_xml()), None))
+        return template
+
+    def _part_template(self, part) -> Tuple[Template, str]:
+        def load():
+            xml = self.get_part_xml(part)
+            return self.patch_xml(xml), self.get_headers_footers_encoding(xml)
+        return self._snapshot.part(str(part.partname), load)
+
+    def _render_template(self, template: Template, part, context) -> str:
+        """Druga połowa DocxTemplate.render_xml_part (po kompilacji)"""
+        self.current_rendering_part = part
+        dst_xml = template.render(context)
+        dst_xml = re.sub(r'\n<w:p([ >])', r'<w:p\1', dst_xml)
+        dst_xml = (dst_xml
+                   .replace('{_{', '{{')
+                   .replace('}_}', '}}')
+                   .replace('{_%', '{%')
+                   .replace('%_}', '%}'))
+        return self.resolve_listing(dst_xml)
+
+    def build_xml(self, context, jinja_env=None):
+        if jinja_env is not None:
+            # Własne środowisko Jinja — bez cache (szablony w _Snapshot są z domyślnego)
+            return super().build_xml(context, jinja_env)
+        return self._render_template(self._body_template(), self.docx._part, context)
+
+    def build_headers_footers_xml(self, context, uri, jinja_env=None):
+        if jinja_env is not None:
+            yield from super().build_headers_footers_xml(context, uri, jinja_env)
+            return
+        for relKey, part in self.get_headers_footers(uri):
+            template, encoding = self._part_template(part)
+            yield relKey, self._render_template(template, part, context).encode(encoding)
+
+
+class DocxTemplateCache:
+    """Szablony DOCX z backend/templates trzymane w pamięci"""
+
+    _lock = threading.Lock()
+    _snapshots: Dict[str, _Snapshot] = {}
+
+    @staticmethod
+    def get(name: str) -> CachedDocxTemplate:
+        """Nowy DocxTemplate (gotowy do render / save) z kopii szablonu w pamięci"""
+        return CachedDocxTemplate(DocxTemplateCache._snapshot(name))
+
+    @staticmethod
+    def _snapshot(name: str) -> _Snapshot:
+        with DocxTemplateCache._lock:
+            snapshot = DocxTemplateCache._snapshots.get(name)
+            if snapshot is not None and not settings.TEMPLATE_AUTO_RELOAD:
+                return snapshot
+
+            path = TemplateRegistry.templates_dir() / name
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                raise FileNotFoundError(f"Szablon DOCX nie znaleziony: {path}")
+
+            if snapshot is None or snapshot.mtime != mtime:
+                snapshot = _Snapshot(path.read_bytes(), mtime)
+                DocxTemplateCache._snapshots[name] = snapshot
+            return snapshot
+
+    @staticmethod
+    def clear():
+        with DocxTemplateCache._lock:
+            DocxTemplateCache._snapshots.clear()
+
+    @staticmethod
+    def warm_up() -> int:
+        """Wczytaj i skompiluj wszystkie szablony DOCX (wywoływane przy starcie aplikacji)"""
+        start = time.perf_counter()
+        names = sorted(path.name for path in TemplateRegistry.templates_dir().glob("*.docx"))
+        for name in names:
+            try:
+                DocxTemplateCache.get(name).prepare()
+            except Exception as e:
+                print(f"[TEMPLATES] Błąd wczytania szablonu {name}: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"[TEMPLATES] Wczytano {len(names)} szablonów DOCX ({elapsed_ms:.0f} ms)")
+        return len(names)
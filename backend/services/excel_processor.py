@@ -1,7 +1,7 @@
-import pandas as pd
 from pathlib import Path
 from typing import Dict, Any
 from config import settings
+from services.excel_stream_reader import ExcelStreamReader
 import sys
 
 # Import biblioteki zestawienie-swd
@@ -46,13 +46,16 @@ class ExcelProcessor:
             if not file_path.exists():
                 return False, "Plik nie istnieje"
             
-            if file_path.suffix.lower() not in ['.xlsx', '.xls']:
+            if file_path.suffix.lower() == '.xls':
+                return False, "Format .xls (Excel 97-2003) nie jest obsługiwany — zapisz plik w Excelu jako .xlsx"
+
+            if file_path.suffix.lower() != '.xlsx':
                 return False, "Nieprawidłowe rozszerzenie pliku (wymagany .xlsx)"
             
-            # Sprawdź czy plik można otworzyć
+            # Sprawdź czy plik można otworzyć — strumieniowo, czytamy tylko
+            # nagłówek i pierwszy wiersz danych (pełny odczyt robi zestawienie_swd)
             try:
-                df = pd.read_excel(file_path, nrows=1)
-                if df.empty:
+                if not ExcelStreamReader(file_path).has_data_rows():
                     return False, "Plik Excel jest pusty"
             except Exception as e:
                 return False, f"Nie można odczytać pliku Excel: {str(e)}"
@@ -119,14 +122,8 @@ class ExcelProcessor:
             raise Exception(f"Błąd przetwarzania pliku: {str(e)}")
     
     def get_file_summary(self, file_path: Path) -> Dict[str, Any]:
-        """Zwraca podsumowanie pliku Excel"""
+        """Zwraca podsumowanie pliku Excel (jeden strumieniowy przebieg, stała pamięć)"""
         try:
-            df = pd.read_excel(file_path)
-            return {
-                "rows_count": len(df),
-                "columns_count": len(df.columns),
-                "columns": df.columns.tolist(),
-                "preview": df.head(5).to_dict('records')
-            }
+            return ExcelStreamReader(file_path).summary(preview_rows=5)
         except Exception as e:
             return {"error": str(e)}
\ No newline at end of file
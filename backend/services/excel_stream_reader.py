@@ -0,0 +1,125 @@
+"""
+backend/services/excel_stream_reader.py
+
+Strumieniowy odczyt arkuszy Excel (openpyxl read_only + iter_rows(values_only=True)).
+Wiersze czytane są jeden po drugim — zużycie pamięci nie rośnie z rozmiarem pliku,
+w przeciwieństwie do pd.read_excel, który ładuje cały arkusz do DataFrame.
+"""
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import datetime, date, time
+from contextlib import contextmanager
+import openpyxl
+
+
+class ExcelStreamReader:
+    """
+    Jednoprzebiegowy czytnik pierwszego arkusza pliku .xlsx.
+
+    Użycie:
+        reader = ExcelStreamReader(path, required_headers=["Stopień", "Punkt"])
+        reader.has_data_rows()                   # walidacja nagłówków i 1. wiersz danych
+        for row in reader.iter_rows():           # słowniki {nagłówek: wartość}
+            ...
+    """
+
+    def __init__(self, file_path: Path, required_headers: List[str] = None, header_row: int = 1):
+        self.file_path = Path(file_path)
+        self.required_headers = required_headers or []
+        self.header_row = header_row
+
+    @contextmanager
+    def _open_sheet(self):
+        """Otwórz arkusz w trybie read_only — zawsze zamykaj (uchwyt pliku na Windows)"""
+        wb = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            yield wb.active
+        finally:
+            wb.close()
+
+    @staticmethod
+    def normalize(value) -> Any:
+        """
+        Normalizacja komórki:
+          - puste / same spacje → None
+          - tekst → bez białych znaków na brzegach
+          - daty → 'YYYY-MM-DD HH:MM:SS' (format przechowywany w bazie)
+          - liczby całkowite zapisane jako float (1.0) → int
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = value.strip()
+            return value or None
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        if isinstance(value, date):
+            return value.strftime("%Y-%m-%d")
+        if isinstance(value, time):
+            return value.strftime("%H:%M:%S")
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    def _validate_headers(self, headers: List[Optional[str]]):
+        missing = [h for h in self.required_headers if h not in headers]
+        if missing:
+            raise ValueError(f"Brakujące kolumny: {', '.join(missing)}")
+
+    def _read_sheet(self, ws) -> Tuple[List[Optional[str]], Iterator[Dict[str, Any]]]:
+        """
+        (nagłówki, generator wierszy danych) z otwartego arkusza — jeden przebieg.
+        Nagłówki walidowane są na pierwszym wierszu — błąd przerywa odczyt od razu.
+        """
+        rows = ws.iter_rows(min_row=self.header_row, values_only=True)
+
+        header_values = next(rows, None)
+        if header_values is None:
+            raise ValueError("Plik Excel jest pusty")
+        headers = [self.normalize(v) for v in header_values]
+        self._validate_headers(headers)
+
+        def data_rows():
+            for values in rows:
+                normalized = [self.normalize(v) for v in values]
+                if all(v is None for v in normalized):
+                    continue
+                yield {h: v for h, v in zip(headers, normalized) if h is not None}
+
+        return headers, data_rows()
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Generator znormalizowanych wierszy danych {nagłówek: wartość}.
+        Całkowicie puste wiersze są pomijane.
+        """
+        with self._open_sheet() as ws:
+            _, rows = self._read_sheet(ws)
+            yield from rows
+
+    def has_data_rows(self) -> bool:
+        """Czy arkusz zawiera co najmniej jeden wiersz danych (czyta tylko początek pliku)"""
+        rows = self.iter_rows()
+        try:
+            return next(rows, None) is not None
+        finally:
+            rows.close()
+
+    def summary(self, preview_rows: int = 5) -> Dict[str, Any]:
+        """Podsumowanie pliku w jednym przebiegu — liczba wierszy, kolumny, podgląd"""
+        rows_count = 0
+        preview = []
+        with self._open_sheet() as ws:
+            headers, rows = self._read_sheet(ws)
+            for row in rows:
+                if rows_count < preview_rows:
+                    preview.append(row)
+                rows_count += 1
+
+        columns = [h for h in headers if h is not None]
+        return {
+            "rows_count": rows_count,
+            "columns_count": len(columns),
+            "columns": columns,
+            "preview": preview,
+        }
@@ -0,0 +1,29 @@
+"""
+backend/services/file_storage_service.py
+
+Zapis uploadowanych plików na dysk.
+Skrót SHA-256 liczony jest w trakcie zapisu (ten sam przebieg co kopiowanie),
+więc rozpoznanie ponownie wgranego pliku nie wymaga jego ponownego odczytu.
+"""
+from fastapi import UploadFile
+from pathlib import Path
+import hashlib
+
+
+class FileStorageService:
+    """Zapis plików z uploadu z jednoczesnym liczeniem skrótu treści"""
+
+    CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+    @staticmethod
+    def save_upload(file: UploadFile, file_path: Path) -> str:
+        """
+        Zapisz plik strumieniowo i zwróć skrót SHA-256 jego treści (hex).
+        Zastępuje shutil.copyfileobj — kopiowanie i hashowanie w jednej pętli.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "wb") as buffer:
+            while chunk := file.file.read(FileStorageService.CHUNK_SIZE):
+                digest.update(chunk)
+                buffer.write(chunk)
+        return digest.hexdigest()
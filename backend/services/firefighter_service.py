@@ -70,6 +70,16 @@ class FirefighterService:
             .limit(limit)\
             .all()
     
+    @staticmethod
+    def get_by_names(db: Session, names: List[str]) -> Dict[str, Firefighter]:
+        """Strażacy o podanych nazwiskach (dokładne dopasowanie) — {nazwisko_imie: Firefighter}"""
+        if not names:
+            return {}
+        firefighters = db.query(Firefighter)\
+            .filter(Firefighter.nazwisko_imie.in_(names))\
+            .all()
+        return {ff.nazwisko_imie: ff for ff in firefighters}
+    
     @staticmethod
     def get_statistics(db: Session) -> Dict:
         """Pobierz statystyki strażaków"""
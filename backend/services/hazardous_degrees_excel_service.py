@@ -5,11 +5,13 @@ Import/eksport stopni szkodliwości z/do Excel i CSV.
 """
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.styles import Font, Alignment
 from io import BytesIO
-from datetime import datetime
+
+from services.excel_stream_reader import ExcelStreamReader
+from services.xlsx_stream_writer import XlsxStreamWriter
 
 
 class HazardousDegreesExcelService:
@@ -18,6 +20,9 @@ class HazardousDegreesExcelService:
     # Nagłówki pliku Excel (import i eksport)
     HEADERS = ["Id", "Stopień", "Punkt", "Opis", "Uwagi"]
 
+    # Kolumny wymagane przy imporcie (Id i Uwagi są opcjonalne)
+    REQUIRED_HEADERS = ["Stopień", "Punkt", "Opis"]
+
     # Mapowanie nagłówków → pola modelu
     COLUMN_MAPPING = {
         "Stopień": "stopien",
@@ -37,15 +42,14 @@ class HazardousDegreesExcelService:
             if file_path.suffix.lower() not in [".xlsx"]:
                 return False, "Nieprawidłowe rozszerzenie pliku (wymagany .xlsx)"
 
-            df = pd.read_excel(file_path)
-            if df.empty:
-                return False, "Plik Excel jest pusty"
-
-            # Wymagane kolumny (Id jest opcjonalne)
-            required = ["Stopień", "Punkt", "Opis"]
-            missing = [h for h in required if h not in df.columns]
-            if missing:
-                return False, f"Brakujące kolumny: {', '.join(missing)}"
+            # Nagłówki i pierwszy wiersz danych — strumieniowo, bez wczytywania arkusza
+            try:
+                reader = ExcelStreamReader(file_path, required_headers=self.REQUIRED_HEADERS)
+                if not reader.has_data_rows():
+                    return False, "Plik Excel jest pusty"
+            except ValueError as e:
+                # Brakujące kolumny / pusty arkusz
+                return False, str(e)
 
             return True, ""
         except Exception as e:
@@ -187,49 +191,25 @@ class HazardousDegreesExcelService:
 
     # ── Eksport XLSX ────────────────────────────────────────────────────────
 
-    def export_to_excel(self, records: List[Dict[str, Any]]) -> BytesIO:
-        """Eksportuje listę rekordów do pliku Excel"""
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Stopnie Szkodliwości"
-
-        header_fill      = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font      = Font(name="Arial", bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal="center", vertical="center")
-
-        for col_idx, header in enumerate(self.HEADERS, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=header)
-            cell.fill      = header_fill
-            cell.font      = header_font
-            cell.alignment = header_alignment
-
-        for row_idx, record in enumerate(records, start=2):
-            row_data = [
-                record.get("id", row_idx - 1),
+    def export_to_excel(self, records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+        """Eksportuje listę rekordów do pliku Excel — zapis strumieniowy"""
+        writer = XlsxStreamWriter(
+            "Stopnie Szkodliwości",
+            self.HEADERS,
+            [8, 10, 10, 60, 40],
+            header_fill="4472C4",
+        )
+        rows = (
+            [
+                record.get("id", ""),
                 record.get("stopien", ""),
                 record.get("punkt", ""),
                 record.get("opis", ""),
                 record.get("uwagi", ""),
             ]
-            for col_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                cell.alignment = Alignment(horizontal="left", vertical="center")
-                cell.font      = Font(name="Arial", size=10)
-
-        # Szerokości kolumn
-        for col_idx, width in enumerate([8, 10, 10, 60, 40], start=1):
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = width
-
-        # Stopka
-        info_row = len(records) + 3
-        ws.cell(row=info_row,     column=1, value=f"Wyeksportowano: {len(records)} rekordów").font = Font(italic=True, size=9, color="666666")
-        ws.cell(row=info_row + 1, column=1, value=f"Data eksportu: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}").font = Font(italic=True, size=9, color="666666")
-        ws.cell(row=info_row + 2, column=1, value="MatMad Software 2026 wszelkie prawa zastrzeżone").font = Font(italic=True, size=9, color="666666")
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        return output
+            for record in records
+        )
+        return writer.stream(rows)
 
     # ── Eksport CSV ─────────────────────────────────────────────────────────
 
@@ -3,14 +3,22 @@ backend/services/hazardous_degrees_service.py
 
 Serwis do zarządzania stopniami szkodliwości.
 Wzorowany na FirefighterService - zachowuje identyczny styl.
+
+HazardousDegreeCatalog — pamięć całego katalogu w procesie (lista rozwijana,
+serializacja rekordów szkodliwych), z numerem wersji zmienianym przy każdej
+zmianie katalogu (ETag listy).
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from typing import List, Optional, Dict
+from sqlalchemy import event, func, or_
+from typing import List, Optional, Dict, Any, Tuple
+import threading
+import time
+import uuid
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
+from config import settings
 from models.swd_data import HazardousDegree
 
 
@@ -148,4 +156,142 @@ class HazardousDegreesService:
                 {"stopien": stopien, "count": count}
                 for stopien, count in by_degree
             ],
-        }
\ No newline at end of file
+        }
+
+
+class HazardousDegreeCatalog:
+    """
+    Katalog stopni szkodliwości w pamięci procesu, wersjonowany.
+
+    Wersja rośnie po każdym commicie zmieniającym stopnie (create/update/delete,
+    import — zdarzenia sesji niżej) i po invalidate(). Wczytany katalog jest
+    ważny do zmiany wersji, najdłużej HAZARDOUS_DEGREES_CACHE_TTL sekund —
+    zmiany z innych stanowisk (wspólna baza sieciowa) wykrywane są przy
+    ponownym wczytaniu i też podnoszą wersję.
+
+    Słowniki stopni są współdzielone między żądaniami — tylko do odczytu.
+    """
+
+    _lock = threading.Lock()
+    _instance = uuid.uuid4().hex[:8]   # ETag z poprzedniego uruchomienia nieważny
+    _version = 1
+    _loaded_at = 0.0
+    _ordered: Optional[List[Dict[str, Any]]] = None   # stopień → punkt
+    _by_id: Dict[int, Dict[str, Any]] = {}
+
+    @staticmethod
+    def get_catalog(db: Session) -> Tuple[int, List[Dict[str, Any]]]:
+        """(wersja, wszystkie stopnie posortowane stopień → punkt) — wczytuje gdy nieaktualne"""
+        version, ordered, _ = HazardousDegreeCatalog._snapshot(db)
+        return version, ordered
+
+    @staticmethod
+    def get_by_id_map(db: Session) -> Dict[int, Dict[str, Any]]:
+        """Słownik id → stopień (aktualny katalog)"""
+        return HazardousDegreeCatalog._snapshot(db)[2]
+
+    @staticmethod
+    def _snapshot(db: Session) -> Tuple[int, List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+        cls = HazardousDegreeCatalog
+        with cls._lock:
+            if cls._ordered is not None and time.monotonic() - cls._loaded_at < settings.HAZARDOUS_DEGREES_CACHE_TTL:
+                return cls._version, cls._ordered, cls._by_id
+            version = cls._version
+            previous = cls._ordered
+
+        ordered = [
+            degree.to_dict() for degree in
+            db.query(HazardousDegree).order_by(HazardousDegree.stopien, HazardousDegree.punkt, HazardousDegree.id)
+        ]
+        by_id = {degree["id"]: degree for degree in ordered}
+
+        with cls._lock:
+            if cls._version != version:
+                # Katalog zmieniony w trakcie wczytywania — wynik tylko dla tego
+                # wywołania, ze starą wersją (kolejne żądanie dostanie nowy ETag)
+                return version, ordered, by_id
+            if previous is not None and previous != ordered:
+                cls._version += 1   # zmiana spoza tego procesu
+            cls._ordered, cls._by_id = ordered, by_id
+            cls._loaded_at = time.monotonic()
+            return cls._version, ordered, by_id
+
+    @staticmethod
+    def etag(version: int) -> str:
+        return f'"degrees-{HazardousDegreeCatalog._instance}-{version}"'
+
+    @staticmethod
+    def query(
+        db: Session,
+        search: str = None,
+        stopien: int = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Tuple[int, List[Dict[str, Any]], int]:
+        """
+        Lista z filtrami jak get_all / search / get_by_stopien, z pamięci:
+        (wersja, strona stopni, liczba wszystkich pasujących)
+        """
+        version, degrees = HazardousDegreeCatalog.get_catalog(db)
+        if search:
+            needle = search.lower()
+            degrees = [
+                d for d in degrees
+                if needle in (d["opis"] or "").lower() or needle in (d["uwagi"] or "").lower()
+            ]
+        elif stopien is not None:
+            degrees = [d for d in degrees if d["stopien"] == stopien]
+        return version, degrees[skip:skip + limit], len(degrees)
+
+    @staticmethod
+    def invalidate():
+        """Katalog zmieniony — nowa wersja, ponowne wczytanie przy następnym odczycie"""
+        with HazardousDegreeCatalog._lock:
+            HazardousDegreeCatalog._version += 1
+            HazardousDegreeCatalog._ordered = None
+            HazardousDegreeCatalog._by_id = {}
+
+
+class DegreeLookup:
+    """
+    Słownik stopni szkodliwości na czas jednego żądania — migawka
+    HazardousDegreeCatalog pobrana przy pierwszym użyciu, więc wszystkie
+    rekordy odpowiedzi widzą ten sam katalog, a serializacja listy
+    (HazardousRecord.to_dict(degrees)) nie odpytuje bazy o stopnie.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._degrees: Optional[Dict[int, Dict[str, Any]]] = None
+
+    def get(self, degree_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        if degree_id is None:
+            return None
+        if self._degrees is None:
+            self._degrees = HazardousDegreeCatalog.get_by_id_map(self.db)
+        return self._degrees.get(degree_id)
+
+
+# ── Unieważnianie po zmianach ORM ────────────────────────────────────────────
+
+_CATALOG_CHANGED_KEY = "hazardous_degrees_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_catalog_changes(session, flush_context):
+    if any(isinstance(instance, HazardousDegree)
+           for instance in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_CATALOG_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalog(session):
+    if session.info.pop(_CATALOG_CHANGED_KEY, False):
+        HazardousDegreeCatalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_changes(session):
+    # Katalog mógł zostać wczytany tą sesją razem z wycofanymi zmianami
+    if session.info.pop(_CATALOG_CHANGED_KEY, False):
+        HazardousDegreeCatalog.invalidate()
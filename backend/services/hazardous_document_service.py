@@ -8,26 +8,19 @@ Szablon: backend/templates/zestawienie_dodatku_szkodliwego.html
 from pathlib import Path
 from typing import List, Dict, Any
 from io import BytesIO
-from jinja2 import Environment, FileSystemLoader
 import sys
 import math
 
+sys.path.append(str(Path(__file__).parent.parent))
+from services.template_registry import TemplateRegistry
+
 
 class HazardousDocumentService:
 
     def __init__(self):
-        self.templates_dir = self._get_templates_path()
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(self.templates_dir))
-        )
-
-    def _get_templates_path(self) -> Path:
-        try:
-            base_path = sys._MEIPASS
-            return Path(base_path) / "backend" / "templates"
-        except AttributeError:
-            base_path = Path(__file__).parent.parent
-            return Path(base_path) / "templates"
+        self.templates_dir = TemplateRegistry.templates_dir()
+        # Wspólne środowisko Jinja (szablony skompilowane przy starcie)
+        self.jinja_env = TemplateRegistry.get_environment()
 
     # ── Przygotowanie rekordów ────────────────────────────────────────────────
 
@@ -74,12 +67,13 @@ class HazardousDocumentService:
     def _prepare_records(
         self,
         records: List[Dict[str, Any]],
-        only_eligible: bool = False,
         only_unassigned: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Mapuje rekordy HazardousRecord na wiersze dokumentu.
         Uwzględnia tylko rekordy z przypisanym stopniem szkodliwości.
+        Filtr "tylko zaliczone" (only_eligible) wykonuje już zapytanie
+        HazardousRecordsService (czas_udzialu_min, indeks częściowy).
         """
         result = []
         idx = 1
@@ -89,15 +83,6 @@ class HazardousDocumentService:
             if not record.get('hazardous_degree_id'):
                 continue
 
-            # Filtr: tylko zaliczone do dodatku (af != '1' AND czas_udzialu > '00:30')
-            if only_eligible:
-                af = str(record.get('af') or '').strip()
-                czas_udzialu = str(record.get('czas_udzialu') or '').strip()
-                if af == '1':
-                    continue
-                if not czas_udzialu or czas_udzialu <= '00:30':
-                    continue
-
             # Filtr: tylko bez przypisanego stopnia — przy pkt 1 ten filtr jest sprzeczny,
             # zostawiamy dla spójności z API ale w praktyce da pusty wynik
             if only_unassigned:
@@ -198,7 +183,6 @@ class HazardousDocumentService:
 
         all_records = self._prepare_records(
             records,
-            only_eligible=filters.get('only_eligible', False),
             only_unassigned=filters.get('only_unassigned', False),
         )
 
@@ -231,11 +215,7 @@ class HazardousDocumentService:
             Bez paginacji — jedna tabela, Word sam łamie strony
             i powtarza nagłówek (Repeat Header Row w szablonie).
             """
-            from docxtpl import DocxTemplate
-    
-            template_path = self.templates_dir / "zestawienie_dodatku_szkodliwego.docx"
-            if not template_path.exists():
-                raise FileNotFoundError(f"Szablon DOCX nie znaleziony: {template_path}")
+            from services.docx_template_cache import DocxTemplateCache
     
             filters = filters or {}
     
@@ -249,7 +229,6 @@ class HazardousDocumentService:
             # Płaska lista rekordów — bez paginacji
             all_records = self._prepare_records(
                 records,
-                only_eligible=filters.get('only_eligible', False),
                 only_unassigned=filters.get('only_unassigned', False),
             )
     
@@ -263,7 +242,8 @@ class HazardousDocumentService:
                 'records':          all_records,   
             }
     
-            doc = DocxTemplate(template_path)
+            # Szablon z cache w pamięci (nowa kopia na każdy dokument)
+            doc = DocxTemplateCache.get("zestawienie_dodatku_szkodliwego.docx")
             doc.render(context)
     
             output = BytesIO()
@@ -8,14 +8,20 @@ Różnice vs DataService:
     (te dotyczące szkodliwości, nie samych wyjazdów)
   - Nowe metody: assign_degree, assign_degree_bulk, count z filtrem only_unassigned
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, func, insert, literal, or_, select
+from typing import List, Optional, Iterator, Dict, Any, Tuple
+from itertools import groupby, repeat
+from operator import attrgetter, itemgetter
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
-from models.swd_data import HazardousRecord, ImportedFile
+from config import settings
+from models.swd_data import HazardousRecord, HazardousDegree, ImportedFile, HAZARDOUS_ELIGIBLE
+from models.timestamps import parse_timestamp, parse_duration_minutes, day_range
+from services.keyset_pagination import apply_cursor, apply_order
+from services.record_listing import RecordCountCache, fetch_page, count_query
 
 try:
     from zestawienie_swd import CollectionZestawienieWiersz
@@ -23,6 +29,11 @@ except ImportError:
     CollectionZestawienieWiersz = None
 
 
+def _str_or_none(value):
+    """Konwersja pola z importu — identyczna reguła jak w create_records"""
+    return str(value) if value else None
+
+
 class HazardousRecordsService:
     """Serwis do zarządzania danymi Dodatku Szkodliwego"""
 
@@ -42,13 +53,17 @@ class HazardousRecordsService:
         filename: str,
         original_filename: str,
         file_path: str,
-        rows_count: int
+        rows_count: int,
+        status: str = "completed",
+        content_hash: str = None,
     ) -> ImportedFile:
         file_record = ImportedFile(
             filename=filename,
             original_filename=original_filename,
             file_path=file_path,
             rows_count=rows_count,
+            status=status,
+            content_hash=content_hash,
             file_type="hazardous",   # odróżnia od plików Wyjazdów
         )
         db.add(file_record)
@@ -56,6 +71,20 @@ class HazardousRecordsService:
         db.refresh(file_record)
         return file_record
 
+    @staticmethod
+    def find_file_by_hash(db: Session, content_hash: str) -> Optional[ImportedFile]:
+        """Identyczna metoda jak DataService.find_file_by_hash — pliki Dodatku Szkodliwego"""
+        return (
+            db.query(ImportedFile)
+            .filter(
+                ImportedFile.content_hash == content_hash,
+                ImportedFile.file_type == "hazardous",
+                ImportedFile.status == "completed",
+            )
+            .order_by(ImportedFile.imported_at.desc())
+            .first()
+        )
+
     @staticmethod
     def delete_file(db: Session, file_id: int) -> bool:
         file_record = db.query(ImportedFile).filter(ImportedFile.id == file_id).first()
@@ -80,8 +109,38 @@ class HazardousRecordsService:
         date_to: str = None,
         sort_by: str = None,
         sort_order: str = "asc",
+        cursor: str = None,
+        degree_loading: str = None,
     ) -> List[HazardousRecord]:
-        query = db.query(HazardousRecord).filter(HazardousRecord.file_id == file_id)
+        """
+        Strona rekordów: kursor (next_cursor poprzedniej strony, keyset) albo skip/limit.
+        degree_loading — ładowanie relacji hazardous_degree (DEGREE_LOADERS).
+        """
+        query = HazardousRecordsService._filtered_query(
+            db, file_id, firefighter, only_unassigned, only_eligible, date_from, date_to
+        )
+        query = HazardousRecordsService._with_degree_loading(query, degree_loading)
+
+        if cursor:
+            query = apply_cursor(query, HazardousRecord, cursor, sort_by, sort_order)
+            skip = 0
+        query = apply_order(query, HazardousRecord, sort_by, sort_order)
+
+        return query.offset(skip).limit(limit).all()
+
+    @staticmethod
+    def _filtered_query(
+        db: Session,
+        file_id: int,
+        firefighter: str = None,
+        only_unassigned: bool = False,
+        only_eligible: bool = False,
+        date_from: str = None,
+        date_to: str = None,
+        entities=None,
+    ):
+        """Zapytanie z filtrami listy — wspólne dla strony, licznika i eksportu"""
+        query = db.query(*(entities or [HazardousRecord])).filter(HazardousRecord.file_id == file_id)
 
         if firefighter:
             query = query.filter(HazardousRecord.nazwisko_imie == firefighter)
@@ -90,56 +149,228 @@ class HazardousRecordsService:
             query = query.filter(HazardousRecord.hazardous_degree_id == None)
 
         if only_eligible:
-            # Zaliczone do dodatku: af != "1" (lub NULL) AND czas_udzialu > "00:30"
-            from sqlalchemy import or_
-            query = query.filter(
-                or_(HazardousRecord.af != "1", HazardousRecord.af == None),
-                HazardousRecord.czas_udzialu > "00:30",
-            )
+            # Zaliczone do dodatku: af != "1" (lub NULL) AND czas_udzialu_min > 30
+            # — indeks częściowy ix_hazardous_records_eligible
+            query = query.filter(HAZARDOUS_ELIGIBLE)
+
+        # Zakres dat po kolumnie liczbowej (indeks file_id + czas_od_ts)
+        ts_from, ts_to = day_range(date_from, date_to)
 
+        # Rekordy z datą, której nie dało się odczytać (czas_od_ts NULL),
+        # filtrowane po staremu — porównaniem tekstu
         if date_from:
-            query = query.filter(HazardousRecord.czas_od >= date_from)
+            text_from = HazardousRecord.czas_od >= date_from
+            if ts_from is not None:
+                query = query.filter(or_(
+                    HazardousRecord.czas_od_ts >= ts_from,
+                    and_(HazardousRecord.czas_od_ts.is_(None), text_from),
+                ))
+            else:
+                query = query.filter(text_from)
 
         if date_to:
-            date_to_end = f"{date_to} 23:59:59"
-            query = query.filter(HazardousRecord.czas_od <= date_to_end)
+            text_to = HazardousRecord.czas_od <= f"{date_to} 23:59:59"
+            if ts_to is not None:
+                query = query.filter(or_(
+                    HazardousRecord.czas_od_ts < ts_to,
+                    and_(HazardousRecord.czas_od_ts.is_(None), text_to),
+                ))
+            else:
+                query = query.filter(text_to)
+
+        return query
+
+    @staticmethod
+    def list_records(
+        db: Session,
+        file_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        firefighter: str = None,
+        only_unassigned: bool = False,
+        only_eligible: bool = False,
+        date_from: str = None,
+        date_to: str = None,
+        sort_by: str = None,
+        sort_order: str = "asc",
+        cursor: str = None,
+        degree_loading: str = None,
+        columns: List[str] = None,
+    ) -> Tuple[List[HazardousRecord], int]:
+        """
+        Strona listy i total_count jednym zapytaniem.
+        Total zapamiętywany per (plik, filtry) do zmiany rekordów pliku.
+        columns (np. LISTING_COLUMNS) — strona jako wiersze tych kolumn zamiast
+        obiektów (degree_loading wtedy nie ma zastosowania).
+        """
+        query = HazardousRecordsService._filtered_query(
+            db, file_id, firefighter, only_unassigned, only_eligible, date_from, date_to
+        )
+        filters = (firefighter, only_unassigned, only_eligible, date_from, date_to)
+        return fetch_page(
+            query, HazardousRecord, file_id, filters, skip, limit, sort_by, sort_order, cursor,
+            options=HazardousRecordsService._degree_options(degree_loading),
+            columns=columns,
+        )
+
+    # Kolumny listy rekordów w API — klucze HazardousRecord.to_dict()
+    # bez hazardous_degree (dokładany ze słownika stopni)
+    LISTING_COLUMNS = [
+        "id", "file_id", "jednostka", "nazwisko_imie", "stopien", "data_przyjecia",
+        "p", "mz", "af", "nr_meldunku", "funkcja", "czas_od", "czas_do",
+        "czas_udzialu", "dodatek_szkodliwy", "stopien_szkodliwosci",
+        "aktualizowal_szkod", "data_aktualizacji_szkod", "opis_st_szkodliwosci",
+        "hazardous_degree_id", "created_at", "updated_at",
+    ]
+
+    # Kolumny listy o małej liczbie różnych wartości — kodowane słownikiem
+    # w formacie kolumnowym (services/columnar_format.py)
+    DICTIONARY_COLUMNS = [
+        "jednostka", "nazwisko_imie", "stopien", "data_przyjecia", "p", "mz", "af", "funkcja",
+        "dodatek_szkodliwy", "stopien_szkodliwosci", "aktualizowal_szkod", "opis_st_szkodliwosci",
+    ]
+
+    # Ładowanie relacji hazardous_degree dla rekordów ORM:
+    #   "joined"   — LEFT JOIN w zapytaniu strony,
+    #   "selectin" — jedno dodatkowe SELECT ... WHERE id IN (stopnie ze strony),
+    #   None       — leniwie (SELECT przy pierwszym użyciu każdego stopnia).
+    # Serializacja przez to_dict(DegreeLookup) nie dotyka relacji w ogóle.
+    DEGREE_LOADERS = {
+        "joined":   joinedload,
+        "selectin": selectinload,
+    }
+
+    @staticmethod
+    def _degree_options(degree_loading: Optional[str]) -> list:
+        if degree_loading is None:
+            return []
+        loader = HazardousRecordsService.DEGREE_LOADERS.get(degree_loading)
+        if loader is None:
+            raise ValueError(f"Nieznany tryb ładowania stopni: {degree_loading}")
+        return [loader(HazardousRecord.hazardous_degree)]
+
+    @staticmethod
+    def _with_degree_loading(query, degree_loading: Optional[str]):
+        options = HazardousRecordsService._degree_options(degree_loading)
+        return query.options(*options) if options else query
+
+    @staticmethod
+    def count_records_by_file(
+        db: Session,
+        file_id: int,
+        firefighter: str = None,
+        only_unassigned: bool = False,
+        only_eligible: bool = False,
+        date_from: str = None,
+        date_to: str = None,
+    ) -> int:
+        query = HazardousRecordsService._filtered_query(
+            db, file_id, firefighter, only_unassigned, only_eligible, date_from, date_to
+        )
+        return count_query(query, HazardousRecord)
+
+    # Kolumny rekordu pobierane przy eksporcie / generowaniu dokumentów
+    EXPORT_COLUMNS = [
+        "id", "file_id", "jednostka", "nazwisko_imie", "stopien", "data_przyjecia",
+        "p", "mz", "af", "nr_meldunku", "funkcja", "czas_od", "czas_do",
+        "czas_udzialu", "dodatek_szkodliwy", "stopien_szkodliwosci",
+        "aktualizowal_szkod", "data_aktualizacji_szkod", "opis_st_szkodliwosci",
+        "hazardous_degree_id",
+    ]
+
+    @staticmethod
+    def iter_records_by_file(
+        db: Session,
+        file_id: int,
+        firefighter: str = None,
+        only_unassigned: bool = False,
+        only_eligible: bool = False,
+        date_from: str = None,
+        date_to: str = None,
+        sort_by: str = None,
+        sort_order: str = "asc",
+        batch_size: int = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generator rekordów jako słowniki w kształcie to_dict() — eksport i dokumenty.
+        Jedno zapytanie z LEFT JOIN na hazardous_degrees, tylko kolumny
+        (bez obiektów ORM i leniwego ładowania stopnia dla każdego rekordu),
+        paczkami po EXPORT_BATCH_SIZE wierszy, bez limitu liczby rekordów.
+        """
+        query = HazardousRecordsService._export_query(
+            db, file_id, firefighter, only_unassigned, only_eligible, date_from, date_to,
+        )
 
         if sort_by:
             col = getattr(HazardousRecord, sort_by, None)
             if col is not None:
                 query = query.order_by(col.desc() if sort_order == "desc" else col.asc())
 
-        return query.offset(skip).limit(limit).all()
+        for row in query.yield_per(batch_size or settings.EXPORT_BATCH_SIZE):
+            yield HazardousRecordsService._export_record(row)
 
     @staticmethod
-    def count_records_by_file(
+    def iter_records_by_firefighter(
         db: Session,
         file_id: int,
-        firefighter: str = None,
+        firefighters: List[str] = None,
         only_unassigned: bool = False,
         only_eligible: bool = False,
         date_from: str = None,
         date_to: str = None,
-    ) -> int:
-        query = db.query(func.count(HazardousRecord.id)).filter(
-            HazardousRecord.file_id == file_id
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Rekordy pogrupowane po strażaku — (nazwisko_imie, rekordy jak z iter_records_by_file).
+        Jedno zapytanie dla wszystkich strażaków (zestawienia zbiorcze).
+        firefighters: tylko wybrani strażacy (None — wszyscy z pliku)
+        """
+        query = HazardousRecordsService._export_query(
+            db, file_id, None, only_unassigned, only_eligible, date_from, date_to,
         )
-        if firefighter:
-            query = query.filter(HazardousRecord.nazwisko_imie == firefighter)
-        if only_unassigned:
-            query = query.filter(HazardousRecord.hazardous_degree_id == None)
-        if only_eligible:
-            from sqlalchemy import or_
-            query = query.filter(
-                or_(HazardousRecord.af != "1", HazardousRecord.af == None),
-                HazardousRecord.czas_udzialu > "00:30",
+        if firefighters:
+            query = query.filter(HazardousRecord.nazwisko_imie.in_(firefighters))
+        query = query.order_by(HazardousRecord.nazwisko_imie, HazardousRecord.czas_od_ts, HazardousRecord.id)
+
+        records = map(HazardousRecordsService._export_record, query.yield_per(settings.EXPORT_BATCH_SIZE))
+        for name, group in groupby(records, key=itemgetter("nazwisko_imie")):
+            if name:
+                yield name, list(group)
+
+    @staticmethod
+    def _export_query(db: Session, file_id: int, firefighter, only_unassigned, only_eligible, date_from, date_to):
+        """Kolumny EXPORT_COLUMNS + stopień szkodliwości (LEFT JOIN) z filtrami listy"""
+        columns = [getattr(HazardousRecord, name) for name in HazardousRecordsService.EXPORT_COLUMNS]
+        return (
+            HazardousRecordsService._filtered_query(
+                db, file_id, firefighter, only_unassigned, only_eligible, date_from, date_to,
+                entities=[
+                    *columns,
+                    HazardousDegree.stopien.label("degree_stopien"),
+                    HazardousDegree.punkt.label("degree_punkt"),
+                    HazardousDegree.opis.label("degree_opis"),
+                    HazardousDegree.uwagi.label("degree_uwagi"),
+                ],
             )
-        if date_from:
-            query = query.filter(HazardousRecord.czas_od >= date_from)
-        if date_to:
-            date_to_end = f"{date_to} 23:59:59"
-            query = query.filter(HazardousRecord.czas_od <= date_to_end)
-        return query.scalar()
+            .outerjoin(HazardousDegree, HazardousRecord.hazardous_degree_id == HazardousDegree.id)
+        )
+
+    @staticmethod
+    def _export_record(row) -> Dict[str, Any]:
+        """Wiersz _export_query → słownik w kształcie to_dict()"""
+        record = row._asdict()
+        stopien = record.pop("degree_stopien")
+        punkt   = record.pop("degree_punkt")
+        opis    = record.pop("degree_opis")
+        uwagi   = record.pop("degree_uwagi")
+        record["hazardous_degree"] = {
+            "id":            record["hazardous_degree_id"],
+            "stopien":       stopien,
+            "punkt":         punkt,
+            "stopien_punkt": f"{stopien}.{punkt}",
+            "opis":          opis,
+            "uwagi":         uwagi,
+        } if record["hazardous_degree_id"] is not None and stopien is not None else None
+        return record
 
     @staticmethod
     def get_record_by_id(db: Session, record_id: int) -> Optional[HazardousRecord]:
@@ -221,6 +452,105 @@ class HazardousRecordsService:
             db.rollback()
             raise
 
+    # Tabela konwerterów kolumn dla bulk_create_records — budowana raz przy imporcie modułu.
+    # (pole ModelZestawienieWiersz == kolumna hazardous_records, getter, konwerter)
+    BULK_CONVERTERS = [
+        (field, attrgetter(field), _str_or_none)
+        for field in (
+            "jednostka", "nazwisko_imie", "stopien", "data_przyjecia",
+            "p", "mz", "af", "nr_meldunku", "funkcja",
+            "czas_od", "czas_do", "czas_udzialu",
+            "dodatek_szkodliwy", "stopien_szkodliwosci",
+            "aktualizowal_szkod", "data_aktualizacji_szkod", "opis_st_szkodliwosci",
+        )
+    ] + [
+        # Kolumny liczbowe (migracje 009, 010) — z tych samych pól importu
+        ("czas_od_ts", attrgetter("czas_od"), parse_timestamp),
+        ("czas_do_ts", attrgetter("czas_do"), parse_timestamp),
+        ("czas_udzialu_min", attrgetter("czas_udzialu"), parse_duration_minutes),
+    ]
+
+    # Indeksy z migracji 003, 009 i 010 — przy dużym imporcie taniej przebudować je raz na końcu
+    BULK_DEFERRABLE_INDEXES = [
+        "ix_hazardous_records_file_id",
+        "ix_hazardous_records_nazwisko",
+        "ix_hazardous_records_degree",
+        "ix_hazardous_records_file_czas_od_ts",
+        "ix_hazardous_records_eligible",
+    ]
+
+    @staticmethod
+    def bulk_create_records(
+        db: Session,
+        file_id: int,
+        records_data,
+        chunk_size: int = None,
+        defer_indexes: bool = False,
+        on_progress=None,
+    ) -> dict:
+        """
+        Kolumnowy masowy import z CollectionZestawienieWiersz.
+        Każda kolumna paczki konwertowana jest jednym przebiegiem map() wg BULK_CONVERTERS,
+        a paczki zapisywane są jednym przygotowanym INSERT (executemany).
+        defer_indexes=True — indeksy hazardous_records odtwarzane dopiero po imporcie.
+        """
+        from services.bulk_insert_service import BulkInsertService
+
+        converters = HazardousRecordsService.BULK_CONVERTERS
+        columns = ["file_id"] + [field for field, _, _ in converters]
+        inserter = BulkInsertService(HazardousRecord.__table__, columns, chunk_size)
+        items = records_data.items
+
+        def iter_rows():
+            for start in range(0, len(items), inserter.chunk_size):
+                part = items[start:start + inserter.chunk_size]
+                converted = [map(convert, map(getter, part)) for _, getter, convert in converters]
+                yield from zip(repeat(file_id), *converted)
+
+        try:
+            print(f"[HAZARDOUS SERVICE] Masowy import {len(items)} rekordów "
+                  f"(paczki po {inserter.chunk_size}, odłożone indeksy: {defer_indexes})")
+            if defer_indexes:
+                with inserter.deferred_indexes(db, HazardousRecordsService.BULK_DEFERRABLE_INDEXES):
+                    stats = inserter.insert(db, iter_rows(), on_progress)
+            else:
+                stats = inserter.insert(db, iter_rows(), on_progress)
+            db.commit()
+            RecordCountCache.invalidate(file_id)
+            print(f"[HAZARDOUS SERVICE] Utworzono {stats['created_count']} rekordów "
+                  f"({stats['rows_per_second']} wierszy/s)")
+            return stats
+        except Exception as e:
+            print(f"[HAZARDOUS SERVICE] Błąd masowego importu: {e}")
+            db.rollback()
+            raise
+
+    @staticmethod
+    def clone_file_records(db: Session, source_file_id: int, target_file_id: int) -> int:
+        """
+        Wzorzec jak DataService.clone_file_records — INSERT ... SELECT pól z importu.
+        hazardous_degree_id nie jest kopiowany: jak po zwykłym imporcie,
+        stopnie przypisuje użytkownik.
+        """
+        columns = [field for field, _, _ in HazardousRecordsService.BULK_CONVERTERS]
+        source = select(
+            literal(target_file_id),
+            *[getattr(HazardousRecord, c) for c in columns],
+        ).where(HazardousRecord.file_id == source_file_id)
+
+        try:
+            result = db.execute(
+                insert(HazardousRecord.__table__).from_select(["file_id"] + columns, source)
+            )
+            db.commit()
+            RecordCountCache.invalidate(target_file_id)
+            print(f"[HAZARDOUS SERVICE] Skopiowano {result.rowcount} rekordów z pliku {source_file_id} do {target_file_id}")
+            return result.rowcount
+        except Exception as e:
+            print(f"[HAZARDOUS SERVICE] Błąd kopiowania rekordów: {e}")
+            db.rollback()
+            raise
+
     @staticmethod
     def update_record(db: Session, record_id: int, update_data: dict) -> Optional[HazardousRecord]:
         """Identyczna metoda jak DataService.update_record"""
@@ -0,0 +1,282 @@
+"""
+backend/services/import_job_service.py
+
+Import plików Excel w tle.
+Upload zapisuje plik i od razu zwraca job_id — parsowanie (zestawienie_swd)
+i masowy zapis rekordów wykonuje pula wątków. Postęp dostępny przez
+GET /api/jobs/{id}: rows_parsed, rows_inserted, rows_per_second, eta_seconds.
+
+Postęp bieżący trzymany jest w pamięci (_progress): transakcja importu trzyma
+blokadę zapisu SQLite, więc aktualizacja tabeli jobs po każdej paczce z innego
+połączenia czekałaby na koniec importu. Tabela jobs zapisywana jest przy
+zmianach stanu (queued → processing → completed / failed).
+Zadania przerwane zamknięciem aplikacji oznaczane są przy starcie jako
+failed (fail_interrupted) — pula wątków nie przeżywa restartu.
+"""
+from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any
+from datetime import datetime
+from pathlib import Path
+import threading
+import time
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import settings
+from database import SessionLocal
+from models.swd_data import ImportJob, ImportedFile
+
+
+class ImportJobService:
+    """Kolejka zadań importu (wątki w procesie aplikacji)"""
+
+    _executor = ThreadPoolExecutor(
+        max_workers=settings.IMPORT_WORKERS,
+        thread_name_prefix="import-job",
+    )
+    _progress: Dict[int, Dict[str, Any]] = {}
+    _lock = threading.Lock()
+
+    # ── API ──────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def submit(
+        db: Session,
+        job_type: str,
+        file_path: Path,
+        filename: str,
+        original_filename: str,
+        keep_file: bool = True,
+        options: Dict[str, Any] = None,
+        content_hash: str = None,
+    ) -> ImportJob:
+        """
+        Utwórz zadanie (status "queued") i przekaż je do puli wątków.
+        job_type: "departures" | "hazardous"
+        keep_file: False — usuń plik z uploads po imporcie (Dodatek Szkodliwy)
+        options: dodatkowe argumenty bulk_create_records (np. defer_indexes)
+        content_hash: SHA-256 pliku zapisywany w ImportedFile
+        """
+        job = ImportJob(
+            job_type=job_type,
+            status="queued",
+            original_filename=original_filename,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        with ImportJobService._lock:
+            ImportJobService._progress[job.id] = {
+                "rows_parsed": 0,
+                "rows_inserted": 0,
+                "insert_started": None,
+            }
+
+        ImportJobService._executor.submit(
+            ImportJobService._run,
+            job.id, job_type, Path(file_path), filename, original_filename,
+            keep_file, options or {}, content_hash,
+        )
+        print(f"[IMPORT JOB] Zadanie {job.id} ({job_type}) w kolejce: {original_filename}")
+        return job
+
+    @staticmethod
+    def instant_import(
+        db: Session,
+        job_type: str,
+        source_file: ImportedFile,
+        file_path: Path,
+        filename: str,
+        original_filename: str,
+        content_hash: str,
+    ) -> Dict[str, Any]:
+        """
+        Import natychmiastowy ponownie wgranego pliku: nowy ImportedFile
+        i kopia rekordów pliku o tej samej treści (INSERT ... SELECT),
+        bez ponownego parsowania przez zestawienie_swd.
+        file_path: zapisany upload tego żądania — nowy rekord nie wskazuje na
+                   plik source_file (usunięcie jednego nie psuje drugiego)
+        """
+        service = ImportJobService._get_service(job_type)
+        start = time.perf_counter()
+
+        file_record = service.create_file_record(
+            db,
+            filename=filename,
+            original_filename=original_filename,
+            file_path=str(file_path),
+            rows_count=source_file.rows_count,
+            status="processing",
+            content_hash=content_hash,
+        )
+        try:
+            created = service.clone_file_records(db, source_file.id, file_record.id)
+        except Exception:
+            file_record.status = "failed"
+            db.commit()
+            raise
+
+        file_record.status = "completed"
+        file_record.rows_count = created
+        db.commit()
+
+        elapsed = time.perf_counter() - start
+        print(f"[IMPORT JOB] Import natychmiastowy {original_filename}: {created} rekordów z pliku {source_file.id}")
+        return {
+            "file_id":         file_record.id,
+            "created_count":   created,
+            "rows_per_second": round(created / elapsed) if elapsed > 0 else created,
+        }
+
+    @staticmethod
+    def fail_interrupted(db: Session) -> int:
+        """
+        Przy starcie aplikacji: zadania queued / processing z poprzedniego
+        uruchomienia nie mają już wątku — oznacz je (i ich pliki w stanie
+        "processing") jako failed. Zwraca liczbę oznaczonych zadań.
+        """
+        jobs = db.query(ImportJob).filter(ImportJob.status.in_(("queued", "processing"))).all()
+        if not jobs:
+            return 0
+
+        now = datetime.utcnow()
+        for job in jobs:
+            job.status = "failed"
+            job.error = "Import przerwany — aplikacja została zamknięta przed jego zakończeniem"
+            job.finished_at = now
+
+        file_ids = [job.file_id for job in jobs if job.file_id is not None]
+        if file_ids:
+            db.query(ImportedFile).filter(
+                ImportedFile.id.in_(file_ids),
+                ImportedFile.status == "processing",
+            ).update({ImportedFile.status: "failed"}, synchronize_session=False)
+        db.commit()
+
+        print(f"[IMPORT JOB] Przerwane zadania oznaczone jako failed: {[job.id for job in jobs]}")
+        return len(jobs)
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[Dict[str, Any]]:
+        """Stan zadania z bazy uzupełniony o bieżący postęp, przepustowość i ETA"""
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+        if not job:
+            return None
+
+        result = job.to_dict()
+        result["eta_seconds"] = None
+
+        with ImportJobService._lock:
+            progress = dict(ImportJobService._progress.get(job_id) or {})
+
+        if progress and job.status in ("queued", "processing"):
+            result["rows_parsed"] = max(result["rows_parsed"], progress["rows_parsed"])
+            result["rows_inserted"] = progress["rows_inserted"]
+
+            if progress["insert_started"] and progress["rows_inserted"]:
+                elapsed = time.perf_counter() - progress["insert_started"]
+                rate = progress["rows_inserted"] / elapsed if elapsed > 0 else 0
+                result["rows_per_second"] = round(rate)
+                if rate > 0:
+                    remaining = max(result["rows_parsed"] - progress["rows_inserted"], 0)
+                    result["eta_seconds"] = round(remaining / rate, 1)
+        elif job.status == "completed":
+            result["eta_seconds"] = 0
+
+        return result
+
+    # ── Wykonanie ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _set_progress(job_id: int, **values):
+        with ImportJobService._lock:
+            ImportJobService._progress.setdefault(job_id, {}).update(values)
+
+    @staticmethod
+    def _get_service(job_type: str):
+        if job_type == "hazardous":
+            from services.hazardous_records_service import HazardousRecordsService
+            return HazardousRecordsService
+        from services.data_service import DataService
+        return DataService
+
+    @staticmethod
+    def _run(job_id: int, job_type: str, file_path: Path, filename: str,
+             original_filename: str, keep_file: bool, options: Dict[str, Any],
+             content_hash: str = None):
+        """Wykonanie zadania w wątku puli — własna sesja bazy"""
+        from services.excel_processor import ExcelProcessor
+
+        db = SessionLocal()
+        file_record = None
+        succeeded = False
+        try:
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            job.status = "processing"
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            # KROK 1: Parsowanie pliku
+            records_data = ExcelProcessor().process_excel_file(file_path)
+            if not records_data or not hasattr(records_data, "items") or len(records_data.items) == 0:
+                raise ValueError("Nie znaleziono danych w pliku")
+
+            rows_parsed = len(records_data.items)
+            ImportJobService._set_progress(job_id, rows_parsed=rows_parsed)
+
+            # KROK 2: Rekord pliku — widoczny na liście jako "processing"
+            service = ImportJobService._get_service(job_type)
+            file_record = service.create_file_record(
+                db,
+                filename=filename,
+                original_filename=original_filename,
+                file_path=str(file_path),
+                rows_count=rows_parsed,
+                status="processing",
+                content_hash=content_hash,
+            )
+            job.file_id = file_record.id
+            job.rows_parsed = rows_parsed
+            db.commit()
+
+            # KROK 3: Masowy zapis z raportowaniem postępu po każdej paczce
+            ImportJobService._set_progress(job_id, insert_started=time.perf_counter())
+            stats = service.bulk_create_records(
+                db, file_record.id, records_data,
+                on_progress=lambda count: ImportJobService._set_progress(job_id, rows_inserted=count),
+                **options,
+            )
+
+            file_record.status = "completed"
+            job.status = "completed"
+            job.rows_inserted = stats["created_count"]
+            job.rows_per_second = stats["rows_per_second"]
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            succeeded = True
+            print(f"[IMPORT JOB] Zadanie {job_id} zakończone: {stats['created_count']} rekordów")
+
+        except Exception as e:
+            print(f"[IMPORT JOB] Zadanie {job_id} BŁĄD: {e}")
+            db.rollback()
+            try:
+                job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+                job.status = "failed"
+                job.error = str(e)
+                job.finished_at = datetime.utcnow()
+                if file_record is not None:
+                    failed_file = db.query(ImportedFile).filter(ImportedFile.id == file_record.id).first()
+                    if failed_file:
+                        failed_file.status = "failed"
+                db.commit()
+            except Exception as inner:
+                print(f"[IMPORT JOB] Nie udało się zapisać stanu zadania {job_id}: {inner}")
+                db.rollback()
+        finally:
+            db.close()
+            with ImportJobService._lock:
+                ImportJobService._progress.pop(job_id, None)
+            if (not keep_file or not succeeded) and file_path.exists():
+                file_path.unlink()
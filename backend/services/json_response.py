@@ -0,0 +1,100 @@
+"""
+backend/services/json_response.py
+
+Szybka ścieżka JSON dla list rekordów.
+
+Zwykła odpowiedź FastAPI (zwrócony słownik) przechodzi przez jsonable_encoder
+— rekurencyjne kopiowanie każdej wartości — a potem przez json.dumps.
+Przy limit=1000 to większa część czasu żądania niż samo zapytanie.
+
+FastJSONResponse koduje treść od razu: orjson (gdy zainstalowany — datetime
+natywnie, w formacie isoformat()), w przeciwnym razie json z biblioteki
+standardowej. Lista budowana z wierszy kolumn (fetch_page(columns=...))
+przez rows_to_dicts — bez obiektów ORM i bez to_dict() na rekord.
+
+Z accept_encoding (nagłówek Accept-Encoding żądania) treść jest od razu
+kompresowana: brotli (gdy zainstalowany), inaczej gzip. Odpowiedź
+z Content-Encoding nie jest kompresowana drugi raz przez GZipMiddleware.
+"""
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional, Sequence
+import gzip
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Mniejszych odpowiedzi nie opłaca się kompresować (jak minimum_size GZipMiddleware)
+COMPRESS_MIN_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5   # 5-6: blisko maksymalnej kompresji przy czasie porównywalnym z gzip
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """Kodowania z nagłówka Accept-Encoding (bez wyłączonych przez q=0)"""
+    encodings = []
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip() and quality > 0:
+            encodings.append(name.strip().lower())
+    return encodings
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Typ {type(value).__name__} nie jest serializowalny do JSON")
+
+
+class FastJSONResponse(JSONResponse):
+    """Odpowiedź JSON bez jsonable_encoder (orjson albo json), opcjonalnie skompresowana"""
+
+    def __init__(self, content: Any, accept_encoding: Optional[str] = None, **kwargs):
+        super().__init__(content, **kwargs)
+        if accept_encoding and len(self.body) >= COMPRESS_MIN_SIZE:
+            self._compress(accepted_encodings(accept_encoding))
+
+    def _compress(self, encodings: List[str]):
+        if brotli is not None and "br" in encodings:
+            body, encoding = brotli.compress(self.body, quality=BROTLI_QUALITY), "br"
+        elif "gzip" in encodings:
+            body, encoding = gzip.compress(self.body, compresslevel=GZIP_LEVEL), "gzip"
+        else:
+            return
+        self.body = body
+        self.headers["Content-Length"] = str(len(body))
+        self.headers["Content-Encoding"] = encoding
+        self.headers.add_vary_header("Accept-Encoding")
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_default
+        ).encode("utf-8")
+
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], keys: List[str]) -> List[dict]:
+    """
+    Wiersze kolumn → słowniki {klucz: wartość}.
+    Wiersz może mieć więcej kolumn niż kluczy (kolumna sortowania, total_count)
+    — nadmiarowe są pomijane.
+    """
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,104 @@
+"""
+backend/services/keyset_pagination.py
+
+Stronicowanie kursorem (keyset) list rekordów.
+Zamiast OFFSET (SQLite musi przejść i odrzucić wszystkie pominięte wiersze)
+kolejna strona zaczyna się za ostatnim rekordem poprzedniej:
+    WHERE (kolumna_sortowania, id) > (:wartość, :id) ORDER BY kolumna_sortowania, id
+Kursor (next_cursor w odpowiedzi) to nieprzezroczysty token base64 z wartością
+sortowania i id ostatniego rekordu oraz sortowaniem, dla którego został wydany.
+
+Kolejność NULL jak w SQLite: na początku przy ASC, na końcu przy DESC.
+"""
+from datetime import date, datetime
+from typing import Any, Optional, Sequence
+import base64
+import json
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursorError(ValueError):
+    """Kursor uszkodzony albo wydany dla innego sortowania"""
+
+
+def sort_column(model, sort_by: Optional[str]):
+    """Kolumna sortowania modelu (tylko kolumny tabeli — inaczej sortowanie po id)"""
+    if sort_by and sort_by in model.__table__.columns and sort_by != "id":
+        return getattr(model, sort_by)
+    return None
+
+
+def apply_order(query, model, sort_by: Optional[str], sort_order: str = "asc"):
+    """ORDER BY kolumna sortowania + id (jednoznaczna kolejność dla kursora i OFFSET)"""
+    column = sort_column(model, sort_by)
+    descending = sort_order == "desc"
+    if column is not None:
+        query = query.order_by(column.desc() if descending else column.asc())
+    return query.order_by(model.id.desc() if descending else model.id.asc())
+
+
+def apply_cursor(query, model, cursor: str, sort_by: Optional[str], sort_order: str = "asc"):
+    """Filtr WHERE zaczynający stronę za rekordem zapisanym w kursorze"""
+    column = sort_column(model, sort_by)
+    value, last_id = decode_cursor(cursor, column, sort_by, sort_order)
+    descending = sort_order == "desc"
+
+    after_id = model.id < last_id if descending else model.id > last_id
+    if column is None:
+        return query.filter(after_id)
+
+    if value is None:
+        if descending:
+            # NULL na końcu — dalej tylko pozostałe NULL
+            return query.filter(column.is_(None), after_id)
+        # NULL na początku — pozostałe NULL, potem wszystkie wartości
+        return query.filter(or_(and_(column.is_(None), after_id), column.isnot(None)))
+
+    if descending:
+        return query.filter(or_(column < value, and_(column == value, after_id), column.is_(None)))
+    return query.filter(or_(column > value, and_(column == value, after_id)))
+
+
+def next_cursor(records: Sequence[Any], limit: int, model,
+                sort_by: Optional[str], sort_order: str = "asc") -> Optional[str]:
+    """Kursor następnej strony (None, gdy strona niepełna — koniec listy)"""
+    if not records or len(records) < limit:
+        return None
+    last = records[-1]
+    column = sort_column(model, sort_by)
+    value = getattr(last, column.key) if column is not None else None
+    return encode_cursor(sort_by if column is not None else None, sort_order, value, last.id)
+
+
+def encode_cursor(sort_by: Optional[str], sort_order: str, value: Any, last_id: int) -> str:
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, sort_order, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, column, sort_by: Optional[str], sort_order: str):
+    """(wartość sortowania, id) z kursora — sprawdza zgodność sortowania"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, cursor_order, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        last_id = int(last_id)
+    except Exception:
+        raise InvalidCursorError("Nieprawidłowy kursor stronicowania")
+
+    expected_sort_by = sort_by if column is not None else None
+    if cursor_sort_by != expected_sort_by or cursor_order != sort_order:
+        raise InvalidCursorError("Kursor wydany dla innego sortowania — zacznij od pierwszej strony")
+
+    if value is not None and column is not None:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+        if python_type in (datetime, date):
+            try:
+                value = python_type.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise InvalidCursorError("Nieprawidłowy kursor stronicowania")
+    return value, last_id
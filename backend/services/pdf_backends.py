@@ -0,0 +1,347 @@
+"""
+backend/services/pdf_backends.py
+
+Wymienne renderery PDF dokumentów.
+
+Renderer dostaje nazwę szablonu HTML i jego kontekst (te same dane co
+generate_html) i zwraca PDF:
+  - xhtml2pdf (domyślny) — szablon HTML → pisa.CreatePDF; dowolny
+    szablon, ale parsowanie HTML/CSS i układ w xhtml2pdf to sekundy
+    przy długich kartach,
+  - reportlab — karta wyjazdów składana bezpośrednio z platypus
+    (bez HTML), ten sam układ strony co karta_wyjazdow.html.
+Renderer wybiera settings.PDF_BACKEND albo argument generate_pdf;
+szablony nieobsługiwane przez wybrany renderer idą przez xhtml2pdf.
+"""
+from abc import ABC, abstractmethod
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape
+import os
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import settings
+from services.template_registry import TemplateRegistry
+
+
+class PdfBackend(ABC):
+    """Renderer PDF z kontekstu szablonu HTML"""
+
+    name = ""
+
+    def supports(self, template_name: str) -> bool:
+        return True
+
+    @abstractmethod
+    def render(self, template_name: str, context: Dict[str, Any]) -> BytesIO:
+        """PDF z szablonu template_name i jego kontekstu (ustawiony na początek)"""
+
+
+class XhtmlPdfBackend(PdfBackend):
+    """Szablon HTML → xhtml2pdf"""
+
+    name = "xhtml2pdf"
+
+    def render(self, template_name: str, context: Dict[str, Any]) -> BytesIO:
+        from xhtml2pdf import pisa
+
+        html_content = TemplateRegistry.get_template(template_name).render(**context)
+        output = BytesIO()
+        pisa_status = pisa.CreatePDF(html_content, dest=output, encoding='utf-8')
+        if pisa_status.err:
+            raise Exception(f"Błąd generowania PDF: {pisa_status.err}")
+        output.seek(0)
+        return output
+
+
+# ── reportlab ────────────────────────────────────────────────────────────────
+
+# Czcionki z polskimi znakami (Helvetica z reportlab ich nie ma) — (zwykła, pogrubiona,
+# kursywa), pierwsza znaleziona; kursywa opcjonalna. Bez żadnej z nich renderer
+# reportlab zgłasza błąd
+FONT_CANDIDATES = [
+    # Windows
+    (Path(os.environ.get("WINDIR", r"C:\Windows")) / "Fonts", ("arial.ttf", "arialbd.ttf", "ariali.ttf")),
+    # Linux
+    (Path("/usr/share/fonts/truetype/liberation"),
+     ("LiberationSans-Regular.ttf", "LiberationSans-Bold.ttf", "LiberationSans-Italic.ttf")),
+    (Path("/usr/share/fonts/truetype/dejavu"),
+     ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf", "DejaVuSans-Oblique.ttf")),
+]
+
+
+class ReportlabPdfBackend(PdfBackend):
+    """Karta wyjazdów składana w reportlab (platypus) — układ jak karta_wyjazdow.html"""
+
+    name = "reportlab"
+    TEMPLATES = {"karta_wyjazdow.html"}
+
+    MARGIN_CM = 1.5
+    GREY = "#666666"
+    HEADER_FILL = "#d3d3d3"
+
+    # Tabela główna — szerokości kolumn (%) jak w karta_wyjazdow.html
+    COLUMN_WIDTHS = [2, 10, 13, 11, 11, 11, 12, 30]
+    RECORD_FIELDS = [
+        "lp", "data", "rodzaj_zagrozenia", "zadanie_podstawowe",
+        "zadanie_specjalistyczne", "kierowanie", "nr_meldunku",
+    ]
+
+    def __init__(self):
+        self._fonts: Optional[tuple] = None
+        self._styles: Optional[Dict[str, Any]] = None
+
+    def supports(self, template_name: str) -> bool:
+        return template_name in self.TEMPLATES
+
+    def _register_fonts(self) -> tuple:
+        """(zwykła, pogrubiona, kursywa) — rejestrowane raz na proces"""
+        if self._fonts is None:
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+
+            for directory, files in FONT_CANDIDATES:
+                regular, bold, italic = (directory / name for name in files)
+                if not (regular.exists() and bold.exists()):
+                    continue
+                # Bez pliku kursywy (np. fonts-dejavu-core) — kursywa zwykłą czcionką
+                if not italic.exists():
+                    italic = regular
+                names = tuple(f"Karta-{style}" for style in ("Regular", "Bold", "Italic"))
+                for name, path in zip(names, (regular, bold, italic)):
+                    pdfmetrics.registerFont(TTFont(name, str(path)))
+                self._fonts = names
+                break
+            else:
+                # Helvetica zamieniłaby polskie znaki na czarne kwadraty — lepiej błąd niż zły dokument
+                searched = ", ".join(str(directory) for directory, _ in FONT_CANDIDATES)
+                print(f"❌ [PDF] Brak czcionki TTF z polskimi znakami (szukano w: {searched})")
+                raise RuntimeError(
+                    "Renderer PDF reportlab wymaga czcionki TTF z polskimi znakami "
+                    f"(Arial, Liberation Sans lub DejaVu Sans; szukano w: {searched}). "
+                    f"Zainstaluj czcionkę albo ustaw PDF_BACKEND = \"{XhtmlPdfBackend.name}\"."
+                )
+        return self._fonts
+
+    def _get_styles(self) -> Dict[str, Any]:
+        if self._styles is None:
+            from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+            from reportlab.lib.styles import ParagraphStyle
+
+            regular, bold, italic = self._register_fonts()
+            self._styles = {
+                "title":      ParagraphStyle("title", fontName=bold, fontSize=11, leading=13, alignment=TA_CENTER),
+                "date_range": ParagraphStyle("date_range", fontName=regular, fontSize=10, leading=13,
+                                             alignment=TA_CENTER, spaceBefore=3, spaceAfter=3),
+                "info":       ParagraphStyle("info", fontName=regular, fontSize=10, leading=13, alignment=TA_CENTER),
+                "info_left":  ParagraphStyle("info_left", fontName=regular, fontSize=10, leading=13, alignment=TA_LEFT),
+                "label":      ParagraphStyle("label", fontName=italic, fontSize=8, leading=10,
+                                             alignment=TA_CENTER, textColor=self.GREY, spaceAfter=6),
+                "label_left": ParagraphStyle("label_left", fontName=italic, fontSize=8, leading=10,
+                                             alignment=TA_LEFT, textColor=self.GREY),
+                "page":       ParagraphStyle("page", fontName=regular, fontSize=9, leading=11, alignment=TA_RIGHT),
+                "th":         ParagraphStyle("th", fontName=bold, fontSize=7, leading=8.5, alignment=TA_CENTER),
+                "td":         ParagraphStyle("td", fontName=regular, fontSize=7, leading=8.5, alignment=TA_CENTER),
+                "small":      ParagraphStyle("small", fontName=regular, fontSize=7, leading=8.5),
+                "small_note": ParagraphStyle("small_note", fontName=italic, fontSize=7, leading=8.5,
+                                             alignment=TA_CENTER, textColor=self.GREY),
+                "desc_title": ParagraphStyle("desc_title", fontName=bold, fontSize=7, leading=8.5,
+                                             spaceBefore=5, spaceAfter=5),
+            }
+        return self._styles
+
+    def render(self, template_name: str, context: Dict[str, Any]) -> BytesIO:
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.lib.units import cm
+        from reportlab.platypus import PageBreak, SimpleDocTemplate
+
+        output = BytesIO()
+        margin = self.MARGIN_CM * cm
+        doc = SimpleDocTemplate(
+            output, pagesize=landscape(A4),
+            leftMargin=margin, rightMargin=margin, topMargin=margin, bottomMargin=margin,
+            title=f"Karta Ewidencyjna Wyjazdów - {context.get('firefighter_name', '')}",
+        )
+
+        story: List[Any] = []
+        pages = context["pages"] or [{"page_number": 1, "records": [], "is_last_page": True}]
+        for page in pages:
+            story.extend(self._page(page, context, doc.width))
+            if not page["is_last_page"]:
+                story.append(PageBreak())
+
+        doc.build(story)
+        output.seek(0)
+        return output
+
+    def _page(self, page: Dict[str, Any], context: Dict[str, Any], width: float) -> List[Any]:
+        from reportlab.platypus import Paragraph
+
+        styles = self._get_styles()
+        person = escape(f"{context['stopien']} {context['nazwisko_imie']} - {context['stanowisko']}")
+        flowables = []
+
+        if page["page_number"] == 1:
+            flowables.append(self._first_page_header(page["page_number"], width))
+            flowables.append(Paragraph(
+                "Roczna karta ewidencji bezpośredniego udziału strażaka w działaniach ratowniczych,<br/>"
+                "w tym ratowniczo-gaśniczych lub bezpośredniego kierowania tymi działaniami "
+                "na miejscu zdarzenia",
+                styles["title"],
+            ))
+            flowables.append(Paragraph(
+                escape(f"od {context['date_from']} do {context['date_to']}"), styles["date_range"]
+            ))
+            flowables.append(Paragraph(person, styles["info"]))
+            flowables.append(Paragraph("(stopień, tytuł, imię, nazwisko, stanowisko)", styles["label"]))
+        else:
+            flowables.append(self._next_page_header(person, page["page_number"], width))
+
+        flowables.append(self._records_table(page["records"], width))
+        flowables.append(self._signatures_table(width))
+        flowables.append(Paragraph("Objaśnienia:", styles["desc_title"]))
+        flowables.append(Paragraph("* - wpisać znak X", styles["small"]))
+        flowables.append(Paragraph(
+            "** - dotyczy udziału w działaniach ratowniczych w ramach Specjalistycznych grup roboczych",
+            styles["small"],
+        ))
+        return flowables
+
+    def _first_page_header(self, page_number: int, width: float):
+        from reportlab.lib import colors
+        from reportlab.platypus import Paragraph, Table, TableStyle
+
+        styles = self._get_styles()
+        table = Table(
+            [
+                ["", "", ""],
+                [Paragraph("(pieczątka jednostki organizacyjnej)", styles["label"]), "",
+                 Paragraph(f"Strona nr {page_number}", styles["page"])],
+            ],
+            colWidths=[width * 0.25, width * 0.5, width * 0.25],
+            rowHeights=[14, None],
+        )
+        table.setStyle(TableStyle([
+            ("LINEBELOW", (0, 0), (0, 0), 0.75, colors.black, None, (1, 2)),
+            ("VALIGN", (0, 0), (-1, -1), "BOTTOM"),
+        ]))
+        return table
+
+    def _next_page_header(self, person: str, page_number: int, width: float):
+        from reportlab.platypus import Paragraph, Table, TableStyle
+
+        styles = self._get_styles()
+        table = Table(
+            [[[Paragraph(person, styles["info_left"]),
+               Paragraph("(stopień, tytuł, imię, nazwisko, stanowisko)", styles["label_left"])],
+              Paragraph(f"Strona nr {page_number}", styles["page"])]],
+            colWidths=[width * 0.8, width * 0.2],
+        )
+        table.setStyle(TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 0),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+        ]))
+        return table
+
+    def _records_table(self, records: List[Dict[str, Any]], width: float):
+        from reportlab.lib import colors
+        from reportlab.platypus import Paragraph, Table, TableStyle
+
+        styles = self._get_styles()
+        th = lambda text: Paragraph(text, styles["th"])
+        header = [
+            [th("Lp."), th("Data"), th("Rodzaj zagrożenia (pożar, m. zagrożenie)"),
+             th("Wykonywanie zadań*"), "", "", th("Nazwa dokumentu źródłowego"),
+             th("Podpis strażaka biorącego udział w działaniach ratowniczych, w tym "
+                "ratowniczo-gaśniczych lub bezpośrednio kierującego tymi działaniami "
+                "na miejscu zdarzenia")],
+            ["", "", "", th("Podstawowych"), th("Specjalistycznych**"),
+             th("Kierowanie działaniami ratowniczymi"), th("(nr meldunku - inf. ze zdarzenia)"), ""],
+        ]
+        rows = [
+            [Paragraph(escape(str(record.get(field) or "")), styles["td"]) for field in self.RECORD_FIELDS] + [""]
+            for record in records
+        ]
+
+        table = Table(
+            header + rows,
+            colWidths=[width * percent / 100 for percent in self.COLUMN_WIDTHS],
+            repeatRows=2,
+        )
+        table.setStyle(TableStyle([
+            ("GRID", (0, 0), (-1, -1), 0.75, colors.black),
+            ("BACKGROUND", (0, 0), (-1, 1), colors.HexColor(self.HEADER_FILL)),
+            ("SPAN", (0, 0), (0, 1)),
+            ("SPAN", (1, 0), (1, 1)),
+            ("SPAN", (2, 0), (2, 1)),
+            ("SPAN", (3, 0), (5, 0)),
+            ("SPAN", (7, 0), (7, 1)),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            # Wysokość pustych komórek (kolumna podpisu) jak wierszy z tekstem 7pt
+            ("FONTSIZE", (0, 0), (-1, -1), 7),
+            ("LEADING", (0, 0), (-1, -1), 8.5),
+            ("TOPPADDING", (0, 0), (-1, -1), 2),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ("LEFTPADDING", (0, 0), (-1, -1), 2),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 2),
+        ]))
+        return table
+
+    def _signatures_table(self, width: float):
+        from reportlab.lib import colors
+        from reportlab.platypus import Paragraph, Table, TableStyle
+
+        styles = self._get_styles()
+        note = lambda text: Paragraph(text, styles["small_note"])
+        table = Table(
+            [
+                ["", "", Paragraph("Sprawdził:", styles["small"]), "", Paragraph("Zatwierdził:", styles["small"])],
+                ["", "", "", "", ""],
+                [note("(miejscowość, data)"), "",
+                 note("(podpis i pieczątka kierownika komórki operacyjnej lub dowódcy "
+                      "jednostki ratowniczo-gaśniczej)"), "",
+                 note("(podpis i pieczątka kierownika jednostki organizacyjnej)")],
+            ],
+            colWidths=[width * 0.3, width * 0.05, width * 0.3, width * 0.05, width * 0.3],
+            rowHeights=[None, 40, None],
+        )
+        table.setStyle(TableStyle([
+            ("LINEBELOW", (0, 1), (0, 1), 0.75, colors.black, None, (1, 2)),
+            ("LINEBELOW", (2, 1), (2, 1), 0.75, colors.black, None, (1, 2)),
+            ("LINEBELOW", (4, 1), (4, 1), 0.75, colors.black, None, (1, 2)),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("FONTSIZE", (0, 0), (-1, -1), 7),
+            ("LEADING", (0, 0), (-1, -1), 8.5),
+            ("TOPPADDING", (0, 0), (-1, 0), 14),
+        ]))
+        return table
+
+
+PDF_BACKENDS = {
+    XhtmlPdfBackend.name: XhtmlPdfBackend,
+    ReportlabPdfBackend.name: ReportlabPdfBackend,
+}
+
+# Renderery utworzone w tym procesie (czcionki i style raz na proces)
+_instances: Dict[str, PdfBackend] = {}
+
+
+def get_pdf_backend(template_name: str, name: str = None) -> PdfBackend:
+    """
+    Renderer PDF dla szablonu: name albo settings.PDF_BACKEND;
+    gdy nie obsługuje szablonu — xhtml2pdf
+    """
+    name = name or settings.PDF_BACKEND
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Nieznany renderer PDF: {name}. Dostępne: {', '.join(PDF_BACKENDS)}")
+
+    backend = _instances.get(name)
+    if backend is None:
+        backend = _instances[name] = PDF_BACKENDS[name]()
+    if not backend.supports(template_name):
+        return get_pdf_backend(template_name, XhtmlPdfBackend.name)
+    return backend
@@ -0,0 +1,186 @@
+"""
+backend/services/record_listing.py
+
+Wspólne pobieranie strony listy rekordów razem z total_count.
+
+fetch_page() zwraca (rekordy strony, liczba wszystkich rekordów filtru):
+  - total z pamięci RecordCountCache → jedno zapytanie (sama strona),
+  - pierwsza strona filtru → jedno zapytanie: strona + kolumna total_count
+    (nieskorelowane podzapytanie COUNT z tymi samymi filtrami),
+  - strona kursorem bez zapamiętanego total → strona + osobny COUNT.
+Z columns strona zawiera wiersze (Row) tylko z podanymi kolumnami zamiast
+obiektów ORM — do szybkiej serializacji listy (services/json_response.py).
+
+COUNT(*) OVER () nie jest używane: SQLite materializuje dla okna wszystkie
+wiersze filtru przed LIMIT — przy 100 tys. rekordów ~25x wolniej niż
+podzapytanie liczone z indeksu.
+
+RecordCountCache trzyma total per (tabela, file_id, filtry) do czasu zmiany
+rekordów pliku: commit sesji ze zmienionymi rekordami ORM unieważnia plik
+automatycznie (zdarzenia sesji niżej), masowe operacje Core (bulk insert,
+klonowanie) wołają invalidate() jawnie.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.swd_data import SWDRecord, HazardousRecord, ImportedFile
+from services.keyset_pagination import apply_cursor, apply_order, sort_column
+
+
+class RecordCountCache:
+    """Pamięć total_count list rekordów, unieważniana per plik"""
+
+    _lock = threading.Lock()
+    _totals: Dict[Tuple, Tuple[int, float]] = {}   # klucz → (total, czas zapisu)
+    _generations: Dict[Tuple[str, int], int] = {}  # (tabela, file_id) → numer zmiany
+
+    @staticmethod
+    def get(table: str, file_id: int, filters: Tuple) -> Tuple[Optional[int], int]:
+        """(total albo None, generacja pliku) — generację przekazać do set()"""
+        now = time.monotonic()
+        with RecordCountCache._lock:
+            generation = RecordCountCache._generations.get((table, file_id), 0)
+            cached = RecordCountCache._totals.get((table, file_id, filters))
+            if cached is not None and now - cached[1] < settings.RECORD_COUNT_CACHE_TTL:
+                return cached[0], generation
+            return None, generation
+
+    @staticmethod
+    def set(table: str, file_id: int, filters: Tuple, total: int, generation: int):
+        """Zapamiętaj total — pomijane, gdy rekordy pliku zmieniły się w trakcie liczenia"""
+        with RecordCountCache._lock:
+            if RecordCountCache._generations.get((table, file_id), 0) != generation:
+                return
+            RecordCountCache._totals[(table, file_id, filters)] = (total, time.monotonic())
+
+    @staticmethod
+    def invalidate(file_id: int, table: str = None):
+        """Rekordy pliku zmienione — usuń zapamiętane totale (wszystkich tabel, gdy table=None)"""
+        tables = (table,) if table else (SWDRecord.__tablename__, HazardousRecord.__tablename__)
+        with RecordCountCache._lock:
+            for name in tables:
+                key = (name, file_id)
+                RecordCountCache._generations[key] = RecordCountCache._generations.get(key, 0) + 1
+            RecordCountCache._totals = {
+                k: v for k, v in RecordCountCache._totals.items()
+                if not (k[1] == file_id and k[0] in tables)
+            }
+
+    @staticmethod
+    def clear():
+        with RecordCountCache._lock:
+            RecordCountCache._totals.clear()
+            RecordCountCache._generations.clear()
+
+
+def fetch_page(
+    query,
+    model,
+    file_id: int,
+    filters: Tuple,
+    skip: int,
+    limit: int,
+    sort_by: Optional[str],
+    sort_order: str = "asc",
+    cursor: Optional[str] = None,
+    options: Optional[list] = None,
+    columns: Optional[List[str]] = None,
+) -> Tuple[List[Any], int]:
+    """
+    Strona rekordów i total_count jednym zapytaniem (gdy to możliwe).
+    query — zapytanie modelu z filtrami, bez sortowania i stronicowania.
+    filters — krotka wartości filtrów (klucz pamięci total_count).
+    options — opcje ładowania relacji (joinedload/selectinload) dla strony.
+    columns — nazwy kolumn: strona jako wiersze Row (kolejno te kolumny,
+    dalej ewentualnie kolumna sortowania i total_count) zamiast obiektów.
+    """
+    table = model.__tablename__
+    total, generation = RecordCountCache.get(table, file_id, filters)
+
+    if columns:
+        page = query.with_entities(*_page_columns(model, columns, sort_by))
+    else:
+        page = query.options(*options) if options else query
+    if cursor:
+        page = apply_cursor(page, model, cursor, sort_by, sort_order)
+        skip = 0
+    page = apply_order(page, model, sort_by, sort_order).offset(skip).limit(limit)
+
+    if total is not None:
+        return page.all(), total
+
+    if cursor:
+        records = page.all()
+        total = count_query(query, model)
+    else:
+        rows = page.add_columns(total_column(query, model)).all()
+        records = rows if columns else [row[0] for row in rows]
+        if rows:
+            total = rows[0][-1]
+        elif skip == 0:
+            total = 0
+        else:
+            # Strona za końcem listy — brak wierszy, z których odczytać total
+            total = count_query(query, model)
+
+    RecordCountCache.set(table, file_id, filters, total, generation)
+    return records, total
+
+
+def _page_columns(model, columns: List[str], sort_by: Optional[str]) -> list:
+    """Kolumny strony — z id i kolumną sortowania (potrzebne do next_cursor)"""
+    names = list(columns)
+    if "id" not in names:
+        names.append("id")
+    column = sort_column(model, sort_by)
+    if column is not None and column.key not in names:
+        names.append(column.key)
+    return [getattr(model, name) for name in names]
+
+
+def total_column(query, model):
+    """
+    Kolumna (SELECT COUNT(id) ... filtry) dołączana do każdego wiersza strony.
+    Podzapytanie nieskorelowane — SQLite liczy je raz, z indeksu.
+    """
+    return (
+        query.with_entities(func.count(model.id)).order_by(None).statement
+        .correlate(None).scalar_subquery().label("total_count")
+    )
+
+
+def count_query(query, model) -> int:
+    """COUNT zapytania z filtrami (bez ładowania obiektów)"""
+    return query.with_entities(func.count(model.id)).order_by(None).scalar()
+
+
+# ── Unieważnianie po zmianach ORM ────────────────────────────────────────────
+
+_CHANGED_FILES_KEY = "record_count_changed_files"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_files(session, flush_context):
+    changed = session.info.setdefault(_CHANGED_FILES_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, (SWDRecord, HazardousRecord)):
+            changed.add(instance.file_id)
+        elif isinstance(instance, ImportedFile) and instance in session.deleted:
+            changed.add(instance.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_files(session):
+    for file_id in session.info.pop(_CHANGED_FILES_KEY, ()):
+        if file_id is not None:
+            RecordCountCache.invalidate(file_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_files(session):
+    session.info.pop(_CHANGED_FILES_KEY, None)
@@ -0,0 +1,81 @@
+"""
+backend/services/template_registry.py
+
+Wspólne środowisko Jinja dla szablonów dokumentów (backend/templates).
+
+Jedno Environment na proces zamiast nowego w każdym serwisie / żądaniu:
+  - warm_up() przy starcie kompiluje wszystkie szablony HTML,
+  - skompilowany kod trafia też na dysk (FileSystemBytecodeCache w
+    settings.TEMPLATE_CACHE_DIR) — kolejne uruchomienie nie parsuje
+    szablonów od nowa; klucz cache zawiera sumę kontrolną źródła,
+  - mtime plików sprawdzany tylko gdy settings.TEMPLATE_AUTO_RELOAD
+    (tryb deweloperski) — w exe szablony się nie zmieniają.
+"""
+from pathlib import Path
+from typing import Optional
+import sys
+import threading
+import time
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import settings
+
+
+class TemplateRegistry:
+    """Środowisko Jinja współdzielone przez serwisy dokumentów"""
+
+    _lock = threading.Lock()
+    _env: Optional[Environment] = None
+
+    @staticmethod
+    def templates_dir() -> Path:
+        """Ścieżka do templates (działa z PyInstaller)"""
+        try:
+            # PyInstaller
+            return Path(sys._MEIPASS) / "backend" / "templates"
+        except AttributeError:
+            # Development
+            return Path(__file__).parent.parent / "templates"
+
+    @staticmethod
+    def get_environment() -> Environment:
+        with TemplateRegistry._lock:
+            if TemplateRegistry._env is None:
+                TemplateRegistry._env = TemplateRegistry._create_environment()
+            return TemplateRegistry._env
+
+    @staticmethod
+    def _create_environment() -> Environment:
+        bytecode_cache = None
+        try:
+            settings.TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(settings.TEMPLATE_CACHE_DIR))
+        except OSError as e:
+            print(f"[TEMPLATES] Cache szablonów na dysku niedostępny: {e}")
+
+        return Environment(
+            loader=FileSystemLoader(str(TemplateRegistry.templates_dir())),
+            bytecode_cache=bytecode_cache,
+            auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+        )
+
+    @staticmethod
+    def get_template(name: str) -> Template:
+        return TemplateRegistry.get_environment().get_template(name)
+
+    @staticmethod
+    def warm_up() -> int:
+        """Skompiluj wszystkie szablony HTML (wywoływane przy starcie aplikacji)"""
+        start = time.perf_counter()
+        env = TemplateRegistry.get_environment()
+        names = env.list_templates(filter_func=lambda name: name.endswith(".html"))
+        for name in names:
+            try:
+                env.get_template(name)
+            except Exception as e:
+                print(f"[TEMPLATES] Błąd kompilacji szablonu {name}: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"[TEMPLATES] Skompilowano {len(names)} szablonów ({elapsed_ms:.0f} ms)")
+        return len(names)
@@ -0,0 +1,172 @@
+"""
+backend/services/xlsx_stream_writer.py
+
+Strumieniowy zapis eksportów XLSX.
+Arkusz tworzony jest w trybie write_only (wiersze trafiają od razu do pliku
+tymczasowego openpyxl, bez trzymania komórek w pamięci), style komórek są
+stylami nazwanymi tworzonymi raz na skoroszyt zamiast nowych Font/Alignment
+dla każdej komórki. Gotowy plik zapisywany jest do SpooledTemporaryFile
+(w pamięci do SPOOL_MAX_SIZE, potem na dysku) i oddawany kawałkami
+do StreamingResponse.
+"""
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
+from tempfile import SpooledTemporaryFile
+from typing import Iterable, Iterator, List, Optional, Any
+from datetime import datetime
+
+
+class XlsxStreamWriter:
+    """
+    Zapis jednego arkusza: nagłówek, wiersze danych, stopka eksportu.
+
+    Użycie:
+        writer = XlsxStreamWriter("Wyjazdy", HEADERS, [8, 15, ...])
+        return StreamingResponse(writer.stream(rows), media_type=...)
+    """
+
+    CHUNK_SIZE      = 64 * 1024         # 64 KB na kawałek odpowiedzi
+    SPOOL_MAX_SIZE  = 8 * 1024 * 1024   # powyżej 8 MB plik trafia na dysk
+
+    FOOTER_COPYRIGHT = "MatMad Software 2026 wszelkie prawa zastrzeżone"
+
+    def __init__(
+        self,
+        title: str,
+        headers: List[str],
+        col_widths: List[int],
+        header_fill: Optional[str] = None,
+        header_font_size: int = 11,
+        header_wrap: bool = False,
+        header_height: Optional[int] = None,
+        bordered: bool = False,
+        freeze_header: bool = False,
+        footer_label: str = "rekordów",
+    ):
+        """
+        header_fill: kolor tła nagłówka (np. "4472C4") — białe pogrubione litery;
+                     None — nagłówek bez tła, czarna czcionka
+        bordered: cienka ramka wokół komórek nagłówka i danych
+        footer_label: rzeczownik w stopce "Wyeksportowano: N <footer_label>"
+        """
+        self.title = title
+        self.headers = headers
+        self.col_widths = col_widths
+        self.header_fill = header_fill
+        self.header_font_size = header_font_size
+        self.header_wrap = header_wrap
+        self.header_height = header_height
+        self.bordered = bordered
+        self.freeze_header = freeze_header
+        self.footer_label = footer_label
+
+    # ── Style ────────────────────────────────────────────────────────────────
+
+    def _register_styles(self, wb: Workbook):
+        """Style nazwane: nagłówek, dane, stopka — raz na skoroszyt"""
+        border = None
+        if self.bordered:
+            thin = Side(style="thin")
+            border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+        header = NamedStyle(name="export_header")
+        header.alignment = Alignment(horizontal="center", vertical="center", wrap_text=self.header_wrap)
+        if self.header_fill:
+            header.font = Font(name="Arial", bold=True, color="FFFFFF", size=self.header_font_size)
+            header.fill = PatternFill(start_color=self.header_fill, end_color=self.header_fill, fill_type="solid")
+        else:
+            header.font = Font(name="Arial", bold=True, size=self.header_font_size)
+        if border:
+            header.border = border
+
+        data = NamedStyle(name="export_data")
+        data.font = Font(name="Arial", size=10)
+        data.alignment = Alignment(horizontal="left", vertical="center")
+        if border:
+            data.border = border
+
+        footer = NamedStyle(name="export_footer")
+        footer.font = Font(italic=True, size=9, color="666666")
+
+        for style in (header, data, footer):
+            wb.add_named_style(style)
+
+    @staticmethod
+    def _resolve_style(ws, style: str):
+        """
+        Rozwiąż styl nazwany raz — przypisanie cell.style = "nazwa" przeszukuje
+        listę stylów skoroszytu przy każdej komórce. Komórki write_only nie są
+        później modyfikowane, więc mogą współdzielić jedną tablicę stylu.
+        """
+        cell = WriteOnlyCell(ws)
+        cell.style = style
+        return cell._style
+
+    @staticmethod
+    def _styled_row(ws, values: Iterable[Any], style_array) -> list:
+        row = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell._style = style_array
+            row.append(cell)
+        return row
+
+    # ── Zapis ────────────────────────────────────────────────────────────────
+
+    def write(self, rows: Iterable[Iterable[Any]]) -> SpooledTemporaryFile:
+        """
+        Zapisz arkusz do pliku tymczasowego (ustawionego na początek).
+        rows: dowolny iterowalny zbiór wierszy (lista lub generator z bazy)
+        """
+        wb = Workbook(write_only=True)
+        self._register_styles(wb)
+        ws = wb.create_sheet(self.title)
+
+        # Wymiary kolumn i zamrożenie muszą być ustawione przed pierwszym wierszem
+        for col_idx, width in enumerate(self.col_widths, start=1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
+        if self.freeze_header:
+            ws.freeze_panes = "A2"
+        if self.header_height:
+            ws.row_dimensions[1].height = self.header_height
+
+        header_style = self._resolve_style(ws, "export_header")
+        data_style   = self._resolve_style(ws, "export_data")
+        footer_style = self._resolve_style(ws, "export_footer")
+
+        ws.append(self._styled_row(ws, self.headers, header_style))
+
+        count = 0
+        for values in rows:
+            ws.append(self._styled_row(ws, values, data_style))
+            count += 1
+
+        # Stopka — pusty wiersz odstępu, jak w dotychczasowych eksportach
+        ws.append([])
+        for line in (
+            f"Wyeksportowano: {count} {self.footer_label}",
+            f"Data eksportu: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            self.FOOTER_COPYRIGHT,
+        ):
+            ws.append(self._styled_row(ws, [line], footer_style))
+
+        output = SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE)
+        wb.save(output)
+        output.seek(0)
+        return output
+
+    def stream(self, rows: Iterable[Iterable[Any]]) -> Iterator[bytes]:
+        """Zapisz arkusz i oddawaj go kawałkami (dla StreamingResponse)"""
+        return self.iter_file(self.write(rows))
+
+    @staticmethod
+    def iter_file(output, chunk_size: int = None) -> Iterator[bytes]:
+        """Generator kawałków pliku — zamyka plik po odczycie"""
+        chunk_size = chunk_size or XlsxStreamWriter.CHUNK_SIZE
+        try:
+            while chunk := output.read(chunk_size):
+                yield chunk
+        finally:
+            output.close()
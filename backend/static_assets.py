@@ -0,0 +1,156 @@
+"""
+Serwowanie plików frontendu (React build) z kompresją i nagłówkami cache.
+
+CachedStaticFiles (StaticFiles z Starlette):
+  - pliki z hashem w nazwie (main.3f2a9c1b.js — build React) dostają
+    Cache-Control: public, max-age=31536000, immutable — przeglądarka
+    (także WebView w pywebview) nie odpytuje o nie ponownie,
+  - pozostałe (index.html, favicon.ico, ...) — no-cache: zawsze
+    rewalidacja przez ETag / Last-Modified (304 bez treści),
+  - gdy obok pliku leży wariant .br / .gz, a klient go akceptuje,
+    wysyłany jest wariant z Content-Encoding (bez kompresji w locie).
+
+Warianty .br / .gz tworzy ten moduł uruchomiony po buildzie frontendu:
+    python backend/static_assets.py frontend/build
+
+SelectiveGZipMiddleware (GZipMiddleware z Starlette) kompresuje w locie
+odpowiedzi API, ale pomija formaty już skompresowane (ZIP, PDF, xlsx/docx)
+— drugi gzip nic nie zmniejsza, a zajmuje CPU i wstrzymuje strumień.
+"""
+import gzip
+import mimetypes
+import os
+import re
+import stat
+import sys
+from pathlib import Path
+from typing import List
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+sys.path.append(str(Path(__file__).parent))
+from services.json_response import accepted_encodings, brotli
+
+# Kodowanie → rozszerzenie wariantu, w kolejności preferencji
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+# Hash treści w nazwie pliku (main.3f2a9c1b.js, logo.6ce24c58023cc2f8.svg)
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.")
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+# Pliki kompresowane po buildzie (tekstowe, od COMPRESS_MIN_SIZE bajtów)
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".html", ".json", ".svg", ".txt", ".map", ".ico"}
+COMPRESS_MIN_SIZE = 1024
+
+# Odpowiedzi bez kompresji w locie (prefiks Content-Type) — treść już skompresowana
+UNCOMPRESSED_MEDIA_TYPES = (
+    "application/zip",
+    "application/pdf",
+    "application/vnd.openxmlformats-",   # xlsx, docx
+)
+
+
+def cache_control(path: str) -> str:
+    return CACHE_IMMUTABLE if HASHED_NAME.search(os.path.basename(path)) else CACHE_REVALIDATE
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles z Cache-Control i wariantami prekompresowanymi (.br / .gz)"""
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        headers = {"Cache-Control": cache_control(full_path)}
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+
+        path = full_path
+        encodings = accepted_encodings(request_headers.get("accept-encoding"))
+        for candidate, suffix in PRECOMPRESSED:
+            if candidate not in encodings:
+                continue
+            try:
+                variant_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if stat.S_ISREG(variant_stat.st_mode):
+                path, stat_result = full_path + suffix, variant_stat
+                headers["Content-Encoding"] = candidate
+                break
+
+        response = FileResponse(
+            path, status_code=status_code, stat_result=stat_result, method=scope["method"],
+            media_type=media_type, headers=headers,
+        )
+        if self._has_variants(full_path):
+            response.headers.add_vary_header("Accept-Encoding")
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _has_variants(full_path: str) -> bool:
+        return any(os.path.exists(full_path + suffix) for _, suffix in PRECOMPRESSED)
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    async def send_with_gzip(self, message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(UNCOMPRESSED_MEDIA_TYPES):
+                # Jak odpowiedź z Content-Encoding — treść przekazywana bez zmian
+                self.content_encoding_set = True
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware pomijający odpowiedzi z UNCOMPRESSED_MEDIA_TYPES"""
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _SelectiveGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def precompress_directory(directory: Path) -> List[Path]:
+    """Utwórz warianty .gz (i .br, gdy brotli zainstalowany) plików tekstowych builda"""
+    created = []
+    for path in sorted(Path(directory).rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        data = path.read_bytes()
+        if len(data) < COMPRESS_MIN_SIZE:
+            continue
+
+        variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(data, quality=11)))
+        for suffix, compressed in variants:
+            if len(compressed) >= len(data):
+                continue
+            target = path.with_name(path.name + suffix)
+            target.write_bytes(compressed)
+            created.append(target)
+    return created
+
+
+if __name__ == "__main__":
+    build_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent.parent / "frontend" / "build"
+    if not build_dir.exists():
+        print(f"[STATIC] Brak katalogu builda: {build_dir}")
+        sys.exit(1)
+    files = precompress_directory(build_dir)
+    print(f"[STATIC] Utworzono {len(files)} wariantów skompresowanych w {build_dir}"
+          f"{'' if brotli is not None else ' (bez .br — brak modułu brotli)'}")
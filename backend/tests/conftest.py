@@ -0,0 +1,13 @@
+"""
+Wspólne ustawienia testów backendu.
+
+Uruchamianie (z katalogu backend/):
+    python -m pytest tests
+"""
+import sys
+from pathlib import Path
+
+# Moduły backendu (config, database, services, ...) importowane jak w main.py
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR / "benchmarks"))
@@ -0,0 +1,103 @@
+"""
+Liczba zapytań SQL strony listy rekordów szkodliwych (ze stopniami).
+
+Liczone są instrukcje wysłane do SQLite (before_cursor_execute) — stała
+liczba niezależna od liczby rekordów (każdy test dla 100 i 1000 rekordów)
+i stopni na stronie. Więcej zapytań
+oznacza powrót N+1 (np. leniwa relacja hazardous_degree w to_dict).
+Te same scenariusze z pomiarem czasu: benchmarks/degree_query_count.py.
+"""
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import HazardousDegree  # rejestracja modeli w Base.metadata
+from services.hazardous_degrees_service import DegreeLookup, HazardousDegreeCatalog
+from services.hazardous_records_service import HazardousRecordsService
+from services.record_listing import RecordCountCache
+from sample_data import sample_rows
+
+DEGREES = 20
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'query_count.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture(params=[100, 1000], ids=lambda rows: f"{rows}_rekordow")
+def rows(request):
+    """Liczba rekordów pliku (i strony listy) — liczba zapytań ma być ta sama"""
+    return request.param
+
+
+@pytest.fixture
+def file_id(db, rows):
+    hazardous = HazardousRecordsService.create_file_record(db, "count.xlsx", "count.xlsx", "", rows)
+    HazardousRecordsService.bulk_create_records(db, hazardous.id, sample_rows(rows))
+    db.execute(HazardousDegree.__table__.insert(), [
+        {"stopien": 1 + i % 2, "punkt": i + 1, "opis": f"opis {i + 1}"} for i in range(DEGREES)
+    ])
+    db.execute(
+        text("UPDATE hazardous_records SET hazardous_degree_id = 1 + id % :degrees"),
+        {"degrees": DEGREES},
+    )
+    db.commit()
+    file_id = hazardous.id
+    db.expunge_all()   # bez obiektów przygotowania w sesji
+    return file_id
+
+
+@pytest.fixture
+def statements(db, file_id):
+    """Instrukcje SQL wykonane w teście (po przygotowaniu danych)"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    engine = db.get_bind()
+    RecordCountCache.clear()
+    HazardousDegreeCatalog.invalidate()
+    event.listen(engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def _listing(db, file_id, rows, degree_loading=None, lookup=False):
+    records, _ = HazardousRecordsService.list_records(
+        db, file_id, limit=rows, degree_loading=degree_loading
+    )
+    degrees = DegreeLookup(db) if lookup else None
+    return [r.to_dict(degrees) for r in records]
+
+
+@pytest.mark.parametrize("degree_loading, lookup, expected", [
+    # strona z total_count, katalog stopni
+    (None, True, 2),
+    (None, False, 2),
+    # strona z total_count, SELECT stopni WHERE id IN (...), katalog
+    ("selectin", False, 3),
+    # strona z total_count i LEFT JOIN stopni, katalog
+    ("joined", False, 2),
+])
+def test_listing_page_query_count(db, rows, file_id, statements, degree_loading, lookup, expected):
+    page = _listing(db, file_id, rows, degree_loading, lookup)
+
+    assert len(page) == rows
+    assert all(row["hazardous_degree"] is not None for row in page)
+    assert len(statements) == expected, statements
+
+
+def test_export_query_count(db, rows, file_id, statements):
+    # jedno zapytanie z LEFT JOIN stopni
+    records = list(HazardousRecordsService.iter_records_by_file(db, file_id))
+
+    assert len(records) == rows
+    assert len(statements) == 1, statements
@@ -7,8 +7,13 @@ from pathlib import Path
 import time
 import requests
 import importlib.util
+import multiprocessing
 from logger import setup_logger
 
+# Procesy robocze puli dokumentów (exe uruchamia sam siebie) — muszą
+# zakończyć się tutaj, przed wczytaniem backendu i otwarciem okna
+multiprocessing.freeze_support()
+
 logger = setup_logger()
 
 
@@ -18,6 +18,7 @@ function FileUpload({ onUploadSuccess, headerText, uploadFn }) {
   const [file, setFile] = useState(null);
   const [uploading, setUploading] = useState(false);
   const [dragActive, setDragActive] = useState(false);
+  const [progress, setProgress] = useState(null);
 
   // Domyślnie filesAPI.uploadFile — Departures działa bez zmian
   const doUpload = uploadFn || filesAPI.uploadFile;
@@ -49,8 +50,10 @@ function FileUpload({ onUploadSuccess, headerText, uploadFn }) {
       return;
     }
     setUploading(true);
+    setProgress(null);
     try {
-      const result = await doUpload(file);
+      // Import w tle — uploadFn odpytuje zadanie i raportuje postęp
+      const result = await doUpload(file, setProgress);
       alert(`Sukces! Zaimportowano ${result.records_imported} rekordów`);
       setFile(null);
       if (onUploadSuccess) onUploadSuccess(result);
@@ -59,6 +62,7 @@ function FileUpload({ onUploadSuccess, headerText, uploadFn }) {
       alert(`Błąd: ${error.response?.data?.detail || error.message}`);
     } finally {
       setUploading(false);
+      setProgress(null);
     }
   };
 
@@ -77,7 +81,7 @@ function FileUpload({ onUploadSuccess, headerText, uploadFn }) {
         <input
           id="file-input"
           type="file"
-          accept=".xlsx,.xls"
+          accept=".xlsx"
           onChange={handleFileChange}
           style={{ display: "none" }}
         />
@@ -114,7 +118,11 @@ function FileUpload({ onUploadSuccess, headerText, uploadFn }) {
             className="btn-primary"
             disabled={uploading}
           >
-            {uploading ? "Przetwarzanie..." : "Importuj plik"}
+            {uploading
+              ? progress && progress.rows_parsed
+                ? `Przetwarzanie... ${progress.rows_inserted}/${progress.rows_parsed}`
+                : "Przetwarzanie..."
+              : "Importuj plik"}
           </button>
         </div>
       )}
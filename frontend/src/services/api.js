@@ -11,9 +11,66 @@ const api = axios.create({
   },
 });
 
+// Listy rekordów w formacie kolumnowym (format=columnar): nagłówek kolumn,
+// tablica wartości na kolumnę, kolumny słownikowe jako indeksy w "dictionaries".
+// Odtwarza "records" (tablicę obiektów) — komponenty dostają to samo co wcześniej.
+export const decodeColumnar = (data) => {
+  if (!data || data.format !== "columnar") return data;
+  const { format, columns, data: values, dictionaries = {}, degrees, ...rest } = data;
+  const decoded = columns.map((name, i) => {
+    const dictionary = dictionaries[name];
+    return dictionary
+      ? values[i].map((code) => (code === null ? null : dictionary[code]))
+      : values[i];
+  });
+  const count = decoded.length ? decoded[0].length : 0;
+  const records = new Array(count);
+  for (let row = 0; row < count; row++) {
+    const record = {};
+    for (let col = 0; col < columns.length; col++) {
+      record[columns[col]] = decoded[col][row];
+    }
+    if (degrees) {
+      record.hazardous_degree = degrees[record.hazardous_degree_id] ?? null;
+    }
+    records[row] = record;
+  }
+  return { ...rest, records };
+};
+
+// Jobs API — import plików w tle
+export const jobsAPI = {
+  getJob: async (jobId) => {
+    const response = await api.get(`/api/jobs/${jobId}`);
+    return response.data;
+  },
+
+  // Odpytuje zadanie do zakończenia. Zwraca wynik zgodny z dawną odpowiedzią uploadu
+  // (records_imported, filename, file_id); przy statusie "failed" rzuca błąd.
+  waitForJob: async (jobId, onProgress, intervalMs = 500) => {
+    for (;;) {
+      const job = await jobsAPI.getJob(jobId);
+      if (onProgress) onProgress(job);
+
+      if (job.status === "completed") {
+        return {
+          ...job,
+          success: true,
+          records_imported: job.rows_inserted,
+          filename: job.original_filename,
+        };
+      }
+      if (job.status === "failed") {
+        throw new Error(job.error || "Import nie powiódł się");
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  },
+};
+
 // Files API
 export const filesAPI = {
-  uploadFile: async (file) => {
+  uploadFile: async (file, onProgress) => {
     const formData = new FormData();
     formData.append("file", file);
 
@@ -22,7 +79,7 @@ export const filesAPI = {
         "Content-Type": "multipart/form-data",
       },
     });
-    return response.data;
+    return jobsAPI.waitForJob(response.data.job_id, onProgress);
   },
 
   getAllFiles: async () => {
@@ -75,9 +132,9 @@ export const dataAPI = {
 
   getFileRecords: async (fileId, params = {}) => {
     const response = await api.get(`/api/data/files/${fileId}/records`, {
-      params,
+      params: { format: "columnar", ...params },
     });
-    return response.data;
+    return decodeColumnar(response.data);
   },
 
   getFirefightersInFile: async (fileId) => {
@@ -189,6 +246,30 @@ export const dataAPI = {
       filename: filename,
     };
   },
+
+  // Karty wszystkich strażaków z pliku (lub wybranych) — ZIP albo jeden PDF (merge)
+  generateDocumentsBatch: async (fileId, format, filters = {}) => {
+    const params = new URLSearchParams();
+    if (filters.date_from) params.append("date_from", filters.date_from);
+    if (filters.date_to) params.append("date_to", filters.date_to);
+    (filters.firefighters || []).forEach((name) =>
+      params.append("firefighters", name),
+    );
+    if (filters.merge) params.append("merge", "true");
+
+    const response = await api.get(
+      `/api/data/files/${fileId}/generate-documents/${format}`,
+      { params, responseType: "blob" },
+    );
+
+    const contentDisposition = response.headers["content-disposition"] || "";
+    const match = contentDisposition.match(/filename\*=UTF-8''([^;]+)/);
+    const filename = match
+      ? decodeURIComponent(match[1])
+      : `karty_wyjazdow_${fileId}.${filters.merge ? "pdf" : "zip"}`;
+
+    return { blob: response.data, filename };
+  },
 };
 
 // Firefighters API
@@ -386,7 +467,7 @@ export const hazardousRecordsAPI = {
     return response.data;
   },
 
-  uploadFile: async (file) => {
+  uploadFile: async (file, onProgress) => {
     const formData = new FormData();
     formData.append("file", file);
     const response = await api.post(
@@ -396,7 +477,7 @@ export const hazardousRecordsAPI = {
         headers: { "Content-Type": "multipart/form-data" },
       },
     );
-    return response.data;
+    return jobsAPI.waitForJob(response.data.job_id, onProgress);
   },
 
   // ── Rekordy ──────────────────────────────────────────────────────────────
@@ -404,9 +485,9 @@ export const hazardousRecordsAPI = {
   getRecords: async (fileId, params = {}) => {
     const response = await api.get(
       `/api/hazardous-records/files/${fileId}/records`,
-      { params },
+      { params: { format: "columnar", ...params } },
     );
-    return response.data;
+    return decodeColumnar(response.data);
   },
 
   getStatistics: async (fileId) => {
@@ -508,6 +589,31 @@ export const hazardousRecordsAPI = {
 
     return { blob: response.data, filename };
   },
+
+  // Zestawienia za półrocze dla wszystkich strażaków (lub wybranych) — ZIP z manifest.csv
+  generateDocumentsBatch: async (fileId, polrocze, filters = {}) => {
+    const params = new URLSearchParams();
+    params.append("polrocze", polrocze);
+    params.append("format", filters.format || "docx");
+    (filters.firefighters || []).forEach((name) =>
+      params.append("firefighters", name),
+    );
+    if (filters.only_eligible === false) params.append("only_eligible", "false");
+    if (filters.jednostka) params.append("jednostka", filters.jednostka);
+
+    const response = await api.get(
+      `/api/hazardous-records/files/${fileId}/generate-documents`,
+      { params, responseType: "blob" },
+    );
+
+    const contentDisposition = response.headers["content-disposition"] || "";
+    const match = contentDisposition.match(/filename\*?=(?:UTF-8'')?([^;]+)/i);
+    const filename = match
+      ? decodeURIComponent(match[1].replace(/['"]/g, ""))
+      : `zestawienia_${fileId}.zip`;
+
+    return { blob: response.data, filename };
+  },
   // ── Eksport ──────────────────────────────────────────────────────────────
 
   exportToExcel: async (fileId, filters = {}) => {
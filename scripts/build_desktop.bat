@@ -43,6 +43,14 @@ if %errorlevel% neq 0 (
     exit /b 1
 )
 
+REM Warianty .br/.gz plikow frontendu (serwowane zamiast kompresji w locie)
+python backend\static_assets.py frontend\build
+if %errorlevel% neq 0 (
+    echo BLAD: Kompresja plikow frontendu nie powiodla sie!
+    pause
+    exit /b 1
+)
+
 REM KROK 3: Pakowanie
 echo.
 echo [KROK 3/4] Pakowanie aplikacji...
@@ -88,6 +96,8 @@ pyinstaller --clean --noconfirm ^
     --hidden-import=reportlab.platypus ^
     --hidden-import=reportlab.pdfbase ^
     --hidden-import=xhtml2pdf ^
+    --hidden-import=orjson ^
+    --hidden-import=brotli ^
     --hidden-import=PIL ^
     --hidden-import=PIL.Image ^
     --hidden-import=PIL.ImageTk ^